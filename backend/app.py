@@ -2,9 +2,26 @@
 # Tích hợp tất cả các chức năng thời tiết trong một Flask app duy nhất
 # Có validation, translation, và formatting
 
+import atexit
+import logging
+import math
 import os
+import queue
+import sys
+import threading
 import requests
-from flask import Flask, request, jsonify
+from bisect import bisect_left
+from functools import lru_cache, partial, wraps
+from itertools import chain
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Callable, NamedTuple
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
+from flask import Flask, request, jsonify, g, has_app_context
 from flask_cors import CORS
 from dotenv import load_dotenv
 
@@ -28,9 +45,49 @@ from weather_enhancements import (
 # Load environment variables from .env file
 load_dotenv()
 
+# Fast JSON serialization (orjson when installed)
+from json_provider import OrjsonProvider, UpstreamResponseTooLarge, loads as json_loads, read_body
+
+# Response cache (Redis when REDIS_URL is set, in-process otherwise)
+# Imported after load_dotenv so REDIS_URL from .env is picked up
+from weather_cache import cached_response, etag_response, make_cache_key, upstream_validators
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)  # jsonify() now encodes with orjson
 CORS(app)  # Enable CORS for React frontend
 
+# ============================================================================
+# STATIC ERROR RESPONSES
+# ============================================================================
+
+# Error bodies whose message never changes are built once at import time;
+# only the timestamp is filled in per request (see _error_response)
+_ERR_NOT_FOUND = ResponseFormatter.error_body('Endpoint không tồn tại', 'NOT_FOUND', 404)
+_ERR_METHOD_NOT_ALLOWED = ResponseFormatter.error_body(
+	'Phương thức HTTP không được hỗ trợ', 'METHOD_NOT_ALLOWED', 405
+)
+_ERR_INTERNAL_SERVER = ResponseFormatter.error_body('Lỗi máy chủ nội bộ', 'INTERNAL_SERVER_ERROR', 500)
+_ERR_INVALID_CONTENT_TYPE = ResponseFormatter.error_body(
+	'Content-Type phải là application/json', 'INVALID_CONTENT_TYPE', 400
+)
+_ERR_INVALID_LOCATION = ResponseFormatter.error_body(
+	'Địa điểm hoặc tọa độ không hợp lệ', 'INVALID_LOCATION', 400
+)
+_ERR_API_KEY = ResponseFormatter.error_body('API key không hợp lệ hoặc đã hết hạn', 'API_KEY_ERROR', 500)
+_ERR_UPSTREAM_TOO_LARGE = ResponseFormatter.error_body(
+	'Phản hồi từ WeatherAPI quá lớn', 'UPSTREAM_RESPONSE_TOO_LARGE', 502
+)
+_ERR_RATE_LIMITED = ResponseFormatter.error_body(
+	'WeatherAPI đang giới hạn số request. Vui lòng thử lại sau', 'RATE_LIMITED', 429
+)
+_ERR_UPSTREAM_UNAVAILABLE = ResponseFormatter.error_body(
+	'WeatherAPI tạm thời không phản hồi. Vui lòng thử lại sau', 'UPSTREAM_UNAVAILABLE', 503
+)
+
+def _error_response(error):
+	"""JSON response tuple for a prebuilt error body"""
+	return jsonify(ResponseFormatter.format_error_from(error)), error['status']
+
 # ============================================================================
 # GLOBAL ERROR HANDLERS
 # ============================================================================
@@ -38,38 +95,23 @@ CORS(app)  # Enable CORS for React frontend
 @app.errorhandler(404)
 def not_found(error):
 	"""Handle 404 errors with JSON response"""
-	error_response = ResponseFormatter.format_error(
-		'Endpoint không tồn tại',
-		'NOT_FOUND',
-		404
-	)
-	return jsonify(error_response), 404
+	return _error_response(_ERR_NOT_FOUND)
 
 @app.errorhandler(405)
 def method_not_allowed(error):
 	"""Handle 405 errors with JSON response"""
-	error_response = ResponseFormatter.format_error(
-		'Phương thức HTTP không được hỗ trợ',
-		'METHOD_NOT_ALLOWED',
-		405
-	)
-	return jsonify(error_response), 405
+	return _error_response(_ERR_METHOD_NOT_ALLOWED)
 
 @app.errorhandler(500)
 def internal_error(error):
 	"""Handle 500 errors with JSON response"""
-	print(f"[ERROR] Internal server error: {str(error)}")
-	error_response = ResponseFormatter.format_error(
-		'Lỗi máy chủ nội bộ',
-		'INTERNAL_SERVER_ERROR',
-		500
-	)
-	return jsonify(error_response), 500
+	logger.error('Internal server error: %s', error)
+	return _error_response(_ERR_INTERNAL_SERVER)
 
 @app.errorhandler(Exception)
 def handle_exception(error):
 	"""Handle all uncaught exceptions with JSON response"""
-	print(f"[ERROR] Unhandled exception: {str(error)}")
+	logger.error('Unhandled exception: %s', error)
 	
 	# Get status code if available
 	status_code = getattr(error, 'code', 500)
@@ -85,34 +127,278 @@ def handle_exception(error):
 # CONFIGURATION - All values loaded from .env file
 # ============================================================================
 
-# WeatherAPI Configuration
-WEATHER_API_KEY = os.getenv('WEATHERAPI_KEY', 'YOUR_WEATHERAPI_KEY')
-WEATHERAPI_BASE_URL = os.getenv('WEATHERAPI_BASE_URL', 'http://api.weatherapi.com/v1')
-WEATHER_API_CURRENT_URL = f'{WEATHERAPI_BASE_URL}/current.json'
-WEATHER_API_FORECAST_URL = f'{WEATHERAPI_BASE_URL}/forecast.json'
-WEATHER_API_ASTRONOMY_URL = f'{WEATHERAPI_BASE_URL}/astronomy.json'
-WEATHER_API_HISTORY_URL = f'{WEATHERAPI_BASE_URL}/history.json'
-WEATHER_API_MARINE_URL = f'{WEATHERAPI_BASE_URL}/marine.json'
-WEATHER_API_FUTURE_URL = f'{WEATHERAPI_BASE_URL}/future.json'
-WEATHER_API_TIMEZONE_URL = f'{WEATHERAPI_BASE_URL}/timezone.json'
-WEATHER_API_SPORTS_URL = f'{WEATHERAPI_BASE_URL}/sports.json'
-WEATHER_API_SEARCH_URL = f'{WEATHERAPI_BASE_URL}/search.json'
-
-# Server Configuration
-FLASK_PORT = int(os.getenv('FLASK_PORT', 5000))
-FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
-FLASK_HOST = os.getenv('FLASK_HOST', '0.0.0.0')
+class Config(NamedTuple):
+	"""
+	Settings read once from the environment (.env) at import time
+	
+	An immutable tuple: fields are plain attribute reads and cannot be
+	reassigned by request code.
+	"""
+	# WeatherAPI
+	weather_api_key: str
+	base_url: str
+	current_url: str
+	forecast_url: str
+	astronomy_url: str
+	history_url: str
+	marine_url: str
+	future_url: str
+	timezone_url: str
+	sports_url: str
+	search_url: str
+	request_timeout: int         # Seconds per WeatherAPI call
+	fanout_workers: int          # Threads for concurrent WeatherAPI calls
+	max_body_bytes: int          # Largest (decompressed) body we buffer and parse
+	
+	# Server
+	flask_host: str
+	flask_port: int
+	flask_debug: bool
+	log_level: str               # DEBUG in debug mode, INFO otherwise
+	
+	@classmethod
+	def from_env(cls, environ=os.environ):
+		"""Build the configuration from environment variables"""
+		base_url = environ.get('WEATHERAPI_BASE_URL', 'https://api.weatherapi.com/v1')
+		flask_debug = environ.get('FLASK_DEBUG', 'True').lower() == 'true'
+		return cls(
+			weather_api_key=environ.get('WEATHERAPI_KEY', 'YOUR_WEATHERAPI_KEY'),
+			base_url=base_url,
+			current_url=f'{base_url}/current.json',
+			forecast_url=f'{base_url}/forecast.json',
+			astronomy_url=f'{base_url}/astronomy.json',
+			history_url=f'{base_url}/history.json',
+			marine_url=f'{base_url}/marine.json',
+			future_url=f'{base_url}/future.json',
+			timezone_url=f'{base_url}/timezone.json',
+			sports_url=f'{base_url}/sports.json',
+			search_url=f'{base_url}/search.json',
+			request_timeout=10,
+			fanout_workers=int(environ.get('WEATHERAPI_FANOUT_WORKERS', 16)),
+			max_body_bytes=int(environ.get('WEATHERAPI_MAX_BODY_BYTES', 8 * 1024 * 1024)),
+			flask_host=environ.get('FLASK_HOST', '0.0.0.0'),
+			flask_port=int(environ.get('FLASK_PORT', 5000)),
+			flask_debug=flask_debug,
+			log_level=environ.get('LOG_LEVEL', 'DEBUG' if flask_debug else 'INFO').upper()
+		)
+
+cfg = Config.from_env()
+
+# ============================================================================
+# LOGGING - records are handed to a background thread via a queue
+# ============================================================================
+
+logger = logging.getLogger('weather')
+logger.setLevel(cfg.log_level)
+logger.propagate = False
+
+def _mask_api_key(text):
+	"""Hide the WeatherAPI key in text (params, request URLs in error messages)"""
+	return text.replace(cfg.weather_api_key, '***') if cfg.weather_api_key else text
+
+class _RedactingFormatter(logging.Formatter):
+	"""Masks the WeatherAPI key in log output"""
+	def format(self, record):
+		return _mask_api_key(super().format(record))
+
+_log_stream_handler = logging.StreamHandler(sys.stdout)
+_log_stream_handler.setFormatter(_RedactingFormatter('[%(levelname)s] %(message)s'))
+_log_queue_handler = QueueHandler(queue.SimpleQueue())
+logger.addHandler(_log_queue_handler)
+_log_listener = None
+
+def reset_logging():
+	"""Start a fresh queue + listener thread (at import, and after fork where the thread is lost)"""
+	global _log_listener
+	log_queue = queue.SimpleQueue()
+	_log_listener = QueueListener(log_queue, _log_stream_handler)
+	_log_queue_handler.queue = log_queue
+	_log_listener.start()
+
+reset_logging()
+atexit.register(lambda: _log_listener.stop())
+
+# ============================================================================
+# HTTP SESSION - pooled keep-alive connections shared by every WeatherAPI call
+# ============================================================================
+
+# Sessions are created lazily per thread (and therefore per worker process),
+# so no connection pool or TLS state is shared across gunicorn forks.
+_session_local = threading.local()
+
+class _CappedRetry(Retry):
+	"""Retry that honours Retry-After but never sleeps longer than RETRY_AFTER_MAX seconds"""
+	RETRY_AFTER_MAX = 5
+	
+	def get_retry_after(self, response):
+		retry_after = super().get_retry_after(response)
+		if retry_after is None:
+			return None
+		# A long rate-limit window would otherwise park the worker thread
+		return min(retry_after, self.RETRY_AFTER_MAX)
+
+# Shared by every session; Retry objects are copied, never mutated, per request
+_RETRY = _CappedRetry(
+	total=3,
+	backoff_factor=0.3,
+	status_forcelist=[429, 502, 503, 504],
+	allowed_methods=frozenset(['GET']),
+	respect_retry_after_header=True,
+	raise_on_status=False  # Hand the last response back so HTTPError handling still applies
+)
+
+def _build_session():
+	"""Create a requests.Session with a pooled, retrying HTTPAdapter"""
+	session = requests.Session()
+	adapter = HTTPAdapter(
+		pool_connections=50,
+		pool_maxsize=50,
+		max_retries=_RETRY
+	)
+	session.mount('https://', adapter)
+	session.mount('http://', adapter)
+	session.headers.update({'Accept-Encoding': 'gzip, deflate'})
+	return session
+
+def get_session():
+	"""Return the calling thread's WeatherAPI session, creating it on first use"""
+	session = getattr(_session_local, 'session', None)
+	if session is None:
+		session = _session_local.session = _build_session()
+	return session
+
+# Long-lived worker threads for concurrent WeatherAPI calls (bundle, search
+# variants, history ranges). Each keeps its own session, so fan-out requests
+# reuse warm keep-alive connections instead of opening new TLS connections.
+def _build_fanout_pool():
+	return ThreadPoolExecutor(max_workers=cfg.fanout_workers, thread_name_prefix='weatherapi')
+
+_fanout_pool = _build_fanout_pool()
+
+def reset_sessions():
+	"""Drop sessions and worker threads inherited from a parent process (called after fork)"""
+	global _session_local, _fanout_pool
+	_session_local = threading.local()
+	_fanout_pool = _build_fanout_pool()
+
+def load_json(resp):
+	"""Read a streamed WeatherAPI response body (capped at max_body_bytes) and parse it"""
+	try:
+		body = getattr(resp, 'replayed_body', None)
+		if body is None:
+			body = read_body(resp, cfg.max_body_bytes)
+		
+		validator_key = getattr(resp, 'validator_key', None)
+		if validator_key is not None and resp.status_code == 200:
+			upstream_validators.set(validator_key, resp.headers, body)
+		return json_loads(body)
+	finally:
+		resp.close()
+
+def _upstream_too_large_response(error):
+	"""502 JSON response for an oversized WeatherAPI body"""
+	logger.error('%s', error)
+	return _error_response(_ERR_UPSTREAM_TOO_LARGE)
+
+def _retry_later_response(error, upstream=None):
+	"""
+	JSON error response with a Retry-After header
+	
+	Used once our own retries are exhausted (an upstream 429 or a RetryError),
+	so clients back off instead of retrying immediately. The delay is the
+	upstream Retry-After capped like _CappedRetry, or the cap itself.
+	"""
+	retry_after = _RETRY.get_retry_after(upstream) if upstream is not None else None
+	if retry_after is None:
+		retry_after = _CappedRetry.RETRY_AFTER_MAX
+	body, status = _error_response(error)
+	return body, status, {'Retry-After': str(math.ceil(retry_after))}
+
+def _weatherapi_get(url, params, **kwargs):
+	"""
+	GET a WeatherAPI endpoint (streamed, read via load_json) on the calling thread's session
+	
+	If an earlier identical call returned an ETag / Last-Modified, the request
+	is conditional; a 304 Not Modified becomes a 200 carrying the stored body.
+	"""
+	validator_key = make_cache_key(url, params)
+	stored = upstream_validators.get(validator_key)
+	resp = get_session().get(
+		url,
+		params=params,
+		timeout=cfg.request_timeout,
+		stream=True,
+		headers=stored[0] if stored is not None else None,
+		**kwargs
+	)
+	resp.validator_key = validator_key
+	if stored is not None and resp.status_code == 304:
+		resp.status_code = 200
+		resp.replayed_body = stored[1]
+	return resp
+
+# Per-endpoint callers with the URL bound once at import time
+_get_current = partial(_weatherapi_get, cfg.current_url)
+_get_forecast = partial(_weatherapi_get, cfg.forecast_url)
+_get_astronomy = partial(_weatherapi_get, cfg.astronomy_url)
+_get_history = partial(_weatherapi_get, cfg.history_url)
+_get_marine = partial(_weatherapi_get, cfg.marine_url)
+_get_future = partial(_weatherapi_get, cfg.future_url)
+_get_timezone = partial(_weatherapi_get, cfg.timezone_url)
+_get_sports = partial(_weatherapi_get, cfg.sports_url)
+_get_search = partial(_weatherapi_get, cfg.search_url)
+
+# Fixed query parameters per WeatherAPI call; handlers merge in q/days/dt
+_BASE_PARAMS = MappingProxyType({'key': cfg.weather_api_key})
+_CURRENT_PARAMS = MappingProxyType({**_BASE_PARAMS, 'aqi': 'yes'})
+_FORECAST_PARAMS = MappingProxyType({**_BASE_PARAMS, 'aqi': 'yes', 'alerts': 'yes'})
+_ENHANCED_CURRENT_PARAMS = MappingProxyType({
+	**_BASE_PARAMS,
+	'days': 1,  # Need forecast for astronomy data
+	'aqi': 'yes',
+	'alerts': 'no'  # Alerts are not part of this response
+})
+
+# Response cache TTLs (seconds)
+CACHE_TTL_CURRENT = 5 * 60
+CACHE_TTL_ALERTS = 2 * 60
+CACHE_TTL_FORECAST = 30 * 60
+CACHE_TTL_ENHANCED_FORECAST = 3600
+CACHE_TTL_ASTRONOMY = 6 * 3600
+CACHE_TTL_TIMEZONE = 24 * 3600
+CACHE_TTL_HISTORY = 30 * 24 * 3600  # Past weather does not change (see _history_cache_ttl)
+CACHE_TTL_MARINE = 30 * 60
+CACHE_TTL_FUTURE = 30 * 60
 
 # ============================================================================
 # STARTUP LOGGING
 # ============================================================================
 
-print(f"[INFO] Flask server starting...")
-print(f"[INFO] CORS enabled for all origins")
-print(f"[INFO] Validation & Translation modules loaded")
-print(f"[INFO] WeatherAPI Key configured: {'Yes' if WEATHER_API_KEY != 'YOUR_WEATHERAPI_KEY' else 'No (using default placeholder)'}")
+logger.info('Flask server starting...')
+logger.info('CORS enabled for all origins')
+logger.info('Validation & Translation modules loaded')
+logger.info('WeatherAPI Key configured: %s', 'Yes' if cfg.weather_api_key != 'YOUR_WEATHERAPI_KEY' else 'No (using default placeholder)')
 # DO NOT log the actual API key - security risk
-print(f"[INFO] Server will run on {FLASK_HOST}:{FLASK_PORT} (Debug: {FLASK_DEBUG})")
+logger.info('Server will run on %s:%s (Debug: %s)', cfg.flask_host, cfg.flask_port, cfg.flask_debug)
+
+# AQI category lookup tables (upper bound of each category, inclusive)
+_AQI_BREAKS = (50, 100, 150, 200, 300)
+_AQI_CATS = (
+	'Good',
+	'Moderate',
+	'Unhealthy for Sensitive Groups',
+	'Unhealthy',
+	'Very Unhealthy',
+	'Hazardous',
+)
+_AQI_RECS = {
+	'Good': 'Air quality is satisfactory, and air pollution poses little or no risk.',
+	'Moderate': 'Air quality is acceptable. However, there may be a risk for some people.',
+	'Unhealthy for Sensitive Groups': 'Members of sensitive groups may experience health effects.',
+	'Unhealthy': 'Some members of the general public may experience health effects.',
+	'Very Unhealthy': 'Health alert: The risk of health effects is increased for everyone.',
+	'Hazardous': 'Health warning of emergency conditions: everyone is more likely to be affected.',
+}
 
 # Helper function to add AQI category to air quality data
 def add_aqi_category(air_quality):
@@ -123,42 +409,34 @@ def add_aqi_category(air_quality):
 	aqi_us = air_quality.get('us-epa-index', 0)
 	
 	# Determine category
-	if aqi_us <= 50:
-		category = 'Good'
-	elif aqi_us <= 100:
-		category = 'Moderate'
-	elif aqi_us <= 150:
-		category = 'Unhealthy for Sensitive Groups'
-	elif aqi_us <= 200:
-		category = 'Unhealthy'
-	elif aqi_us <= 300:
-		category = 'Very Unhealthy'
-	else:
-		category = 'Hazardous'
+	category = _AQI_CATS[bisect_left(_AQI_BREAKS, aqi_us)]
 	
 	# Add category information
 	air_quality['aqi_us'] = aqi_us
 	air_quality['aqi_category'] = category
-	air_quality['aqi_recommendation'] = get_english_recommendation(category)
+	air_quality['aqi_recommendation'] = _AQI_RECS[category]
 	
 	return air_quality
 
 def get_english_recommendation(category):
 	"""Get English health recommendation for AQI category"""
-	recommendations = {
-		'Good': 'Air quality is satisfactory, and air pollution poses little or no risk.',
-		'Moderate': 'Air quality is acceptable. However, there may be a risk for some people.',
-		'Unhealthy for Sensitive Groups': 'Members of sensitive groups may experience health effects.',
-		'Unhealthy': 'Some members of the general public may experience health effects.',
-		'Very Unhealthy': 'Health alert: The risk of health effects is increased for everyone.',
-		'Hazardous': 'Health warning of emergency conditions: everyone is more likely to be affected.',
-	}
-	return recommendations.get(category, 'No recommendation available.')
+	return _AQI_RECS.get(category, 'No recommendation available.')
 
 # ============================================================================
 # ENHANCEMENT HELPER FUNCTIONS
 # ============================================================================
 
+@app.before_request
+def _pin_request_time():
+	"""Read the clock once per request so all enhancement helpers share it"""
+	g.now = datetime.now()
+
+def _request_now():
+	"""Time pinned for the current request (falls back to the clock)"""
+	if has_app_context() and 'now' in g:
+		return g.now
+	return datetime.now()
+
 def _enhance_current_weather_basic(weather_data):
 	"""
 	Add basic enhancements to current weather data without breaking existing structure
@@ -193,23 +471,30 @@ def _enhance_current_weather_basic(weather_data):
 		return weather_data
 		
 	except Exception as e:
-		print(f"[WARNING] Enhancement failed, returning basic data: {str(e)}")
+		logger.warning('Enhancement failed, returning basic data: %s', e)
 		return weather_data
 
-def _enhance_current_weather_full(weather_data):
+def _enhance_current_weather_full(weather_data, now=None):
 	"""
 	Add comprehensive enhancements to current weather data
 	
 	Args:
 		weather_data: Basic weather data from WeatherAPI with forecast
+		now: Reference time (defaults to the time pinned for this request)
 		
 	Returns:
-		Fully enhanced weather data with all insights
+		The same weather_data dict, with the enhanced sections added in place
 	"""
+	if now is None:
+		now = _request_now()
+	
 	try:
 		current = weather_data.get('current', {})
 		location = weather_data.get('location', {})
-		astro = weather_data.get('forecast', {}).get('forecastday', [{}])[0].get('astro', {})
+		try:
+			astro = weather_data['forecast']['forecastday'][0]['astro']
+		except (KeyError, IndexError, TypeError):
+			astro = {}
 		
 		# Get basic weather values
 		temp_c = current.get('temp_c', 20)
@@ -240,369 +525,528 @@ def _enhance_current_weather_full(weather_data):
 			enhanced_air_quality = AirQualityEnhancer.enhance_air_quality_data(current['air_quality'])
 		
 		# Weather insights
-		weather_insights = WeatherInsights.generate_weather_insights(weather_data)
+		weather_insights = WeatherInsights.generate_weather_insights(weather_data, now=now)
+		
+		# Attach enhanced sections in place (the caller owns weather_data)
+		# Enhanced astronomy data
+		weather_data['astronomy'] = {
+			'sunrise': sunrise,
+			'sunset': sunset,
+			'moonrise': astro.get('moonrise', ''),
+			'moonset': astro.get('moonset', ''),
+			'moon_phase': moon_phase,
+			'moon_phase_vi': AstronomyCalculator.get_moon_phase_vietnamese(moon_phase),
+			'moon_illumination': moon_illumination,
+			**golden_blue_hours
+		}
 		
-		# Build enhanced data structure
-		enhanced_data = {
-			# Original data
-			**weather_data,
-			
-			# Enhanced astronomy data
-			'astronomy': {
-				'sunrise': sunrise,
-				'sunset': sunset,
-				'moonrise': astro.get('moonrise', ''),
-				'moonset': astro.get('moonset', ''),
-				'moon_phase': moon_phase,
-				'moon_phase_vi': AstronomyCalculator.get_moon_phase_vietnamese(moon_phase),
-				'moon_illumination': moon_illumination,
-				**golden_blue_hours
-			},
-			
-			# Enhanced environmental data
-			'environmental': {
-				'uv_index': uv,
-				**uv_recommendations,
-				'dew_point': current.get('dewpoint_c', temp_c - 5),
-				'heat_index': heat_index,
-				'wind_chill': wind_chill if wind_chill != temp_c else None,
-				'comfort_index': comfort_index
-			},
-			
-			# Activity and clothing recommendations
-			'recommendations': {
-				'clothing': clothing_recs,
-				'activities': activity_recs,
-				'travel': travel_conditions
-			},
-			
-			# Enhanced air quality
-			'air_quality_enhanced': enhanced_air_quality,
-			
-			# Weather insights
-			'insights': weather_insights
+		# Enhanced environmental data
+		weather_data['environmental'] = {
+			'uv_index': uv,
+			**uv_recommendations,
+			'dew_point': current.get('dewpoint_c', temp_c - 5),
+			'heat_index': heat_index,
+			'wind_chill': wind_chill if wind_chill != temp_c else None,
+			'comfort_index': comfort_index
+		}
+		
+		# Activity and clothing recommendations
+		weather_data['recommendations'] = {
+			'clothing': clothing_recs,
+			'activities': activity_recs,
+			'travel': travel_conditions
 		}
 		
-		return enhanced_data
+		# Enhanced air quality
+		weather_data['air_quality_enhanced'] = enhanced_air_quality
+		
+		# Weather insights
+		weather_data['insights'] = weather_insights
+		
+		return weather_data
 		
 	except Exception as e:
-		print(f"[WARNING] Full enhancement failed, returning basic data: {str(e)}")
+		logger.warning('Full enhancement failed, returning basic data: %s', e)
 		return weather_data
 
-# API Routes
+# Formatted current-weather payloads keyed by place + upstream snapshot.
+# WeatherAPI refreshes current conditions every ~15 minutes, so requests for
+# the same place that still reach the view (other coordinates rounding to the
+# same city, cache misses across endpoints) skip translation and formatting.
+_CURRENT_MEMO_MAX = 1024
+_current_memo = {}
+_current_memo_lock = threading.Lock()
+
+def _format_current_payload(weather_data):
+	"""Translate, enhance and format a WeatherAPI current response (memoized per snapshot)"""
+	location = weather_data.get('location') or {}
+	epoch = (weather_data.get('current') or {}).get('last_updated_epoch')
+	key = (
+		location.get('name'), location.get('region'), location.get('country'),
+		location.get('lat'), location.get('lon'), location.get('localtime'), epoch
+	)
+	formatted = _current_memo.get(key) if epoch is not None else None
+	if formatted is not None:
+		return formatted
+	
+	weather_data = WeatherTranslator.translate_current_weather(weather_data)
+	enhanced_data = _enhance_current_weather_basic(weather_data)
+	formatted = ResponseFormatter.format_current_weather(enhanced_data)
+	
+	if epoch is not None:
+		with _current_memo_lock:
+			_current_memo[key] = formatted
+			while len(_current_memo) > _CURRENT_MEMO_MAX:
+				_current_memo.pop(next(iter(_current_memo)))
+	return formatted
+
+# Hourly fields copied by the enhanced forecast (key, default)
+_HOURLY_FIELDS = (
+	('time', ''),
+	('time_epoch', 0),
+	('temp_c', 0),
+	('feelslike_c', 0),
+	('wind_kph', 0),
+	('wind_dir', ''),
+	('pressure_mb', 0),
+	('humidity', 0),
+	('cloud', 0),
+	('chance_of_rain', 0),
+	('chance_of_snow', 0),
+	('uv', 0),
+	('vis_km', 0),
+)
+_get_hourly_fields = itemgetter(*(key for key, _ in _HOURLY_FIELDS))
 
+def format_enhanced_hour(hour):
+	"""Extract the hourly fields used by the enhanced forecast"""
+	try:
+		values = _get_hourly_fields(hour)
+	except KeyError:
+		values = tuple(hour.get(key, default) for key, default in _HOURLY_FIELDS)
+	
+	(time, time_epoch, temp_c, feelslike_c, wind_kph, wind_dir, pressure_mb,
+		humidity, cloud, chance_of_rain, chance_of_snow, uv, vis_km) = values
+	condition = hour.get('condition') or {}
+	
+	return {
+		'time': time,
+		'time_epoch': time_epoch,
+		'temp_c': temp_c,
+		'feelslike_c': feelslike_c,
+		'condition': {
+			'text': condition.get('text', ''),
+			'text_vi': condition.get('text_vi', ''),
+			'icon': condition.get('icon', ''),
+			'code': condition.get('code', 0)
+		},
+		'wind_kph': wind_kph,
+		'wind_dir': wind_dir,
+		'pressure_mb': pressure_mb,
+		'humidity': humidity,
+		'cloud': cloud,
+		'chance_of_rain': chance_of_rain,
+		'chance_of_snow': chance_of_snow,
+		'uv': uv,
+		'vis_km': vis_km
+	}
 
-@app.route('/api/weather/current', methods=['POST'])
-def get_current_weather():
-	"""
-	Get current weather by location or GPS coordinates
-	Request body: { location: string } OR { lat: number, lon: number }
-	Returns Vietnamese-translated weather data
+def _stream_success(success_response):
 	"""
-	print(f"[DEBUG] Received request to /api/weather/current")
+	Stream a format_success() body instead of serializing it in one piece
 	
-	if not request.is_json:
-		print(f"[ERROR] Request is not JSON")
-		error_response = ResponseFormatter.format_error(
-			'Content-Type phải là application/json',
-			'INVALID_CONTENT_TYPE'
-		)
-		return jsonify(error_response), 400
+	Each member of 'data' is serialized separately and the enhanced hourly
+	list hour by hour, so the first bytes go out before the whole body is
+	encoded and the full serialized body never sits in memory.
+	"""
+	dumps = app.json.dumps
 	
-	data = request.get_json()
-	print(f"[DEBUG] Request data: {data}")
+	def generate():
+		separator = '{'
+		for key, value in success_response.items():
+			yield f'{separator}{dumps(key)}:'
+			separator = ','
+			if key != 'data':
+				yield dumps(value)
+				continue
+			
+			data_separator = '{'
+			for data_key, data_value in value.items():
+				yield f'{data_separator}{dumps(data_key)}:'
+				data_separator = ','
+				if data_key == 'hourly_forecast':
+					yield '{"hours":['
+					hour_separator = ''
+					for hour in data_value['hours']:
+						yield hour_separator + dumps(hour)
+						hour_separator = ','
+					yield ']}'
+				else:
+					yield dumps(data_value)
+			yield '}' if data_separator == ',' else '{}'
+		yield '}'
 	
-	# Sanitize input
+	return app.response_class(generate(), mimetype='application/json')
+
+# Bodies up to this size have their validation result memoized; location
+# requests are tiny, and the cap keeps large junk bodies out of the cache
+_VALIDATION_CACHE_MAX_BODY = 1024
+
+def _validate_location_data(data):
+	"""Sanitize and validate a location request body"""
 	data = InputValidator.sanitize_input(data)
+	return InputValidator.validate_location_request(data)
+
+@lru_cache(maxsize=1024)
+def _validate_location_body(raw_body):
+	"""
+	_validate_location_data() memoized on the raw JSON body
 	
-	# Validate location request
-	is_valid, error_msg, cleaned_data = InputValidator.validate_location_request(data)
-	if not is_valid:
-		error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
-		return jsonify(error_response), 400
-	
-	# Build query
-	if 'location' in cleaned_data:
-		query = cleaned_data['location']
-		print(f"[DEBUG] Query by location: {query}")
-	else:
-		query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
-		print(f"[DEBUG] Query by coordinates: {query}")
-	
-	params = {
-		'key': WEATHER_API_KEY,
-		'q': query,
-		'aqi': 'yes'
-	}
+	Auto-refreshing clients resend identical bodies, so the sanitize +
+	validate pass runs once per distinct body. The result is shared:
+	callers must copy cleaned_data before changing it.
+	"""
+	return _validate_location_data(json_loads(raw_body))
+
+def require_location(view):
+	"""
+	Validate a JSON location request before running the view
 	
-	try:
-		print(f"[DEBUG] Calling WeatherAPI with params: {params}")
-		resp = requests.get(WEATHER_API_CURRENT_URL, params=params, timeout=10)
-		resp.raise_for_status()
-		print(f"[DEBUG] WeatherAPI response successful")
-		
-		weather_data = resp.json()
-		
-		# Translate to Vietnamese
-		weather_data = WeatherTranslator.translate_current_weather(weather_data)
-		
-		# Add basic enhancements to current weather
-		enhanced_data = _enhance_current_weather_basic(weather_data)
-		
-		# Format response
-		formatted_data = ResponseFormatter.format_current_weather(enhanced_data)
-		success_response = ResponseFormatter.format_success(
-			formatted_data,
-			'Lấy dữ liệu thời tiết hiện tại thành công'
-		)
-		
-		return jsonify(success_response), 200
+	Checks the content type, sanitizes and validates the body, builds the
+	WeatherAPI query and calls view(cleaned_data, query). Invalid requests
+	get the usual 400 JSON error.
+	"""
+	@wraps(view)
+	def wrapper(*args, **kwargs):
+		logger.debug('Received request to %s', request.path)
+		
+		if not request.is_json:
+			return _error_response(_ERR_INVALID_CONTENT_TYPE)
+		
+		data = request.get_json()
+		logger.debug('Request data: %s', data)
+		
+		# Sanitize and validate input
+		raw_body = request.get_data(cache=True)
+		if len(raw_body) <= _VALIDATION_CACHE_MAX_BODY:
+			try:
+				is_valid, error_msg, cleaned_data = _validate_location_body(raw_body)
+			except ValueError:
+				is_valid, error_msg, cleaned_data = _validate_location_data(data)
+		else:
+			is_valid, error_msg, cleaned_data = _validate_location_data(data)
+		if not is_valid:
+			error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
+			return jsonify(error_response), 400
+		cleaned_data = dict(cleaned_data)
 		
-	except requests.exceptions.HTTPError as e:
-		print(f"[ERROR] WeatherAPI HTTP error: {e}, Status: {resp.status_code}")
-		if resp.status_code == 400:
-			error_response = ResponseFormatter.format_error(
-				'Địa điểm hoặc tọa độ không hợp lệ',
-				'INVALID_LOCATION',
-				400
-			)
-		elif resp.status_code == 401 or resp.status_code == 403:
-			error_response = ResponseFormatter.format_error(
-				'API key không hợp lệ hoặc đã hết hạn',
-				'API_KEY_ERROR',
-				500
-			)
+		# Build query
+		if 'location' in cleaned_data:
+			query = cleaned_data['location']
+			logger.debug('Query by location: %s', query)
 		else:
-			error_response = ResponseFormatter.format_error(
-				f'Lỗi API: {str(e)}',
-				'API_ERROR',
-				500
-			)
-		return jsonify(error_response), error_response['error']['status']
+			query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
+			logger.debug('Query by coordinates: %s', query)
 		
-	except Exception as e:
-		print(f"[ERROR] Unexpected error: {str(e)}")
-		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
+		return view(cleaned_data, query, *args, **kwargs)
+	return wrapper
 
+def _request_option(name, default=None):
+	"""Sanitized optional member of a require_location body (date, language...)"""
+	return InputValidator.sanitize_input(request.get_json().get(name, default))
 
-@app.route('/api/weather/forecast', methods=['POST'])
-def get_forecast_weather():
-	"""
-	Get 7-day forecast by location or GPS coordinates
-	Request body: { location: string, days: number } OR { lat: number, lon: number, days: number }
-	Returns Vietnamese-translated forecast data
+# ============================================================================
+# WEATHERAPI ERROR MAPPING
+# ============================================================================
+
+# Shared (message, code) pairs for handle_weatherapi_errors
+_INVALID_API_KEY = ('API key không hợp lệ', 'INVALID_API_KEY')
+_WEATHERAPI_ERROR = ('Lỗi WeatherAPI: {error}', 'WEATHER_API_ERROR')
+_REQUEST_TIMEOUT = ('Request timeout. Vui lòng thử lại', 'REQUEST_TIMEOUT')
+_API_AUTH_ERROR = ('Lỗi xác thực API', 'API_AUTH_ERROR')
+_API_ACCESS_DENIED = ('Không có quyền truy cập API', 'API_ACCESS_DENIED')
+_API_TIMEOUT = ('Yêu cầu API bị timeout', 'API_TIMEOUT')
+_API_ERROR = ('Lỗi API: {error}', 'API_ERROR')
+_WEATHER_DATA_ERROR = ('Không thể lấy dữ liệu thời tiết', 'API_ERROR')
+
+# Current / forecast / alerts / enhanced views: a rejected API key is a
+# server-side problem, so it is reported as a 500 rather than passed through
+_CORE_ERRORS = {
+	400: _ERR_INVALID_LOCATION,
+	401: _ERR_API_KEY,
+	403: _ERR_API_KEY,
+}
+
+def handle_weatherapi_errors(name, errors, fallback, timeout):
 	"""
-	print(f"[DEBUG] Received request to /api/weather/forecast")
+	Turn WeatherAPI failures raised inside a view into JSON error responses
 	
-	if not request.is_json:
-		error_response = ResponseFormatter.format_error(
-			'Content-Type phải là application/json',
-			'INVALID_CONTENT_TYPE'
-		)
-		return jsonify(error_response), 400
+	Args:
+		name: Endpoint name used in log messages
+		errors: {upstream status: (message, code)} returned with the upstream
+			status, or a prebuilt error_body() returned with its own status
+		fallback: (message, code) for any other upstream status; '{error}' in the
+			message is replaced by the error text (with the API key masked)
+		timeout: (message, code) returned with a 504 when WeatherAPI times out
 	
-	data = request.get_json()
-	print(f"[DEBUG] Request data: {data}")
+	An upstream 429 left after our retries becomes a 429 and a RetryError a
+	503, both with a Retry-After header.
+	"""
+	def decorator(view):
+		@wraps(view)
+		def wrapper(*args, **kwargs):
+			try:
+				return view(*args, **kwargs)
+			
+			except requests.exceptions.HTTPError as e:
+				logger.error('WeatherAPI %s HTTP error: %s', name, e)
+				status_code = e.response.status_code if e.response is not None else 500
+				if status_code == 429:
+					return _retry_later_response(_ERR_RATE_LIMITED, e.response)
+				error = errors.get(status_code, fallback)
+				if isinstance(error, dict):
+					return _error_response(error)
+				message, code = error
+				error_response = ResponseFormatter.format_error(
+					message.format(error=_mask_api_key(str(e))),
+					code,
+					status_code
+				)
+				return jsonify(error_response), status_code
+			
+			except requests.exceptions.RetryError as e:
+				logger.error('WeatherAPI %s retries exhausted: %s', name, e)
+				return _retry_later_response(_ERR_UPSTREAM_UNAVAILABLE)
+			
+			except requests.exceptions.Timeout:
+				logger.error('WeatherAPI %s timeout', name)
+				message, code = timeout
+				error_response = ResponseFormatter.format_error(message, code, 504)
+				return jsonify(error_response), 504
+			
+			except UpstreamResponseTooLarge as e:
+				return _upstream_too_large_response(e)
+			
+			except Exception as e:
+				logger.error('Error in %s: %s', name, e)
+				error_response = ResponseFormatter.format_error(
+					f'Lỗi không mong muốn: {_mask_api_key(str(e))}',
+					'INTERNAL_ERROR',
+					500
+				)
+				return jsonify(error_response), 500
+		return wrapper
+	return decorator
+
+# ============================================================================
+# WEATHERAPI COMPONENT FETCHERS
+# ============================================================================
+
+# Shared by the single-resource routes and /api/weather/bundle. Each fetcher
+# calls WeatherAPI, raises requests exceptions on failure and returns the
+# formatted payload.
+
+def _fetch_forecast(query, days):
+	"""Fetch a translated forecast (with AQI category) for query"""
+	params = {**_FORECAST_PARAMS, 'q': query, 'days': days}
+	logger.debug('Calling WeatherAPI forecast with params: %s', params)
+	resp = _get_forecast(params)
+	resp.raise_for_status()
+	logger.debug('WeatherAPI forecast response successful')
 	
-	# Sanitize input
-	data = InputValidator.sanitize_input(data)
+	weather_data = load_json(resp)
 	
-	# Validate location request
-	is_valid, error_msg, cleaned_data = InputValidator.validate_location_request(data)
-	if not is_valid:
-		error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
-		return jsonify(error_response), 400
+	# Add AQI category if air quality data exists
+	if weather_data.get('current', {}).get('air_quality'):
+		air_quality = weather_data['current']['air_quality']
+		weather_data['current']['air_quality'] = add_aqi_category(air_quality)
 	
-	# Get days parameter (default to 7)
-	days = cleaned_data.get('days', 7)
+	# Translate to Vietnamese
+	weather_data = WeatherTranslator.translate_all(weather_data, sections=('forecast', 'alerts'))
+	return ResponseFormatter.format_forecast(weather_data)
+
+def _fetch_astronomy(query, date=''):
+	"""Fetch sunrise/sunset and moon data for query (date defaults to today)"""
+	params = {
+		**_BASE_PARAMS,
+		'q': query
+	}
 	
-	# Build query
-	if 'location' in cleaned_data:
-		query = cleaned_data['location']
-		print(f"[DEBUG] Query by location: {query}")
-	else:
-		query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
-		print(f"[DEBUG] Query by coordinates: {query}")
+	if date:
+		params['dt'] = date
 	
+	logger.debug('Calling WeatherAPI astronomy with params: %s', params)
+	resp = _get_astronomy(params)
+	resp.raise_for_status()
+	logger.debug('WeatherAPI astronomy response successful')
+	
+	astronomy_data = load_json(resp)
+	return {
+		'location': ResponseFormatter._format_location(astronomy_data.get('location', {})),
+		'astronomy': ResponseFormatter._format_astronomy(astronomy_data.get('astronomy', {}))
+	}
+
+def _fetch_marine(query, days=3, language='vi'):
+	"""Fetch marine forecast for query (translated when language is 'vi')"""
 	params = {
-		'key': WEATHER_API_KEY,
+		**_BASE_PARAMS,
 		'q': query,
-		'days': days,
-		'aqi': 'yes',
-		'alerts': 'yes'
+		'days': days
 	}
 	
-	try:
-		print(f"[DEBUG] Calling WeatherAPI forecast with params: {params}")
-		resp = requests.get(WEATHER_API_FORECAST_URL, params=params, timeout=10)
-		resp.raise_for_status()
-		print(f"[DEBUG] WeatherAPI forecast response successful")
-		
-		weather_data = resp.json()
-		
-		# Add AQI category if air quality data exists
-		if weather_data.get('current', {}).get('air_quality'):
-			air_quality = weather_data['current']['air_quality']
-			weather_data['current']['air_quality'] = add_aqi_category(air_quality)
-		
-		# Translate to Vietnamese
-		weather_data = WeatherTranslator.translate_forecast(weather_data)
-		weather_data = WeatherTranslator.translate_alerts(weather_data)
-		
-		# Format response
-		formatted_data = ResponseFormatter.format_forecast(weather_data)
-		success_response = ResponseFormatter.format_success(
-			formatted_data,
-			f'Lấy dự báo {days} ngày thành công'
-		)
-		
-		return jsonify(success_response), 200
-		
-	except requests.exceptions.HTTPError as e:
-		print(f"[ERROR] WeatherAPI HTTP error: {e}, Status: {resp.status_code}")
-		if resp.status_code == 400:
-			error_response = ResponseFormatter.format_error(
-				'Địa điểm hoặc tọa độ không hợp lệ',
-				'INVALID_LOCATION',
-				400
-			)
-		elif resp.status_code == 401 or resp.status_code == 403:
-			error_response = ResponseFormatter.format_error(
-				'API key không hợp lệ hoặc đã hết hạn',
-				'API_KEY_ERROR',
-				500
-			)
-		else:
-			error_response = ResponseFormatter.format_error(
-				f'Lỗi API: {str(e)}',
-				'API_ERROR',
-				500
-			)
-		return jsonify(error_response), error_response['error']['status']
-		
-	except Exception as e:
-		print(f"[ERROR] Unexpected error: {str(e)}")
-		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
+	logger.debug('Calling WeatherAPI marine with params: %s', params)
+	resp = _get_marine(params)
+	resp.raise_for_status()
+	logger.debug('WeatherAPI marine response successful')
+	
+	marine_data = load_json(resp)
+	
+	# Translate to Vietnamese if needed
+	if language == 'vi':
+		marine_data = WeatherTranslator.translate_forecast(marine_data)
+	
+	# Marine data has the same structure as a forecast
+	return ResponseFormatter.format_forecast(marine_data)
+
+def _fetch_timezone(query):
+	"""Fetch timezone / local time information for query"""
+	response = _get_timezone({**_BASE_PARAMS, 'q': query})
+	response.raise_for_status()
+	
+	timezone_data = load_json(response)
+	return ResponseFormatter._format_location(timezone_data.get('location', {}))
+
+# API Routes
+
+
+@app.route('/api/weather/current', methods=['POST'])
+@etag_response(max_age=CACHE_TTL_CURRENT)  # Conditions update every few minutes
+@cached_response('current', CACHE_TTL_CURRENT)
+@handle_weatherapi_errors(
+	'current weather',
+	errors=_CORE_ERRORS,
+	fallback=_API_ERROR,
+	timeout=_REQUEST_TIMEOUT
+)
+@require_location
+def get_current_weather(cleaned_data, query):
+	"""
+	Get current weather by location or GPS coordinates
+	Request body: { location: string } OR { lat: number, lon: number }
+	Returns Vietnamese-translated weather data
+	"""
+	params = {**_CURRENT_PARAMS, 'q': query}
+	
+	logger.debug('Calling WeatherAPI with params: %s', params)
+	resp = _get_current(params)
+	resp.raise_for_status()
+	logger.debug('WeatherAPI response successful')
+	
+	weather_data = load_json(resp)
+	
+	# Translate to Vietnamese, add basic enhancements and format
+	formatted_data = _format_current_payload(weather_data)
+	success_response = ResponseFormatter.format_success(
+		formatted_data,
+		'Lấy dữ liệu thời tiết hiện tại thành công'
+	)
+	
+	return jsonify(success_response), 200
+
+
+@app.route('/api/weather/forecast', methods=['POST'])
+@etag_response(max_age=CACHE_TTL_FORECAST)  # Forecasts change slowly - let clients/CDNs keep them
+@cached_response('forecast', CACHE_TTL_FORECAST)
+@handle_weatherapi_errors(
+	'forecast',
+	errors=_CORE_ERRORS,
+	fallback=_API_ERROR,
+	timeout=_REQUEST_TIMEOUT
+)
+@require_location
+def get_forecast_weather(cleaned_data, query):
+	"""
+	Get 7-day forecast by location or GPS coordinates
+	Request body: { location: string, days: number } OR { lat: number, lon: number, days: number }
+	Returns Vietnamese-translated forecast data
+	"""
+	# Get days parameter (default to 7)
+	days = cleaned_data.get('days', 7)
+	
+	formatted_data = _fetch_forecast(query, days)
+	success_response = ResponseFormatter.format_success(
+		formatted_data,
+		f'Lấy dự báo {days} ngày thành công'
+	)
+	
+	return jsonify(success_response), 200
 
 
 @app.route('/api/weather/alerts', methods=['POST'])
-def get_weather_alerts():
+@etag_response(max_age=60)  # Short: warnings must not linger after they change
+@cached_response('alerts', CACHE_TTL_ALERTS)
+@handle_weatherapi_errors(
+	'alerts',
+	errors=_CORE_ERRORS,
+	fallback=_API_ERROR,
+	timeout=_REQUEST_TIMEOUT
+)
+@require_location
+def get_weather_alerts(cleaned_data, query):
 	"""
 	Get weather alerts and air quality warnings
 	Request body: { location: string } OR { lat: number, lon: number }
 	Returns Vietnamese-translated alerts and AQI data
 	"""
-	print(f"[DEBUG] Received request to /api/weather/alerts")
+	params = {**_FORECAST_PARAMS, 'q': query, 'days': 1}
 	
-	if not request.is_json:
-		error_response = ResponseFormatter.format_error(
-			'Content-Type phải là application/json',
-			'INVALID_CONTENT_TYPE'
-		)
-		return jsonify(error_response), 400
+	logger.debug('Calling WeatherAPI alerts with params: %s', params)
+	resp = _get_forecast(params)
+	resp.raise_for_status()
+	logger.debug('WeatherAPI alerts response successful')
 	
-	data = request.get_json()
-	print(f"[DEBUG] Request data: {data}")
+	weather_data = load_json(resp)
 	
-	# Sanitize input
-	data = InputValidator.sanitize_input(data)
+	# Add AQI category if air quality data exists
+	if weather_data.get('current', {}).get('air_quality'):
+		air_quality = weather_data['current']['air_quality']
+		weather_data['current']['air_quality'] = add_aqi_category(air_quality)
 	
-	# Validate location request
-	is_valid, error_msg, cleaned_data = InputValidator.validate_location_request(data)
-	if not is_valid:
-		error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
-		return jsonify(error_response), 400
+	# ?summary=1 callers only need has_warnings - with nothing to warn
+	# about (the common case) skip translation and formatting entirely
+	if request.args.get('summary') == '1':
+		has_alerts = bool((weather_data.get('alerts') or {}).get('alert'))
+		air_quality = weather_data.get('current', {}).get('air_quality') or {}
+		if not has_alerts and not ResponseFormatter.has_aqi_warning(air_quality):
+			success_response = ResponseFormatter.format_success(
+				{'has_warnings': False},
+				'Không có cảnh báo thời tiết'
+			)
+			return jsonify(success_response), 200
 	
-	# Build query
-	if 'location' in cleaned_data:
-		query = cleaned_data['location']
-		print(f"[DEBUG] Query by location: {query}")
-	else:
-		query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
-		print(f"[DEBUG] Query by coordinates: {query}")
+	# Translate to Vietnamese
+	weather_data = WeatherTranslator.translate_alerts(weather_data)
 	
-	params = {
-		'key': WEATHER_API_KEY,
-		'q': query,
-		'days': 1,
-		'aqi': 'yes',
-		'alerts': 'yes'
-	}
+	# Format response
+	formatted_data = ResponseFormatter.format_alerts(weather_data)
 	
-	try:
-		print(f"[DEBUG] Calling WeatherAPI alerts with params: {params}")
-		resp = requests.get(WEATHER_API_FORECAST_URL, params=params, timeout=10)
-		resp.raise_for_status()
-		print(f"[DEBUG] WeatherAPI alerts response successful")
-		
-		weather_data = resp.json()
-		
-		# Add AQI category if air quality data exists
-		if weather_data.get('current', {}).get('air_quality'):
-			air_quality = weather_data['current']['air_quality']
-			weather_data['current']['air_quality'] = add_aqi_category(air_quality)
-		
-		# Translate to Vietnamese
-		weather_data = WeatherTranslator.translate_alerts(weather_data)
-		
-		# Format response
-		formatted_data = ResponseFormatter.format_alerts(weather_data)
-		
-		# Check if there are any warnings
-		has_warnings = bool(formatted_data.get('alerts', {}).get('alert', []))
-		aqi_us = formatted_data.get('air_quality', {}).get('aqi_us', 0)
-		if aqi_us > 100:
-			has_warnings = True
-		
-		formatted_data['has_warnings'] = has_warnings
-		
-		success_response = ResponseFormatter.format_success(
-			formatted_data,
-			'Lấy cảnh báo thời tiết thành công'
-		)
-		
-		return jsonify(success_response), 200
-		
-	except requests.exceptions.HTTPError as e:
-		print(f"[ERROR] WeatherAPI HTTP error: {e}, Status: {resp.status_code}")
-		if resp.status_code == 400:
-			error_response = ResponseFormatter.format_error(
-				'Địa điểm hoặc tọa độ không hợp lệ',
-				'INVALID_LOCATION',
-				400
-			)
-		elif resp.status_code == 401 or resp.status_code == 403:
-			error_response = ResponseFormatter.format_error(
-				'API key không hợp lệ hoặc đã hết hạn',
-				'API_KEY_ERROR',
-				500
-			)
-		else:
-			error_response = ResponseFormatter.format_error(
-				f'Lỗi API: {str(e)}',
-				'API_ERROR',
-				500
-			)
-		return jsonify(error_response), error_response['error']['status']
-		
-	except Exception as e:
-		print(f"[ERROR] Unexpected error: {str(e)}")
-		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
+	success_response = ResponseFormatter.format_success(
+		formatted_data,
+		'Lấy cảnh báo thời tiết thành công'
+	)
+	
+	return jsonify(success_response), 200
+
+def _search_weatherapi(search_query):
+	"""Call the WeatherAPI search endpoint for a single query"""
+	logger.debug('Searching with query: %s', search_query)
+	params = {**_BASE_PARAMS, 'q': search_query}
+	resp = _get_search(params)
+	resp.raise_for_status()
+	
+	search_results = load_json(resp)
+	logger.debug("WeatherAPI found %s results for '%s'", len(search_results), search_query)
+	return search_results
 
 @app.route('/api/weather/search', methods=['GET'])
 def search_cities():
@@ -611,7 +1055,7 @@ def search_cities():
 	Query parameter: q (search query)
 	Returns list of matching cities with country and region info
 	"""
-	print(f"[DEBUG] Received request to /api/weather/search")
+	logger.debug('Received request to /api/weather/search')
 	
 	query = request.args.get('q', '').strip()
 	
@@ -635,47 +1079,39 @@ def search_cities():
 	query = InputValidator.sanitize_input(query)
 	
 	try:
-		print(f"[DEBUG] Original query: {query}")
+		logger.debug('Original query: %s', query)
 		
 		# Check if Vietnamese city query and normalize
 		search_queries = []
 		if VietnameseCityNormalizer.is_vietnamese_city_query(query):
-			print(f"[DEBUG] Detected Vietnamese city query")
+			logger.debug('Detected Vietnamese city query')
 			normalized_queries = VietnameseCityNormalizer.normalize_city_name(query)
 			search_queries = normalized_queries
-			print(f"[DEBUG] Normalized queries: {search_queries}")
+			logger.debug('Normalized queries: %s', search_queries)
 		else:
 			search_queries = [query]
 		
 		all_results = []
 		seen_ids = set()
 		
-		# Try each normalized query
-		for search_query in search_queries:
-			print(f"[DEBUG] Searching with query: {search_query}")
-			
-			# Use WeatherAPI search endpoint
-			params = {
-				'key': WEATHER_API_KEY,
-				'q': search_query
-			}
-			
-			resp = requests.get(WEATHER_API_SEARCH_URL, params=params, timeout=10)
-			resp.raise_for_status()
-			
-			search_results = resp.json()
-			print(f"[DEBUG] WeatherAPI found {len(search_results)} results for '{search_query}'")
-			
-			# Add unique results
-			for result in search_results:
-				result_id = result.get('id')
-				if result_id not in seen_ids:
-					seen_ids.add(result_id)
-					all_results.append(result)
-			
-			# Stop if we have enough results
-			if len(all_results) >= 10:
-				break
+		# Query all normalized variants concurrently on the shared pool; results
+		# are merged in variant order so the best-ranked variant still wins
+		futures = [_fanout_pool.submit(_search_weatherapi, q) for q in search_queries]
+		try:
+			for future in futures:
+				# Add unique results
+				for result in future.result():
+					result_id = result.get('id')
+					if result_id not in seen_ids:
+						seen_ids.add(result_id)
+						all_results.append(result)
+				
+				# Stop if we have enough results
+				if len(all_results) >= 10:
+					break
+		finally:
+			for future in futures:
+				future.cancel()  # No-op for calls already running or done
 		
 		# Format results for frontend
 		formatted_results = []
@@ -700,7 +1136,9 @@ def search_cities():
 		return jsonify(success_response), 200
 		
 	except requests.exceptions.HTTPError as e:
-		print(f"[ERROR] HTTP error during city search: {e}")
+		logger.error('HTTP error during city search: %s', e)
+		if e.response is not None and e.response.status_code == 429:
+			return _retry_later_response(_ERR_RATE_LIMITED, e.response)
 		error_response = ResponseFormatter.format_error(
 			'Không thể tìm kiếm thành phố. Vui lòng thử lại sau.',
 			'SEARCH_ERROR',
@@ -709,18 +1147,25 @@ def search_cities():
 		return jsonify(error_response), 500
 		
 	except requests.exceptions.Timeout:
-		print(f"[ERROR] Request timeout during city search")
+		logger.error('Request timeout during city search')
 		error_response = ResponseFormatter.format_error(
 			'Yêu cầu tìm kiếm quá thời gian. Vui lòng thử lại.',
 			'TIMEOUT_ERROR',
 			504
 		)
 		return jsonify(error_response), 504
+	
+	except requests.exceptions.RetryError as e:
+		logger.error('WeatherAPI search retries exhausted: %s', e)
+		return _retry_later_response(_ERR_UPSTREAM_UNAVAILABLE)
 		
+	except UpstreamResponseTooLarge as e:
+		return _upstream_too_large_response(e)
+	
 	except Exception as e:
-		print(f"[ERROR] Unexpected error: {str(e)}")
+		logger.error('Unexpected error: %s', e)
 		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
+			f'Lỗi không mong muốn: {_mask_api_key(str(e))}',
 			'INTERNAL_ERROR',
 			500
 		)
@@ -731,372 +1176,255 @@ def search_cities():
 # ============================================================================
 
 @app.route('/api/weather/enhanced-current', methods=['POST'])
-def get_enhanced_current_weather():
+@etag_response(max_age=60)
+@cached_response('enhanced-current', CACHE_TTL_CURRENT)
+@handle_weatherapi_errors(
+	'enhanced current weather',
+	errors=_CORE_ERRORS,
+	fallback=_WEATHER_DATA_ERROR,
+	timeout=_REQUEST_TIMEOUT
+)
+@require_location
+def get_enhanced_current_weather(cleaned_data, query):
 	"""
 	Get enhanced current weather with comprehensive recommendations and insights
 	"""
-	print(f"[DEBUG] Received request to /api/weather/enhanced-current")
+	# Get weather data with a 1-day forecast for astronomy info
+	params = {**_ENHANCED_CURRENT_PARAMS, 'q': query}
 	
-	if not request.is_json:
-		error_response = ResponseFormatter.format_error(
-			'Content-Type phải là application/json',
-			'INVALID_CONTENT_TYPE'
-		)
-		return jsonify(error_response), 400
+	resp = _get_forecast(params)
+	resp.raise_for_status()
 	
-	data = request.get_json()
-	print(f"[DEBUG] Request data: {data}")
+	weather_data = load_json(resp)
 	
-	# Sanitize and validate input
-	data = InputValidator.sanitize_input(data)
-	is_valid, error_msg, cleaned_data = InputValidator.validate_location_request(data)
-	if not is_valid:
-		error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
-		return jsonify(error_response), 400
+	# Translate to Vietnamese
+	weather_data = WeatherTranslator.translate_all(weather_data, sections=('current', 'forecast'))
 	
-	# Build query
-	if 'location' in cleaned_data:
-		query = cleaned_data['location']
-	else:
-		query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
+	# Enhance the data
+	enhanced_data = _enhance_current_weather_full(weather_data)
 	
-	# Get weather data with forecast for astronomy info
-	params = {
-		'key': WEATHER_API_KEY,
-		'q': query,
-		'days': 1,  # Need forecast for astronomy data
-		'aqi': 'yes',
-		'alerts': 'yes'
+	# Format the enhanced response
+	current_weather = enhanced_data.get('current', {})
+	
+	# Ensure condition data is properly formatted
+	if 'condition' in current_weather and current_weather['condition']:
+		condition = current_weather['condition']
+		if isinstance(condition, dict) and 'code' not in condition:
+			# If condition doesn't have code, try to extract from original data
+			original_condition = weather_data.get('current', {}).get('condition', {})
+			condition['code'] = original_condition.get('code', 1000)
+			current_weather['condition'] = condition
+	
+	formatted_data = {
+		'location': ResponseFormatter._format_location(enhanced_data.get('location', {})),
+		'current': ResponseFormatter._format_current(current_weather),
+		'astronomy': enhanced_data.get('astronomy', {}),
+		'environmental': enhanced_data.get('environmental', {}),
+		'recommendations': enhanced_data.get('recommendations', {}),
+		'air_quality_enhanced': enhanced_data.get('air_quality_enhanced', {}),
+		'insights': enhanced_data.get('insights', {})
 	}
 	
-	try:
-		resp = requests.get(WEATHER_API_FORECAST_URL, params=params, timeout=10)
-		resp.raise_for_status()
-		
-		weather_data = resp.json()
-		
-		# Translate to Vietnamese
-		weather_data = WeatherTranslator.translate_current_weather(weather_data)
-		weather_data = WeatherTranslator.translate_forecast(weather_data)
-		
-		# Enhance the data
-		enhanced_data = _enhance_current_weather_full(weather_data)
-		
-		# Format the enhanced response
-		current_weather = enhanced_data.get('current', {})
-		
-		# Ensure condition data is properly formatted
-		if 'condition' in current_weather and current_weather['condition']:
-			condition = current_weather['condition']
-			if isinstance(condition, dict) and 'code' not in condition:
-				# If condition doesn't have code, try to extract from original data
-				original_condition = weather_data.get('current', {}).get('condition', {})
-				condition['code'] = original_condition.get('code', 1000)
-				current_weather['condition'] = condition
-		
-		formatted_data = {
-			'location': ResponseFormatter._format_location(enhanced_data.get('location', {})),
-			'current': ResponseFormatter._format_current(current_weather),
-			'astronomy': enhanced_data.get('astronomy', {}),
-			'environmental': enhanced_data.get('environmental', {}),
-			'recommendations': enhanced_data.get('recommendations', {}),
-			'air_quality_enhanced': enhanced_data.get('air_quality_enhanced', {}),
-			'insights': enhanced_data.get('insights', {})
-		}
-		
-		success_response = ResponseFormatter.format_success(
-			formatted_data,
-			'Lấy dữ liệu thời tiết nâng cao thành công'
-		)
-		
-		return jsonify(success_response), 200
-		
-	except requests.exceptions.HTTPError as e:
-		print(f"[ERROR] WeatherAPI HTTP error: {e}")
-		error_response = ResponseFormatter.format_error(
-			'Không thể lấy dữ liệu thời tiết',
-			'API_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
-		
-	except Exception as e:
-		print(f"[ERROR] Unexpected error: {str(e)}")
-		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
+	success_response = ResponseFormatter.format_success(
+		formatted_data,
+		'Lấy dữ liệu thời tiết nâng cao thành công'
+	)
+	
+	return jsonify(success_response), 200
 
 @app.route('/api/weather/enhanced-forecast', methods=['POST'])
-def get_enhanced_forecast():
+@etag_response(max_age=60)
+@cached_response('enhanced-forecast', CACHE_TTL_ENHANCED_FORECAST)
+@handle_weatherapi_errors(
+	'enhanced forecast',
+	errors=_CORE_ERRORS,
+	fallback=_WEATHER_DATA_ERROR,
+	timeout=_REQUEST_TIMEOUT
+)
+@require_location
+def get_enhanced_forecast(cleaned_data, query):
 	"""
 	Get enhanced forecast with hourly data and comprehensive recommendations
 	"""
-	print(f"[DEBUG] Received request to /api/weather/enhanced-forecast")
+	days = cleaned_data.get('days', 7)
 	
-	if not request.is_json:
-		error_response = ResponseFormatter.format_error(
-			'Content-Type phải là application/json',
-			'INVALID_CONTENT_TYPE'
-		)
-		return jsonify(error_response), 400
+	params = {**_FORECAST_PARAMS, 'q': query, 'days': days}
 	
-	data = request.get_json()
-	data = InputValidator.sanitize_input(data)
-	is_valid, error_msg, cleaned_data = InputValidator.validate_location_request(data)
+	resp = _get_forecast(params)
+	resp.raise_for_status()
 	
-	if not is_valid:
-		error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
-		return jsonify(error_response), 400
+	weather_data = load_json(resp)
 	
-	# Build query
-	if 'location' in cleaned_data:
-		query = cleaned_data['location']
-	else:
-		query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
+	# Translate to Vietnamese
+	weather_data = WeatherTranslator.translate_all(weather_data, sections=('forecast', 'alerts'))
 	
-	days = cleaned_data.get('days', 7)
+	# Enhance current weather data
+	enhanced_current = _enhance_current_weather_full(weather_data)
 	
-	params = {
-		'key': WEATHER_API_KEY,
-		'q': query,
-		'days': days,
-		'aqi': 'yes',
-		'alerts': 'yes'
-	}
+	# Format basic forecast data
+	formatted_forecast = ResponseFormatter.format_forecast(weather_data)
 	
+	# Add hourly data if available
 	try:
-		resp = requests.get(WEATHER_API_FORECAST_URL, params=params, timeout=10)
-		resp.raise_for_status()
-		
-		weather_data = resp.json()
-		
-		# Translate to Vietnamese
-		weather_data = WeatherTranslator.translate_forecast(weather_data)
-		weather_data = WeatherTranslator.translate_alerts(weather_data)
-		
-		# Enhance current weather data
-		enhanced_current = _enhance_current_weather_full(weather_data)
-		
-		# Format basic forecast data
-		formatted_forecast = ResponseFormatter.format_forecast(weather_data)
-		
-		# Add hourly data if available
-		forecast_days = weather_data.get('forecast', {}).get('forecastday', [])
-		enhanced_hourly = []
-		
-		for day in forecast_days[:2]:  # Only process first 2 days for hourly data
-			hours = day.get('hour', [])
-			for hour in hours:
-				enhanced_hourly.append({
-					'time': hour.get('time', ''),
-					'time_epoch': hour.get('time_epoch', 0),
-					'temp_c': hour.get('temp_c', 0),
-					'feelslike_c': hour.get('feelslike_c', 0),
-					'condition': {
-						'text': hour.get('condition', {}).get('text', ''),
-						'text_vi': hour.get('condition', {}).get('text_vi', ''),
-						'icon': hour.get('condition', {}).get('icon', ''),
-						'code': hour.get('condition', {}).get('code', 0)
-					},
-					'wind_kph': hour.get('wind_kph', 0),
-					'wind_dir': hour.get('wind_dir', ''),
-					'pressure_mb': hour.get('pressure_mb', 0),
-					'humidity': hour.get('humidity', 0),
-					'cloud': hour.get('cloud', 0),
-					'chance_of_rain': hour.get('chance_of_rain', 0),
-					'chance_of_snow': hour.get('chance_of_snow', 0),
-					'uv': hour.get('uv', 0),
-					'vis_km': hour.get('vis_km', 0)
-				})
-		
-		# Build enhanced forecast structure
-		enhanced_forecast = {
-			# Basic forecast data
-			**formatted_forecast,
-			
-			# Enhanced hourly data
-			'hourly_forecast': {
-				'hours': enhanced_hourly
-			},
-			
-			# Current weather with all enhancements
-			'current_enhanced': {
-				'location': ResponseFormatter._format_location(enhanced_current.get('location', {})),
-				'current': ResponseFormatter._format_current(enhanced_current.get('current', {})),
-				'astronomy': enhanced_current.get('astronomy', {}),
-				'environmental': enhanced_current.get('environmental', {}),
-				'recommendations': enhanced_current.get('recommendations', {}),
-				'air_quality_enhanced': enhanced_current.get('air_quality_enhanced', {}),
-				'insights': enhanced_current.get('insights', {})
-			}
+		forecast_days = weather_data['forecast']['forecastday']
+	except KeyError:
+		forecast_days = []
+	# Only process first 2 days for hourly data
+	hours = chain.from_iterable(day.get('hour', []) for day in forecast_days[:2])
+	enhanced_hourly = [format_enhanced_hour(hour) for hour in hours]
+	
+	# Build enhanced forecast structure
+	enhanced_forecast = {
+		# Basic forecast data
+		**formatted_forecast,
+		
+		# Enhanced hourly data
+		'hourly_forecast': {
+			'hours': enhanced_hourly
+		},
+		
+		# Current weather with all enhancements
+		'current_enhanced': {
+			'location': ResponseFormatter._format_location(enhanced_current.get('location', {})),
+			'current': ResponseFormatter._format_current(enhanced_current.get('current', {})),
+			'astronomy': enhanced_current.get('astronomy', {}),
+			'environmental': enhanced_current.get('environmental', {}),
+			'recommendations': enhanced_current.get('recommendations', {}),
+			'air_quality_enhanced': enhanced_current.get('air_quality_enhanced', {}),
+			'insights': enhanced_current.get('insights', {})
 		}
-		
-		success_response = ResponseFormatter.format_success(
-			enhanced_forecast,
-			f'Lấy dự báo nâng cao {days} ngày thành công'
-		)
-		
-		return jsonify(success_response), 200
-		
-	except Exception as e:
-		print(f"[ERROR] Error in enhanced forecast: {str(e)}")
-		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
+	}
+	
+	success_response = ResponseFormatter.format_success(
+		enhanced_forecast,
+		f'Lấy dự báo nâng cao {days} ngày thành công'
+	)
+	
+	# ?stream=1 sends the (large) body in chunks as it is serialized
+	if request.args.get('stream') == '1':
+		return _stream_success(success_response)
+	return jsonify(success_response), 200
 
 # ============================================================================
 # ADDITIONAL WEATHERAPI ENDPOINTS
 # ============================================================================
 
-@app.route('/api/weather/astronomy', methods=['POST'])
-def get_astronomy():
+def _seconds_until_local_midnight(localtime):
 	"""
-	Get astronomy data (sunrise, sunset, moon phases) for a specific location and date
+	Seconds left in a location's day, from WeatherAPI's 'YYYY-MM-DD H:MM' localtime
+	
+	Returns None when localtime cannot be parsed.
 	"""
-	print(f"[DEBUG] Received request to /api/weather/astronomy")
+	try:
+		local_now = datetime.strptime(localtime, '%Y-%m-%d %H:%M')
+	except (TypeError, ValueError):
+		return None
 	
-	if not request.is_json:
-		error_response = ResponseFormatter.format_error(
-			'Content-Type phải là application/json',
-			'INVALID_CONTENT_TYPE'
-		)
-		return jsonify(error_response), 400
+	midnight = datetime.combine(local_now.date() + timedelta(days=1), datetime.min.time())
+	# localtime is truncated to the minute, so the day may end up to a minute sooner
+	return max(int((midnight - local_now).total_seconds()) - 60, 0)
 
-	data = request.get_json()
-	print(f"[DEBUG] Request data: {data}")
+@app.route('/api/weather/astronomy', methods=['POST'])
+@etag_response(max_age=CACHE_TTL_ASTRONOMY)  # Stable for hours - let proxies cache it
+@cached_response('astronomy', CACHE_TTL_ASTRONOMY)
+@handle_weatherapi_errors(
+	'astronomy',
+	errors={
+		400: ('Địa điểm hoặc tọa độ không hợp lệ', 'INVALID_LOCATION'),
+		401: _INVALID_API_KEY,
+		403: ('API key đã vượt quá giới hạn', 'API_LIMIT_EXCEEDED'),
+	},
+	fallback=_WEATHERAPI_ERROR,
+	timeout=_REQUEST_TIMEOUT
+)
+@require_location
+def get_astronomy(cleaned_data, query):
+	"""
+	Get astronomy data (sunrise, sunset, moon phases) for a specific location and date
+	"""
+	# Get date parameter (optional, defaults to today)
+	date = _request_option('date', '')  # Format: YYYY-MM-DD
 
-	# Sanitize and validate input
-	data = InputValidator.sanitize_input(data)
-	is_valid, error_msg, cleaned_data = InputValidator.validate_location_request(data)
-	if not is_valid:
-		error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
-		return jsonify(error_response), 400
+	formatted_data = _fetch_astronomy(query, date)
 
-	# Build query
-	if 'location' in cleaned_data:
-		query = cleaned_data['location']
-	else:
-		query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
+	success_response = ResponseFormatter.format_success(
+		formatted_data,
+		'Dữ liệu thiên văn học lấy thành công'
+	)
+	
+	response = jsonify(success_response)
+	if not date:
+		# "Today" is not part of the cache key - expire at the location's midnight
+		seconds_left = _seconds_until_local_midnight(formatted_data['location']['localtime'])
+		if seconds_left is None:
+			seconds_left = CACHE_TTL_FORECAST
+		response.expires = datetime.now(timezone.utc) + timedelta(seconds=seconds_left)
+	return response, 200
 
-	# Get date parameter (optional, defaults to today)
-	date = data.get('date', '')  # Format: YYYY-MM-DD
+# WeatherAPI accepts history ranges of up to 30 days
+MAX_HISTORY_DAYS = 30
 
-	params = {
-		'key': WEATHER_API_KEY,
-		'q': query
-	}
+def _expand_history_dates(date, end_date):
+	"""
+	Expand a date..end_date range into a list of YYYY-MM-DD strings
 	
-	if date:
-		params['dt'] = date
-
+	Returns None when either date cannot be parsed or the range is empty
+	or longer than MAX_HISTORY_DAYS.
+	"""
 	try:
-		print(f"[DEBUG] Calling WeatherAPI astronomy with params: {params}")
-		resp = requests.get(WEATHER_API_ASTRONOMY_URL, params=params, timeout=10)
-		resp.raise_for_status()
-		print(f"[DEBUG] WeatherAPI astronomy response successful")
-
-		astronomy_data = resp.json()
-		
-		# Translate and format response
-		formatted_data = {
-			'location': ResponseFormatter._format_location(astronomy_data.get('location', {})),
-			'astronomy': ResponseFormatter._format_astronomy(astronomy_data.get('astronomy', {}))
-		}
-
-		success_response = ResponseFormatter.format_success(
-			formatted_data,
-			'Dữ liệu thiên văn học lấy thành công'
-		)
-		
-		return jsonify(success_response), 200
-
-	except requests.exceptions.HTTPError as e:
-		print(f"[ERROR] WeatherAPI astronomy HTTP error: {e}")
-		if resp.status_code == 400:
-			error_response = ResponseFormatter.format_error(
-				'Địa điểm hoặc tọa độ không hợp lệ',
-				'INVALID_LOCATION',
-				400
-			)
-			return jsonify(error_response), 400
-		elif resp.status_code == 401:
-			error_response = ResponseFormatter.format_error(
-				'API key không hợp lệ',
-				'INVALID_API_KEY',
-				401
-			)
-			return jsonify(error_response), 401
-		elif resp.status_code == 403:
-			error_response = ResponseFormatter.format_error(
-				'API key đã vượt quá giới hạn',
-				'API_LIMIT_EXCEEDED',
-				403
-			)
-			return jsonify(error_response), 403
-		else:
-			error_response = ResponseFormatter.format_error(
-				f'Lỗi WeatherAPI: {str(e)}',
-				'WEATHER_API_ERROR',
-				resp.status_code
-			)
-			return jsonify(error_response), resp.status_code
+		start = datetime.strptime(date, '%Y-%m-%d')
+		end = datetime.strptime(end_date, '%Y-%m-%d')
+	except (TypeError, ValueError):
+		return None
+	
+	span = (end - start).days
+	if span < 0 or span >= MAX_HISTORY_DAYS:
+		return None
+	return [(start + timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(span + 1)]
 
-	except requests.exceptions.Timeout:
-		print(f"[ERROR] WeatherAPI astronomy timeout")
-		error_response = ResponseFormatter.format_error(
-			'Request timeout. Vui lòng thử lại',
-			'REQUEST_TIMEOUT',
-			504
-		)
-		return jsonify(error_response), 504
+def _history_cache_ttl(payload):
+	"""
+	Cache lifetime of a history response
+	
+	Only ranges that ended before yesterday (UTC) are final everywhere; today's
+	and yesterday's data can still change in some time zone, so those use the
+	forecast TTL, as do requests whose dates cannot be parsed.
+	"""
+	last_day = payload.get('end_date') or payload.get('date')
+	try:
+		last_day = datetime.strptime(last_day, '%Y-%m-%d').date()
+	except (TypeError, ValueError):
+		return CACHE_TTL_FORECAST
+	
+	if last_day < datetime.now(timezone.utc).date() - timedelta(days=1):
+		return CACHE_TTL_HISTORY
+	return CACHE_TTL_FORECAST
 
-	except Exception as e:
-		print(f"[ERROR] Error in astronomy: {str(e)}")
-		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
+def _fetch_history_day(params):
+	"""Fetch one history.json response on the calling thread's session"""
+	resp = _get_history(params)
+	resp.raise_for_status()
+	return load_json(resp)
 
 @app.route('/api/weather/history', methods=['POST'])
-def get_weather_history():
+@cached_response('history', _history_cache_ttl)
+@handle_weatherapi_errors(
+	'history',
+	errors={
+		400: ('Địa điểm, tọa độ hoặc ngày không hợp lệ', 'INVALID_LOCATION_OR_DATE'),
+		401: _INVALID_API_KEY,
+		403: ('API key đã vượt quá giới hạn hoặc không có quyền truy cập dữ liệu lịch sử', 'API_LIMIT_EXCEEDED'),
+	},
+	fallback=_WEATHERAPI_ERROR,
+	timeout=_REQUEST_TIMEOUT
+)
+@require_location
+def get_weather_history(cleaned_data, query):
 	"""
 	Get historical weather data for a specific location and date range
 	"""
-	print(f"[DEBUG] Received request to /api/weather/history")
-	
-	if not request.is_json:
-		error_response = ResponseFormatter.format_error(
-			'Content-Type phải là application/json',
-			'INVALID_CONTENT_TYPE'
-		)
-		return jsonify(error_response), 400
-
-	data = request.get_json()
-	print(f"[DEBUG] Request data: {data}")
-
-	# Sanitize and validate input
-	data = InputValidator.sanitize_input(data)
-	is_valid, error_msg, cleaned_data = InputValidator.validate_location_request(data)
-	if not is_valid:
-		error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
-		return jsonify(error_response), 400
-
-	# Build query
-	if 'location' in cleaned_data:
-		query = cleaned_data['location']
-	else:
-		query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
-
 	# Get date parameter (required for history)
-	date = data.get('date')
+	date = _request_option('date')
 	if not date:
 		error_response = ResponseFormatter.format_error(
 			'Thiếu tham số date (YYYY-MM-DD)',
@@ -1105,314 +1433,172 @@ def get_weather_history():
 		return jsonify(error_response), 400
 
 	params = {
-		'key': WEATHER_API_KEY,
+		**_BASE_PARAMS,
 		'q': query,
 		'dt': date,
 		'aqi': 'yes'
 	}
 
 	# Optional end date for date range
-	end_date = data.get('end_date')
-	if end_date:
+	end_date = _request_option('end_date')
+	language = _request_option('language', 'vi')
+	history_dates = _expand_history_dates(date, end_date) if end_date else None
+	if end_date and not history_dates:
+		# Unparseable or too long a range - let WeatherAPI handle end_dt itself
 		params['end_dt'] = end_date
 
-	try:
-		print(f"[DEBUG] Calling WeatherAPI history with params: {params}")
-		resp = requests.get(WEATHER_API_HISTORY_URL, params=params, timeout=10)
-		resp.raise_for_status()
-		print(f"[DEBUG] WeatherAPI history response successful")
-
-		history_data = resp.json()
-		
-		# Translate to Vietnamese
-		history_data = WeatherTranslator.translate_forecast(history_data)
-		
-		# Format response
-		formatted_data = {
-			'location': ResponseFormatter._format_location(history_data.get('location', {})),
-			'forecast': ResponseFormatter._format_forecast(history_data.get('forecast', {}))
+	if history_dates:
+		# One request per day, issued concurrently, merged in date order
+		day_params = [{**params, 'dt': day} for day in history_dates]
+		logger.debug('Calling WeatherAPI history for %s days: %s', len(day_params), history_dates)
+		day_results = list(_fanout_pool.map(_fetch_history_day, day_params))
+		
+		history_data = day_results[0]
+		history_data['forecast'] = {
+			'forecastday': [
+				forecast_day
+				for day_result in day_results
+				for forecast_day in day_result.get('forecast', {}).get('forecastday', [])
+			]
 		}
+	else:
+		logger.debug('Calling WeatherAPI history with params: %s', params)
+		history_data = _fetch_history_day(params)
+	logger.debug('WeatherAPI history response successful')
+	
+	# Translate to Vietnamese if needed
+	if language == 'vi':
+		history_data = WeatherTranslator.translate_forecast(history_data)
+	
+	# Format response
+	formatted_data = {
+		'location': ResponseFormatter._format_location(history_data.get('location', {})),
+		'forecast': ResponseFormatter._format_forecast_days(history_data.get('forecast', {}))
+	}
 
-		success_response = ResponseFormatter.format_success(
-			formatted_data,
-			'Dữ liệu lịch sử thời tiết lấy thành công'
-		)
-		
-		return jsonify(success_response), 200
-
-	except requests.exceptions.HTTPError as e:
-		print(f"[ERROR] WeatherAPI history HTTP error: {e}")
-		if resp.status_code == 400:
-			error_response = ResponseFormatter.format_error(
-				'Địa điểm, tọa độ hoặc ngày không hợp lệ',
-				'INVALID_LOCATION_OR_DATE',
-				400
-			)
-			return jsonify(error_response), 400
-		elif resp.status_code == 401:
-			error_response = ResponseFormatter.format_error(
-				'API key không hợp lệ',
-				'INVALID_API_KEY',
-				401
-			)
-			return jsonify(error_response), 401
-		elif resp.status_code == 403:
-			error_response = ResponseFormatter.format_error(
-				'API key đã vượt quá giới hạn hoặc không có quyền truy cập dữ liệu lịch sử',
-				'API_LIMIT_EXCEEDED',
-				403
-			)
-			return jsonify(error_response), 403
-		else:
-			error_response = ResponseFormatter.format_error(
-				f'Lỗi WeatherAPI: {str(e)}',
-				'WEATHER_API_ERROR',
-				resp.status_code
-			)
-			return jsonify(error_response), resp.status_code
-
-	except requests.exceptions.Timeout:
-		print(f"[ERROR] WeatherAPI history timeout")
-		error_response = ResponseFormatter.format_error(
-			'Request timeout. Vui lòng thử lại',
-			'REQUEST_TIMEOUT',
-			504
-		)
-		return jsonify(error_response), 504
-
-	except Exception as e:
-		print(f"[ERROR] Error in history: {str(e)}")
-		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
+	success_response = ResponseFormatter.format_success(
+		formatted_data,
+		'Dữ liệu lịch sử thời tiết lấy thành công'
+	)
+	
+	return jsonify(success_response), 200
 
 @app.route('/api/weather/marine', methods=['POST'])
-def get_marine_weather():
+@cached_response('marine', CACHE_TTL_MARINE)
+@handle_weatherapi_errors(
+	'marine',
+	errors={
+		400: ('Địa điểm hoặc tọa độ không hợp lệ cho dữ liệu thời tiết biển', 'INVALID_LOCATION'),
+		401: _INVALID_API_KEY,
+		403: ('API key đã vượt quá giới hạn hoặc không có quyền truy cập dữ liệu thời tiết biển', 'API_LIMIT_EXCEEDED'),
+	},
+	fallback=_WEATHERAPI_ERROR,
+	timeout=_REQUEST_TIMEOUT
+)
+@require_location
+def get_marine_weather(cleaned_data, query):
 	"""
 	Get marine/ocean weather data for coastal and maritime activities
 	"""
-	print(f"[DEBUG] Received request to /api/weather/marine")
-	
-	if not request.is_json:
-		error_response = ResponseFormatter.format_error(
-			'Content-Type phải là application/json',
-			'INVALID_CONTENT_TYPE'
-		)
-		return jsonify(error_response), 400
-
-	data = request.get_json()
-	print(f"[DEBUG] Request data: {data}")
-
-	# Sanitize and validate input
-	data = InputValidator.sanitize_input(data)
-	is_valid, error_msg, cleaned_data = InputValidator.validate_location_request(data)
-	if not is_valid:
-		error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
-		return jsonify(error_response), 400
-
-	# Build query
-	if 'location' in cleaned_data:
-		query = cleaned_data['location']
-	else:
-		query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
-
 	# Get days parameter for marine forecast (default 3 days, max 7)
-	days = min(int(data.get('days', 3)), 7)
-
-	params = {
-		'key': WEATHER_API_KEY,
-		'q': query,
-		'days': days
-	}
+	days = min(cleaned_data.get('days', 3), 7)
+	language = _request_option('language', 'vi')
 
-	try:
-		print(f"[DEBUG] Calling WeatherAPI marine with params: {params}")
-		resp = requests.get(WEATHER_API_MARINE_URL, params=params, timeout=10)
-		resp.raise_for_status()
-		print(f"[DEBUG] WeatherAPI marine response successful")
-
-		marine_data = resp.json()
-		
-		# Translate to Vietnamese if needed
-		marine_data = WeatherTranslator.translate_forecast(marine_data)
-		
-		# Format response using forecast formatter (marine data has similar structure)
-		formatted_data = ResponseFormatter.format_forecast(marine_data)
-
-		success_response = ResponseFormatter.format_success(
-			formatted_data,
-			'Dữ liệu thời tiết biển lấy thành công'
-		)
-		
-		return jsonify(success_response), 200
-
-	except requests.exceptions.HTTPError as e:
-		print(f"[ERROR] WeatherAPI marine HTTP error: {e}")
-		if resp.status_code == 400:
-			error_response = ResponseFormatter.format_error(
-				'Địa điểm hoặc tọa độ không hợp lệ cho dữ liệu thời tiết biển',
-				'INVALID_LOCATION',
-				400
-			)
-			return jsonify(error_response), 400
-		elif resp.status_code == 401:
-			error_response = ResponseFormatter.format_error(
-				'API key không hợp lệ',
-				'INVALID_API_KEY',
-				401
-			)
-			return jsonify(error_response), 401
-		elif resp.status_code == 403:
-			error_response = ResponseFormatter.format_error(
-				'API key đã vượt quá giới hạn hoặc không có quyền truy cập dữ liệu thời tiết biển',
-				'API_LIMIT_EXCEEDED',
-				403
-			)
-			return jsonify(error_response), 403
-		else:
-			error_response = ResponseFormatter.format_error(
-				f'Lỗi WeatherAPI: {str(e)}',
-				'WEATHER_API_ERROR',
-				resp.status_code
-			)
-			return jsonify(error_response), resp.status_code
-
-	except requests.exceptions.Timeout:
-		print(f"[ERROR] WeatherAPI marine timeout")
-		error_response = ResponseFormatter.format_error(
-			'Request timeout. Vui lòng thử lại',
-			'REQUEST_TIMEOUT',
-			504
-		)
-		return jsonify(error_response), 504
-
-	except Exception as e:
-		print(f"[ERROR] Error in marine weather: {str(e)}")
-		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
+	formatted_data = _fetch_marine(query, days, language)
 
-# Sports Events endpoint
-@app.route('/api/weather/sports', methods=['POST'])
-def get_sports_events():
-	"""Get upcoming sports events data"""
-	try:
-		request_data = request.get_json() or {}
-		location = request_data.get('location', '').strip()
-		language = request_data.get('language', 'vi')
-		
-		if not location:
-			print(f"[ERROR] No location provided for sports events request")
-			error_response = ResponseFormatter.format_error(
-				'Vui lòng cung cấp thông tin địa điểm',
-				'MISSING_LOCATION',
-				400
-			)
-			return jsonify(error_response), 400
-		
-		# Validate location
-		is_valid, error_msg = InputValidator.validate_location_string(location)
-		if not is_valid:
-			print(f"[ERROR] Invalid location for sports events: {location} - {error_msg}")
-			error_response = ResponseFormatter.format_error(
-				error_msg or 'Địa điểm không hợp lệ',
-				'INVALID_LOCATION',
-				400
-			)
-			return jsonify(error_response), 400
-		
-		print(f"[INFO] Getting sports events for location: {location}")
-		
-		response = requests.get(
-			WEATHER_API_SPORTS_URL,
-			params={'key': WEATHER_API_KEY, 'q': location},
-			timeout=10
-		)
-		
-		if response.status_code == 400:
-			print(f"[ERROR] Bad request for sports events: {response.text}")
-			error_response = ResponseFormatter.format_error(
-				'Địa điểm hoặc thông số không hợp lệ',
-				'INVALID_LOCATION',
-				400
-			)
-			return jsonify(error_response), 400
-		
-		if response.status_code == 401:
-			print(f"[ERROR] Unauthorized API request for sports events")
-			error_response = ResponseFormatter.format_error(
-				'Lỗi xác thực API',
-				'API_AUTH_ERROR',
-				401
-			)
-			return jsonify(error_response), 401
-		
-		if response.status_code == 403:
-			print(f"[ERROR] Forbidden API request for sports events")
-			error_response = ResponseFormatter.format_error(
-				'Không có quyền truy cập API',
-				'API_ACCESS_DENIED',
-				403
-			)
-			return jsonify(error_response), 403
-		
-		if response.status_code != 200:
-			print(f"[ERROR] API request failed for sports events: {response.status_code}")
-			error_response = ResponseFormatter.format_error(
-				'Không thể lấy dữ liệu sự kiện thể thao',
-				'SPORTS_EVENTS_FAILED',
-				response.status_code
-			)
-			return jsonify(error_response), response.status_code
-		
-		sports_data = response.json()
-		print(f"[INFO] Sports events data retrieved successfully")
-		
-		# Sports API returns a different structure - array of events
-		# Format the sports events data directly (no need for forecast formatting)
-		formatted_data = sports_data
-		
-		success_response = ResponseFormatter.format_success(
-			formatted_data,
-			'Dữ liệu sự kiện thể thao lấy thành công'
-		)
-		return jsonify(success_response), 200
-		
-	except requests.Timeout:
-		print(f"[ERROR] API request timeout for sports events")
-		error_response = ResponseFormatter.format_error(
-			'Yêu cầu API bị timeout',
-			'API_TIMEOUT',
-			504
-		)
-		return jsonify(error_response), 504
+	success_response = ResponseFormatter.format_success(
+		formatted_data,
+		'Dữ liệu thời tiết biển lấy thành công'
+	)
+	
+	return jsonify(success_response), 200
 
-	except Exception as e:
-		print(f"[ERROR] Error in sports events: {str(e)}")
-		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
+# ============================================================================
+# LOCATION-STRING ENDPOINTS (sports, timezone, future)
+# ============================================================================
 
-# Time Zone endpoint
-@app.route('/api/weather/timezone', methods=['POST'])
-def get_timezone():
-	"""Get timezone information for a location"""
-	try:
+def _fetch_sports(location):
+	"""Fetch upcoming sports events near location"""
+	response = _get_sports({**_BASE_PARAMS, 'q': location})
+	response.raise_for_status()
+	# Sports API returns a different structure - array of events
+	# Returned as is (no need for forecast formatting)
+	return load_json(response)
+
+def _fetch_future(location, date, language='vi'):
+	"""Fetch the future (14-300 days ahead) forecast for location on date"""
+	response = _get_future({**_BASE_PARAMS, 'q': location, 'dt': date})
+	response.raise_for_status()
+	
+	formatted_data = ResponseFormatter.format_forecast(load_json(response))
+	
+	# Translate Vietnamese if needed
+	if language == 'vi':
+		formatted_data = WeatherTranslator.translate_forecast(formatted_data)
+	return formatted_data
+
+class LocationEndpoint(NamedTuple):
+	"""A WeatherAPI endpoint queried by a plain location string"""
+	endpoint: str                 # Flask endpoint name
+	name: str                     # Used in log messages
+	fetch: Callable               # fetch(location, date, language) -> formatted data
+	success_message: str
+	errors: dict                  # {upstream status: (message, code)}
+	fallback: tuple               # (message, code) for other upstream statuses
+	cache_ttl: int = 0            # 0 disables the response cache
+	max_age: int = 0              # Cache-Control max-age + ETag; 0 disables them
+	requires_date: bool = False
+
+_LOCATION_ERRORS = {
+	400: ('Địa điểm hoặc thông số không hợp lệ', 'INVALID_LOCATION'),
+	401: _API_AUTH_ERROR,
+	403: _API_ACCESS_DENIED,
+}
+
+LOCATION_ENDPOINTS = {
+	'/api/weather/sports': LocationEndpoint(
+		endpoint='get_sports_events',
+		name='sports events',
+		fetch=lambda location, date, language: _fetch_sports(location),
+		success_message='Dữ liệu sự kiện thể thao lấy thành công',
+		errors=_LOCATION_ERRORS,
+		fallback=('Không thể lấy dữ liệu sự kiện thể thao', 'SPORTS_EVENTS_FAILED')
+	),
+	'/api/weather/timezone': LocationEndpoint(
+		endpoint='get_timezone',
+		name='timezone',
+		fetch=lambda location, date, language: _fetch_timezone(location),
+		success_message='Thông tin múi giờ lấy thành công',
+		errors=_LOCATION_ERRORS,
+		fallback=('Không thể lấy thông tin múi giờ', 'TIMEZONE_FAILED'),
+		cache_ttl=CACHE_TTL_TIMEZONE,
+		max_age=CACHE_TTL_TIMEZONE
+	),
+	'/api/weather/future': LocationEndpoint(
+		endpoint='get_future_weather',
+		name='future weather',
+		fetch=_fetch_future,
+		success_message='Dữ liệu thời tiết tương lai lấy thành công',
+		errors={
+			**_LOCATION_ERRORS,
+			400: ('Địa điểm, ngày hoặc thông số không hợp lệ', 'INVALID_LOCATION_OR_DATE'),
+		},
+		fallback=('Không thể lấy dữ liệu thời tiết tương lai', 'FUTURE_WEATHER_FAILED'),
+		cache_ttl=CACHE_TTL_FUTURE,
+		requires_date=True
+	),
+}
+
+def _make_location_view(spec):
+	"""Build the view for a LocationEndpoint: validate -> fetch -> format"""
+	def view():
 		request_data = request.get_json() or {}
 		location = request_data.get('location', '').strip()
+		date = request_data.get('date', '').strip() if spec.requires_date else ''
 		language = request_data.get('language', 'vi')
 		
 		if not location:
-			print(f"[ERROR] No location provided for timezone request")
+			logger.error('No location provided for %s request', spec.name)
 			error_response = ResponseFormatter.format_error(
 				'Vui lòng cung cấp thông tin địa điểm',
 				'MISSING_LOCATION',
@@ -1420,112 +1606,8 @@ def get_timezone():
 			)
 			return jsonify(error_response), 400
 		
-		# Validate location
-		is_valid, error_msg = InputValidator.validate_location_string(location)
-		if not is_valid:
-			print(f"[ERROR] Invalid location for timezone: {location} - {error_msg}")
-			error_response = ResponseFormatter.format_error(
-				error_msg or 'Địa điểm không hợp lệ',
-				'INVALID_LOCATION',
-				400
-			)
-			return jsonify(error_response), 400
-		
-		print(f"[INFO] Getting timezone for location: {location}")
-		
-		response = requests.get(
-			WEATHER_API_TIMEZONE_URL,
-			params={'key': WEATHER_API_KEY, 'q': location},
-			timeout=10
-		)
-		
-		if response.status_code == 400:
-			print(f"[ERROR] Bad request for timezone: {response.text}")
-			error_response = ResponseFormatter.format_error(
-				'Địa điểm hoặc thông số không hợp lệ',
-				'INVALID_LOCATION',
-				400
-			)
-			return jsonify(error_response), 400
-		
-		if response.status_code == 401:
-			print(f"[ERROR] Unauthorized API request for timezone")
-			error_response = ResponseFormatter.format_error(
-				'Lỗi xác thực API',
-				'API_AUTH_ERROR',
-				401
-			)
-			return jsonify(error_response), 401
-		
-		if response.status_code == 403:
-			print(f"[ERROR] Forbidden API request for timezone")
-			error_response = ResponseFormatter.format_error(
-				'Không có quyền truy cập API',
-				'API_ACCESS_DENIED',
-				403
-			)
-			return jsonify(error_response), 403
-		
-		if response.status_code != 200:
-			print(f"[ERROR] API request failed for timezone: {response.status_code}")
-			error_response = ResponseFormatter.format_error(
-				'Không thể lấy thông tin múi giờ',
-				'TIMEZONE_FAILED',
-				response.status_code
-			)
-			return jsonify(error_response), response.status_code
-		
-		timezone_data = response.json()
-		print(f"[INFO] Timezone data retrieved successfully")
-		
-		# Format the timezone data (use location formatting)
-		formatted_data = ResponseFormatter._format_location(timezone_data.get('location', {}))
-		
-		success_response = ResponseFormatter.format_success(
-			formatted_data,
-			'Thông tin múi giờ lấy thành công'
-		)
-		return jsonify(success_response), 200
-		
-	except requests.Timeout:
-		print(f"[ERROR] API request timeout for timezone")
-		error_response = ResponseFormatter.format_error(
-			'Yêu cầu API bị timeout',
-			'API_TIMEOUT',
-			504
-		)
-		return jsonify(error_response), 504
-
-	except Exception as e:
-		print(f"[ERROR] Error in timezone: {str(e)}")
-		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
-		)
-		return jsonify(error_response), 500
-
-# Future Weather endpoint  
-@app.route('/api/weather/future', methods=['POST'])
-def get_future_weather():
-	"""Get future weather forecast data (beyond 14 days)"""
-	try:
-		request_data = request.get_json() or {}
-		location = request_data.get('location', '').strip()
-		date = request_data.get('date', '').strip()
-		language = request_data.get('language', 'vi')
-		
-		if not location:
-			print(f"[ERROR] No location provided for future weather request")
-			error_response = ResponseFormatter.format_error(
-				'Vui lòng cung cấp thông tin địa điểm',
-				'MISSING_LOCATION',
-				400
-			)
-			return jsonify(error_response), 400
-			
-		if not date:
-			print(f"[ERROR] No date provided for future weather request")
+		if spec.requires_date and not date:
+			logger.error('No date provided for %s request', spec.name)
 			error_response = ResponseFormatter.format_error(
 				'Vui lòng cung cấp ngày cần dự báo',
 				'MISSING_DATE',
@@ -1536,7 +1618,7 @@ def get_future_weather():
 		# Validate location
 		is_valid, error_msg = InputValidator.validate_location_string(location)
 		if not is_valid:
-			print(f"[ERROR] Invalid location for future weather: {location} - {error_msg}")
+			logger.error('Invalid location for %s: %s - %s', spec.name, location, error_msg)
 			error_response = ResponseFormatter.format_error(
 				error_msg or 'Địa điểm không hợp lệ',
 				'INVALID_LOCATION',
@@ -1544,83 +1626,105 @@ def get_future_weather():
 			)
 			return jsonify(error_response), 400
 		
-		print(f"[INFO] Getting future weather for location: {location}, date: {date}")
-		
-		response = requests.get(
-			WEATHER_API_FUTURE_URL,
-			params={'key': WEATHER_API_KEY, 'q': location, 'dt': date},
-			timeout=10
-		)
-		
-		if response.status_code == 400:
-			print(f"[ERROR] Bad request for future weather: {response.text}")
-			error_response = ResponseFormatter.format_error(
-				'Địa điểm, ngày hoặc thông số không hợp lệ',
-				'INVALID_LOCATION_OR_DATE',
-				400
-			)
-			return jsonify(error_response), 400
-		
-		if response.status_code == 401:
-			print(f"[ERROR] Unauthorized API request for future weather")
-			error_response = ResponseFormatter.format_error(
-				'Lỗi xác thực API',
-				'API_AUTH_ERROR',
-				401
-			)
-			return jsonify(error_response), 401
-		
-		if response.status_code == 403:
-			print(f"[ERROR] Forbidden API request for future weather")
-			error_response = ResponseFormatter.format_error(
-				'Không có quyền truy cập API',
-				'API_ACCESS_DENIED',
-				403
-			)
-			return jsonify(error_response), 403
-		
-		if response.status_code != 200:
-			print(f"[ERROR] API request failed for future weather: {response.status_code}")
-			error_response = ResponseFormatter.format_error(
-				'Không thể lấy dữ liệu thời tiết tương lai',
-				'FUTURE_WEATHER_FAILED',
-				response.status_code
-			)
-			return jsonify(error_response), response.status_code
-		
-		future_data = response.json()
-		print(f"[INFO] Future weather data retrieved successfully")
-		
-		# Format the future data using ResponseFormatter
-		formatted_data = ResponseFormatter.format_forecast(future_data)
+		logger.info('Getting %s for location: %s%s', spec.name, location, f', date: {date}' if date else '')
+		formatted_data = spec.fetch(location, date, language)
+		logger.info('%s data retrieved successfully', spec.name.capitalize())
 		
-		# Translate Vietnamese if needed
-		if language == 'vi':
-			formatted_data = WeatherTranslator.translate_forecast(formatted_data)
-		
-		success_response = ResponseFormatter.format_success(
-			formatted_data,
-			'Dữ liệu thời tiết tương lai lấy thành công'
-		)
+		success_response = ResponseFormatter.format_success(formatted_data, spec.success_message)
 		return jsonify(success_response), 200
-		
-	except requests.Timeout:
-		print(f"[ERROR] API request timeout for future weather")
+	
+	view.__name__ = spec.endpoint
+	view.__doc__ = f'Get {spec.name} data for a location'
+	return view
+
+for _path, _spec in LOCATION_ENDPOINTS.items():
+	_view = handle_weatherapi_errors(
+		_spec.name,
+		errors=_spec.errors,
+		fallback=_spec.fallback,
+		timeout=_API_TIMEOUT
+	)(_make_location_view(_spec))
+	if _spec.cache_ttl:
+		_view = cached_response(_path.rsplit('/', 1)[-1], _spec.cache_ttl)(_view)
+	if _spec.max_age:
+		_view = etag_response(max_age=_spec.max_age)(_view)
+	app.add_url_rule(_path, _spec.endpoint, _view, methods=['POST'])
+
+# Weather bundle endpoint - several components for one location in one round trip
+BUNDLE_COMPONENTS = ('forecast', 'astronomy', 'timezone', 'marine')
+
+@app.route('/api/weather/bundle', methods=['POST'])
+@require_location
+def get_weather_bundle(cleaned_data, query):
+	"""
+	Get several weather components for one location in a single request
+	Request body: { location | lat+lon, include?: [forecast, astronomy, timezone, marine],
+	                days?: number, date?: YYYY-MM-DD, language?: string }
+	
+	The WeatherAPI calls run concurrently, so upstream wall time is that of the
+	slowest component. A failing component is reported under 'errors' without
+	failing the others.
+	"""
+	include = _request_option('include') or BUNDLE_COMPONENTS
+	if not isinstance(include, (list, tuple)):
+		include = [include]
+	
+	unknown = [name for name in include if name not in BUNDLE_COMPONENTS]
+	if unknown:
 		error_response = ResponseFormatter.format_error(
-			'Yêu cầu API bị timeout',
-			'API_TIMEOUT',
-			504
+			f'Thành phần không hợp lệ: {", ".join(map(str, unknown))}',
+			'VALIDATION_ERROR'
 		)
-		return jsonify(error_response), 504
-
-	except Exception as e:
-		print(f"[ERROR] Error in future weather: {str(e)}")
+		return jsonify(error_response), 400
+	include = list(dict.fromkeys(include))
+	
+	days = cleaned_data.get('days', 7)
+	date = _request_option('date', '')
+	language = _request_option('language', 'vi')
+	fetchers = {
+		'forecast': lambda: _fetch_forecast(query, days),
+		'astronomy': lambda: _fetch_astronomy(query, date),
+		'timezone': lambda: _fetch_timezone(query),
+		'marine': lambda: _fetch_marine(query, min(days, 7), language),
+	}
+	
+	bundle = {}
+	errors = {}
+	futures = {name: _fanout_pool.submit(fetchers[name]) for name in include}
+	for name, future in futures.items():
+		try:
+			bundle[name] = future.result()
+		except requests.exceptions.HTTPError as e:
+			status_code = e.response.status_code if e.response is not None else 502
+			logger.error('WeatherAPI %s HTTP error in bundle: %s', name, e)
+			errors[name] = {'status': status_code, 'message': 'Lỗi WeatherAPI'}
+		except requests.exceptions.Timeout:
+			logger.error('WeatherAPI %s timeout in bundle', name)
+			errors[name] = {'status': 504, 'message': 'Yêu cầu API bị timeout'}
+		except UpstreamResponseTooLarge as e:
+			logger.error('%s', e)
+			errors[name] = {'status': 502, 'message': 'Phản hồi từ WeatherAPI quá lớn'}
+		except Exception as e:
+			logger.error('Error fetching %s in bundle: %s', name, e)
+			errors[name] = {'status': 500, 'message': 'Lỗi không mong muốn'}
+	
+	if not bundle:
 		error_response = ResponseFormatter.format_error(
-			f'Lỗi không mong muốn: {str(e)}',
-			'INTERNAL_ERROR',
-			500
+			'Không thể lấy dữ liệu thời tiết',
+			'BUNDLE_FAILED',
+			502
 		)
-		return jsonify(error_response), 500
+		error_response['error']['components'] = errors
+		return jsonify(error_response), 502
+	
+	if errors:
+		bundle['errors'] = errors
+	
+	success_response = ResponseFormatter.format_success(
+		bundle,
+		'Lấy dữ liệu thời tiết tổng hợp thành công'
+	)
+	return jsonify(success_response), 200
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -1628,15 +1732,24 @@ def health_check():
 	return jsonify({
 		'status': 'ok', 
 		'message': 'Weather API is running',
-		'weatherapi_configured': WEATHER_API_KEY != 'YOUR_WEATHERAPI_KEY'
+		'weatherapi_configured': cfg.weather_api_key != 'YOUR_WEATHERAPI_KEY'
 	}), 200
 
 if __name__ == '__main__':
+	# Flask's built-in server is for development only; in production run
+	# gunicorn (threaded workers, see gunicorn.conf.py) behind nginx
+	if not cfg.flask_debug:
+		raise SystemExit(
+			'FLASK_DEBUG is off - start the production server with:\n'
+			'    gunicorn -c gunicorn.conf.py app:app\n'
+			'(set FLASK_DEBUG=True to use the development server)'
+		)
+	
 	# Use environment variables for server configuration
 	print(f"\n{'='*60}")
 	print(f"Starting Flask server...")
-	print(f"Host: {FLASK_HOST}:{FLASK_PORT}")
-	print(f"Debug Mode: {FLASK_DEBUG}")
+	print(f"Host: {cfg.flask_host}:{cfg.flask_port}")
+	print(f"Debug Mode: {cfg.flask_debug}")
 	print(f"{'='*60}\n")
 	
-	app.run(host=FLASK_HOST, port=FLASK_PORT, debug=FLASK_DEBUG)
+	app.run(host=cfg.flask_host, port=cfg.flask_port, debug=cfg.flask_debug)
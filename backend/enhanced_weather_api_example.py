@@ -4,26 +4,37 @@ Demonstrates how to integrate all enhancement modules for richer weather data
 """
 
 import os
-import requests
-from flask import Flask, request, jsonify
+from itertools import chain
+from flask import Flask, jsonify
 from flask_cors import CORS
-from dotenv import load_dotenv
 
 # Import validation and translation modules
 from validate_information import (
-    InputValidator,
-    ValidationError,
     WeatherTranslator,
-    ResponseFormatter,
-    VietnameseCityNormalizer
+    ResponseFormatter
 )
 
 # Import enhancement modules
 from weather_enhancements.activity_recommender import ActivityRecommender
 from weather_enhancements.astronomy_calculator import AstronomyCalculator
 
-# Load environment variables
-load_dotenv()
+# Fast JSON serialization (orjson when installed)
+from json_provider import OrjsonProvider
+
+# Session, logging, request validation, error mapping and the hourly format
+# are shared with the main app rather than copied here
+from app import (
+    cfg,
+    format_enhanced_hour,
+    get_session,
+    handle_weatherapi_errors,
+    load_json,
+    require_location
+)
+
+# (message, code) pairs for handle_weatherapi_errors
+_WEATHER_DATA_ERROR = ('Không thể lấy dữ liệu thời tiết', 'API_ERROR')
+_REQUEST_TIMEOUT = ('Request timeout. Vui lòng thử lại', 'REQUEST_TIMEOUT')
 
 def enhance_current_weather_data(weather_data):
     """
@@ -37,7 +48,10 @@ def enhance_current_weather_data(weather_data):
     """
     current = weather_data.get('current', {})
     location = weather_data.get('location', {})
-    astro = weather_data.get('forecast', {}).get('forecastday', [{}])[0].get('astro', {})
+    try:
+        astro = weather_data['forecast']['forecastday'][0]['astro']
+    except (KeyError, IndexError, TypeError):
+        astro = {}
     
     # Get basic weather values
     temp_c = current.get('temp_c', 20)
@@ -117,32 +131,14 @@ def enhance_forecast_data(forecast_data):
     formatted_forecast = ResponseFormatter.format_forecast(forecast_data)
     
     # Add hourly data if available
-    forecast_days = forecast_data.get('forecast', {}).get('forecastday', [])
+    try:
+        forecast_days = forecast_data['forecast']['forecastday']
+    except KeyError:
+        forecast_days = []
     
-    enhanced_hourly = []
-    for day in forecast_days[:2]:  # Only process first 2 days for hourly data
-        hours = day.get('hour', [])
-        for hour in hours:
-            enhanced_hourly.append({
-                'time': hour.get('time', ''),
-                'time_epoch': hour.get('time_epoch', 0),
-                'temp_c': hour.get('temp_c', 0),
-                'feelslike_c': hour.get('feelslike_c', 0),
-                'condition': {
-                    'text': hour.get('condition', {}).get('text', ''),
-                    'icon': hour.get('condition', {}).get('icon', ''),
-                    'code': hour.get('condition', {}).get('code', 0)
-                },
-                'wind_kph': hour.get('wind_kph', 0),
-                'wind_dir': hour.get('wind_dir', ''),
-                'pressure_mb': hour.get('pressure_mb', 0),
-                'humidity': hour.get('humidity', 0),
-                'cloud': hour.get('cloud', 0),
-                'chance_of_rain': hour.get('chance_of_rain', 0),
-                'chance_of_snow': hour.get('chance_of_snow', 0),
-                'uv': hour.get('uv', 0),
-                'vis_km': hour.get('vis_km', 0)
-            })
+    # Only process first 2 days for hourly data
+    hours = chain.from_iterable(day.get('hour', []) for day in forecast_days[:2])
+    enhanced_hourly = [format_enhanced_hour(hour) for hour in hours]
     
     # Build enhanced forecast structure
     enhanced_forecast = {
@@ -168,158 +164,107 @@ def create_enhanced_weather_routes(app):
     """
     
     @app.route('/api/weather/enhanced-current', methods=['POST'])
-    def get_enhanced_current_weather():
+    @handle_weatherapi_errors(
+        'enhanced current weather',
+        errors={},
+        fallback=_WEATHER_DATA_ERROR,
+        timeout=_REQUEST_TIMEOUT
+    )
+    @require_location
+    def get_enhanced_current_weather(cleaned_data, query):
         """
         Get enhanced current weather with recommendations and insights
         """
-        print(f"[DEBUG] Received request to /api/weather/enhanced-current")
-        
-        if not request.is_json:
-            error_response = ResponseFormatter.format_error(
-                'Content-Type phải là application/json',
-                'INVALID_CONTENT_TYPE'
-            )
-            return jsonify(error_response), 400
-        
-        data = request.get_json()
-        print(f"[DEBUG] Request data: {data}")
-        
-        # Sanitize and validate input
-        data = InputValidator.sanitize_input(data)
-        is_valid, error_msg, cleaned_data = InputValidator.validate_location_request(data)
-        if not is_valid:
-            error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
-            return jsonify(error_response), 400
-        
-        # Build query
-        if 'location' in cleaned_data:
-            query = cleaned_data['location']
-        else:
-            query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
-        
         # Get weather data with forecast for astronomy info
         params = {
-            'key': os.getenv('WEATHERAPI_KEY', 'YOUR_WEATHERAPI_KEY'),
+            'key': cfg.weather_api_key,
             'q': query,
             'days': 1,  # Need forecast for astronomy data
             'aqi': 'yes',
             'alerts': 'yes'
         }
         
-        try:
-            resp = requests.get(f"{os.getenv('WEATHERAPI_BASE_URL', 'http://api.weatherapi.com/v1')}/forecast.json", 
-                              params=params, timeout=10)
-            resp.raise_for_status()
-            
-            weather_data = resp.json()
-            
-            # Translate to Vietnamese
-            weather_data = WeatherTranslator.translate_current_weather(weather_data)
-            weather_data = WeatherTranslator.translate_forecast(weather_data)
-            
-            # Enhance the data
-            enhanced_data = enhance_current_weather_data(weather_data)
-            
-            success_response = ResponseFormatter.format_success(
-                enhanced_data,
-                'Lấy dữ liệu thời tiết nâng cao thành công'
-            )
-            
-            return jsonify(success_response), 200
-            
-        except requests.exceptions.HTTPError as e:
-            print(f"[ERROR] WeatherAPI HTTP error: {e}")
-            error_response = ResponseFormatter.format_error(
-                'Không thể lấy dữ liệu thời tiết',
-                'API_ERROR',
-                500
-            )
-            return jsonify(error_response), 500
-            
-        except Exception as e:
-            print(f"[ERROR] Unexpected error: {str(e)}")
-            error_response = ResponseFormatter.format_error(
-                f'Lỗi không mong muốn: {str(e)}',
-                'INTERNAL_ERROR',
-                500
-            )
-            return jsonify(error_response), 500
-    
-    @app.route('/api/weather/enhanced-forecast', methods=['POST'])
-    def get_enhanced_forecast():
-        """
-        Get enhanced forecast with hourly data and recommendations
-        """
-        print(f"[DEBUG] Received request to /api/weather/enhanced-forecast")
+        resp = get_session().get(cfg.forecast_url, params=params, timeout=cfg.request_timeout, stream=True)
+        resp.raise_for_status()
         
-        if not request.is_json:
-            error_response = ResponseFormatter.format_error(
-                'Content-Type phải là application/json',
-                'INVALID_CONTENT_TYPE'
-            )
-            return jsonify(error_response), 400
+        weather_data = load_json(resp)
         
-        data = request.get_json()
-        data = InputValidator.sanitize_input(data)
-        is_valid, error_msg, cleaned_data = InputValidator.validate_location_request(data)
+        # Translate to Vietnamese
+        weather_data = WeatherTranslator.translate_all(weather_data, sections=('current', 'forecast'))
         
-        if not is_valid:
-            error_response = ResponseFormatter.format_error(error_msg, 'VALIDATION_ERROR')
-            return jsonify(error_response), 400
+        # Enhance the data
+        enhanced_data = enhance_current_weather_data(weather_data)
         
-        # Build query
-        if 'location' in cleaned_data:
-            query = cleaned_data['location']
-        else:
-            query = f"{cleaned_data['lat']},{cleaned_data['lon']}"
+        success_response = ResponseFormatter.format_success(
+            enhanced_data,
+            'Lấy dữ liệu thời tiết nâng cao thành công'
+        )
         
+        return jsonify(success_response), 200
+    
+    @app.route('/api/weather/enhanced-forecast', methods=['POST'])
+    @handle_weatherapi_errors(
+        'enhanced forecast',
+        errors={},
+        fallback=_WEATHER_DATA_ERROR,
+        timeout=_REQUEST_TIMEOUT
+    )
+    @require_location
+    def get_enhanced_forecast(cleaned_data, query):
+        """
+        Get enhanced forecast with hourly data and recommendations
+        """
         days = cleaned_data.get('days', 7)
         
         params = {
-            'key': os.getenv('WEATHERAPI_KEY', 'YOUR_WEATHERAPI_KEY'),
+            'key': cfg.weather_api_key,
             'q': query,
             'days': days,
             'aqi': 'yes',
             'alerts': 'yes'
         }
         
-        try:
-            resp = requests.get(f"{os.getenv('WEATHERAPI_BASE_URL', 'http://api.weatherapi.com/v1')}/forecast.json", 
-                              params=params, timeout=10)
-            resp.raise_for_status()
-            
-            weather_data = resp.json()
-            
-            # Translate to Vietnamese
-            weather_data = WeatherTranslator.translate_forecast(weather_data)
-            weather_data = WeatherTranslator.translate_alerts(weather_data)
-            
-            # Enhance the data
-            enhanced_data = enhance_forecast_data(weather_data)
-            
-            success_response = ResponseFormatter.format_success(
-                enhanced_data,
-                f'Lấy dự báo nâng cao {days} ngày thành công'
-            )
-            
-            return jsonify(success_response), 200
-            
-        except Exception as e:
-            print(f"[ERROR] Error in enhanced forecast: {str(e)}")
-            error_response = ResponseFormatter.format_error(
-                f'Lỗi không mong muốn: {str(e)}',
-                'INTERNAL_ERROR',
-                500
-            )
-            return jsonify(error_response), 500
+        resp = get_session().get(cfg.forecast_url, params=params, timeout=cfg.request_timeout, stream=True)
+        resp.raise_for_status()
+        
+        weather_data = load_json(resp)
+        
+        # Translate to Vietnamese
+        weather_data = WeatherTranslator.translate_all(weather_data, sections=('forecast', 'alerts'))
+        
+        # Enhance the data
+        enhanced_data = enhance_forecast_data(weather_data)
+        
+        success_response = ResponseFormatter.format_success(
+            enhanced_data,
+            f'Lấy dự báo nâng cao {days} ngày thành công'
+        )
+        
+        return jsonify(success_response), 200
 
 
 # Usage example:
-if __name__ == '__main__':
+def create_app():
+    """
+    Build a standalone app serving the enhanced routes
+    
+    Production: gunicorn -c gunicorn.conf.py 'enhanced_weather_api_example:create_app()'
+    """
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)  # jsonify() encodes with orjson
     CORS(app)
     
     # Add enhanced routes
     create_enhanced_weather_routes(app)
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    return app
+
+
+if __name__ == '__main__':
+    # The Flask server handles development only; use gunicorn otherwise
+    if os.getenv('FLASK_DEBUG', 'True').lower() != 'true':
+        raise SystemExit(
+            "use: gunicorn -c gunicorn.conf.py 'enhanced_weather_api_example:create_app()'"
+        )
+    
+    create_app().run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
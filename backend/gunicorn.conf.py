@@ -0,0 +1,64 @@
+"""
+Gunicorn configuration for the unified weather backend
+
+Usage (from the backend directory):
+    gunicorn -c gunicorn.conf.py app:app
+    gunicorn -c gunicorn.conf.py 'enhanced_weather_api_example:create_app()'
+    gunicorn -c gunicorn.conf.py search_app:app
+
+For many slow concurrent WeatherAPI calls per worker, gevent can replace
+the threaded workers (pip install gevent):
+    GUNICORN_WORKER_CLASS=gevent gunicorn -c gunicorn.conf.py search_app:app
+
+Put nginx in front of it (see deploy/nginx.conf.example); by default
+gunicorn listens on a Unix domain socket that nginx proxies to.
+All values can be overridden through environment variables / .env.
+"""
+
+import multiprocessing
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Unix socket avoids TCP/TIME_WAIT overhead between nginx and gunicorn.
+# Set GUNICORN_BIND=0.0.0.0:5000 to listen on TCP instead.
+bind = os.getenv('GUNICORN_BIND', 'unix:/tmp/weather.sock')
+
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+
+# Handlers spend most of their time waiting on WeatherAPI, so each worker
+# runs a pool of threads to keep several upstream calls in flight
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+# Concurrent clients per worker for async worker classes (gevent/eventlet);
+# ignored by gthread
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+
+# Keep connections from nginx open between requests
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 30))
+
+# WeatherAPI calls time out after 10s; leave headroom for retries
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+graceful_timeout = 30
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', None)
+errorlog = '-'
+loglevel = os.getenv('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    """
+    Make sure a worker never reuses HTTP sessions or background threads
+    created before the fork (threads do not survive it)
+    """
+    import sys
+    app_module = sys.modules.get('app')
+    if app_module is not None:  # Only present when the app was preloaded
+        app_module.reset_sessions()
+        app_module.reset_logging()
+    search_module = sys.modules.get('search_common')
+    if search_module is not None:
+        search_module.reset_session()
@@ -0,0 +1,96 @@
+"""
+JSON Provider Module
+Serializes Flask responses with orjson (falls back to the stdlib json module)
+and reads WeatherAPI response bodies with a size cap
+"""
+
+import json
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # orjson is optional - keep Flask's default behaviour
+    orjson = None
+
+
+def loads(data: Any) -> Any:
+    """Parse a JSON document (str or bytes) with orjson when available"""
+    if orjson is None:
+        return json.loads(data)
+    return orjson.loads(data)
+
+
+class UpstreamResponseTooLarge(Exception):
+    """Raised when a WeatherAPI response body exceeds the allowed size"""
+
+
+def read_body(resp: Any, max_bytes: int) -> bytearray:
+    """
+    Read the body of a streamed (stream=True) requests response
+
+    Raises:
+        UpstreamResponseTooLarge: if the (decompressed) body exceeds max_bytes
+    """
+    # A compressed length over the cap can only decompress to something bigger
+    content_length = resp.headers.get('Content-Length')
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise UpstreamResponseTooLarge(f'WeatherAPI response too large: {content_length} bytes')
+
+    body = bytearray()
+    for chunk in resp.iter_content(chunk_size=64 * 1024):
+        body += chunk
+        if len(body) > max_bytes:
+            raise UpstreamResponseTooLarge(f'WeatherAPI response exceeds {max_bytes} bytes')
+    return body
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes with orjson when available"""
+    if orjson is None:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return orjson.dumps(obj)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify() encodes straight to bytes"""
+
+    # Key order already follows the formatters' dict literals; sorting every
+    # response (Flask's default) is wasted work. Set to True to sort again.
+    sort_keys = False
+
+    # Vietnamese text goes out as UTF-8 instead of \uXXXX escapes; orjson
+    # never escapes, this keeps the stdlib fallback consistent with it
+    ensure_ascii = False
+
+    def _options(self) -> int:
+        """orjson option flags matching this provider's settings"""
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return option
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self._options()
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option),
+            mimetype=self.mimetype
+        )
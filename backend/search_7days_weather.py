@@ -3,216 +3,82 @@
 # 1. Tìm kiếm theo tọa độ GPS (lat, lon) từ browser
 # 2. Tìm kiếm theo tên địa điểm (thành phố, quốc gia, v.v.)
 
-import os
 import requests
-from flask import Flask, request, jsonify
+from flask import request, jsonify
 
-app = Flask(__name__)
+# Session, cache và API key dùng chung với search_weather.py
+from search_common import (
+	WEATHER_API_KEY, WEATHER_API_BASE_URL, UpstreamResponseTooLarge, error_response, get_weather, mask_api_key
+)
 
-# Định nghĩa API keys
-WEATHER_API_KEY = os.getenv('WEATHERAPI_KEY', 'YOUR_WEATHERAPI_KEY')
-WEATHER_API_FORECAST_URL = 'http://api.weatherapi.com/v1/forecast.json'
+WEATHER_API_FORECAST_URL = f'{WEATHER_API_BASE_URL}/forecast.json'
 
-def validate_coordinates(lat, lon):
-	"""Validate vĩ độ and kinh độ values"""
-	try:
-		lat_float = float(lat)
-		lon_float = float(lon)
-		
-		if not (-90 <= lat_float <= 90):
-			return False, "Latitude phải nằm trong khoảng -90 đến 90"
-		if not (-180 <= lon_float <= 180):
-			return False, "Longitude phải nằm trong khoảng -180 đến 180"
-		
-		return True, None
-	except (ValueError, TypeError):
-		return False, "Latitude và longitude phải là số"
+# Tham số cố định dựng sẵn một lần; mỗi request chỉ nối thêm q và days
+BASE_PARAMS = (('key', WEATHER_API_KEY), ('aqi', 'no'), ('alerts', 'yes'))
 
-def validate_location(location):
-	"""Validate location string"""
-	if not location or not isinstance(location, str):
-		return False, "Tên địa điểm không hợp lệ"
-	
-	if len(location.strip()) < 2:
-		return False, "Tên địa điểm phải có ít nhất 2 ký tự"
-	
-	if len(location) > 100:
-		return False, "Tên địa điểm quá dài (tối đa 100 ký tự)"
-	
-	return True, None
-
-def validate_days(days):
-	"""Validate number of forecast days"""
-	if days is None:
-		return 7, None  # Default to 7 days
-	
-	try:
-		days_int = int(days)
-		if not (1 <= days_int <= 10):
-			return None, "Số ngày dự báo phải từ 1 đến 10"
-		return days_int, None
-	except (ValueError, TypeError):
-		return None, "Số ngày dự báo phải là số nguyên"
+CACHE_TTL = 900  # dự báo chỉ thay đổi theo giờ
 
-@app.route('/api/forecast_weather', methods=['POST'])
-def get_forecast_weather():
+def validate_request(data):
 	"""
-	Lấy thông tin dự báo thời tiết 7 ngày dựa trên:
-	1. GPS browser người dùng (lat, lon)
-	2. Tên địa điểm (thành phố, quốc gia, v.v.)
+	Validate request body trong một lượt (days, rồi location hoặc lat/lon)
 	
-	Request body:
-	- location: tên địa điểm (string)
-	- lat: vĩ độ (number)
-	- lon: kinh độ (number)
-	- days: số ngày dự báo (1-10, mặc định 7)
+	Returns:
+		(query, days, error): query gửi WeatherAPI và số ngày dự báo,
+		hoặc error (query/days là None) nếu dữ liệu không hợp lệ
 	"""
-	# Validate request has JSON data
-	if not request.is_json:
-		return jsonify({'error': 'Content-Type phải là application/json'}), 400
-	
-	data = request.get_json()
-	
-	# Validate input data
-	if not data:
-		return jsonify({'error': 'Dữ liệu request không hợp lệ'}), 400
-	
-	# Get and validate days parameter
-	days, error = validate_days(data.get('days'))
-	if error:
-		return jsonify({'error': error}), 400
-	
-	# Định nghĩa địa điểm
+	days = data.get('days')
+	if days is None:
+		days = 7  # Default to 7 days
+	elif type(days) is int and 1 <= days <= 10:
+		pass  # Trường hợp phổ biến: client gửi số nguyên hợp lệ, không cần ép kiểu
+	else:
+		try:
+			days = int(days)
+		except (ValueError, TypeError):
+			return None, None, "Số ngày dự báo phải là số nguyên"
+		if not 1 <= days <= 10:
+			return None, None, "Số ngày dự báo phải từ 1 đến 10"
+	
+	# Tìm theo tên địa điểm
 	location = data.get('location')
-	
-	# Định nghĩa tọa độ GPS
-	lat = data.get('lat')
-	lon = data.get('lon')
-	
-	# Determine query parameter and validate
-	query = None
-	
 	if location:
-		# Validate location name
-		is_valid, error = validate_location(location)
-		if not is_valid:
-			return jsonify({'error': error}), 400
+		if not isinstance(location, str):
+			return None, None, "Tên địa điểm không hợp lệ"
 		query = location.strip()
-		
-	elif lat is not None and lon is not None:
-		# Validate GPS coordinates
-		is_valid, error = validate_coordinates(lat, lon)
-		if not is_valid:
-			return jsonify({'error': error}), 400
-		query = f"{lat},{lon}"
-		
-	else:
-		return jsonify({
-			'error': 'Kiểm tra lại dữ liệu gửi lên. Cần cung cấp location hoặc (lat và lon).'
-		}), 400
-	
-	# Prepare API request
-	params = {
-		'key': WEATHER_API_KEY,
-		'q': query,
-		'days': days,
-		'aqi': 'no',
-		'alerts': 'yes'
-	}
+		if len(query) < 2:
+			return None, None, "Tên địa điểm phải có ít nhất 2 ký tự"
+		if len(location) > 100:
+			return None, None, "Tên địa điểm quá dài (tối đa 100 ký tự)"
+		return query, days, None
 	
-	try:
-		resp = requests.get(WEATHER_API_FORECAST_URL, params=params, timeout=10)
-		resp.raise_for_status()
-		
-		weather_data = resp.json()
-		
-		# Return formatted response
-		return jsonify({
-			'success': True,
-			'location': weather_data.get('location'),
-			'current': weather_data.get('current'),
-			'forecast': weather_data.get('forecast'),
-			'alerts': weather_data.get('alerts')
-		}), 200
-		
-	except requests.exceptions.HTTPError as e:
-		if resp.status_code == 400:
-			return jsonify({'error': 'Địa điểm hoặc tọa độ không hợp lệ'}), 400
-		elif resp.status_code == 401:
-			return jsonify({'error': 'API key không hợp lệ'}), 500
-		elif resp.status_code == 403:
-			return jsonify({'error': 'API key đã vượt quá giới hạn'}), 500
-		return jsonify({'error': f'Lỗi API: {str(e)}'}), 500
-		
-	except requests.exceptions.Timeout:
-		return jsonify({'error': 'Request timeout. Vui lòng thử lại'}), 504
-		
-	except requests.exceptions.RequestException as e:
-		return jsonify({'error': f'Lỗi kết nối: {str(e)}'}), 503
-		
-	except Exception as e:
-		return jsonify({'error': f'Lỗi server: {str(e)}'}), 500
-
-if __name__ == '__main__':
-	app.run(host='0.0.0.0', port=5001, debug=True)
-
-# Chức năng: Dự báo thời tiết 7 ngày
-# Hỗ trợ 2 cách tìm kiếm:
-# 1. Tìm kiếm theo tọa độ GPS (lat, lon) từ browser
-# 2. Tìm kiếm theo tên địa điểm (thành phố, quốc gia, v.v.)
-
-import os
-import requests
-from flask import Flask, request, jsonify
-
-app = Flask(__name__)
-
-# Định nghĩa API keys
-WEATHER_API_KEY = os.getenv('WEATHERAPI_KEY', 'YOUR_WEATHERAPI_KEY')
-WEATHER_API_FORECAST_URL = 'http://api.weatherapi.com/v1/forecast.json'
-
-def validate_coordinates(lat, lon):
-	"""Validate vĩ độ and kinh độ values"""
+	# Tìm theo tọa độ GPS
+	lat = data.get('lat')
+	lon = data.get('lon')
+	if lat is None or lon is None:
+		return None, None, 'Kiểm tra lại dữ liệu gửi lên. Cần cung cấp location hoặc (lat và lon).'
 	try:
 		lat_float = float(lat)
 		lon_float = float(lon)
-		
-		if not (-90 <= lat_float <= 90):
-			return False, "Latitude phải nằm trong khoảng -90 đến 90"
-		if not (-180 <= lon_float <= 180):
-			return False, "Longitude phải nằm trong khoảng -180 đến 180"
-		
-		return True, None
 	except (ValueError, TypeError):
-		return False, "Latitude và longitude phải là số"
+		return None, None, "Latitude và longitude phải là số"
+	if not -90 <= lat_float <= 90:
+		return None, None, "Latitude phải nằm trong khoảng -90 đến 90"
+	if not -180 <= lon_float <= 180:
+		return None, None, "Longitude phải nằm trong khoảng -180 đến 180"
+	return f"{lat},{lon}", days, None
+
+def forecast_response(weather_data, cache_status):
+	"""Định dạng response dự báo (X-Cache cho biết có lấy từ cache hay không)"""
+	response = jsonify({
+		'success': True,
+		'location': weather_data.get('location'),
+		'current': weather_data.get('current'),
+		'forecast': weather_data.get('forecast'),
+		'alerts': weather_data.get('alerts')
+	})
+	response.headers['X-Cache'] = cache_status
+	return response, 200
 
-def validate_location(location):
-	"""Validate location string"""
-	if not location or not isinstance(location, str):
-		return False, "Tên địa điểm không hợp lệ"
-	
-	if len(location.strip()) < 2:
-		return False, "Tên địa điểm phải có ít nhất 2 ký tự"
-	
-	if len(location) > 100:
-		return False, "Tên địa điểm quá dài (tối đa 100 ký tự)"
-	
-	return True, None
-
-def validate_days(days):
-	"""Validate number of forecast days"""
-	if days is None:
-		return 7, None  # Default to 7 days
-	
-	try:
-		days_int = int(days)
-		if not (1 <= days_int <= 10):
-			return None, "Số ngày dự báo phải từ 1 đến 10"
-		return days_int, None
-	except (ValueError, TypeError):
-		return None, "Số ngày dự báo phải là số nguyên"
-
-@app.route('/api/forecast_weather', methods=['POST'])
 def get_forecast_weather():
 	"""
 	Lấy thông tin dự báo thời tiết 7 ngày dựa trên:
@@ -227,89 +93,56 @@ def get_forecast_weather():
 	"""
 	# Validate request has JSON data
 	if not request.is_json:
-		return jsonify({'error': 'Content-Type phải là application/json'}), 400
+		return error_response('Content-Type phải là application/json', 400)
 	
 	data = request.get_json()
 	
 	# Validate input data
 	if not data:
-		return jsonify({'error': 'Dữ liệu request không hợp lệ'}), 400
+		return error_response('Dữ liệu request không hợp lệ', 400)
 	
-	# Get and validate days parameter
-	days, error = validate_days(data.get('days'))
+	# Validate days và location / tọa độ GPS
+	query, days, error = validate_request(data)
 	if error:
-		return jsonify({'error': error}), 400
-	
-	# Định nghĩa địa điểm
-	location = data.get('location')
-	
-	# Định nghĩa tọa độ GPS
-	lat = data.get('lat')
-	lon = data.get('lon')
-	
-	# Determine query parameter and validate
-	query = None
-	
-	if location:
-		# Validate location name
-		is_valid, error = validate_location(location)
-		if not is_valid:
-			return jsonify({'error': error}), 400
-		query = location.strip()
-		
-	elif lat is not None and lon is not None:
-		# Validate GPS coordinates
-		is_valid, error = validate_coordinates(lat, lon)
-		if not is_valid:
-			return jsonify({'error': error}), 400
-		query = f"{lat},{lon}"
-		
-	else:
-		return jsonify({
-			'error': 'Kiểm tra lại dữ liệu gửi lên. Cần cung cấp location hoặc (lat và lon).'
-		}), 400
+		return error_response(error, 400)  # Thông báo của validate_request đều cố định
 	
 	# Prepare API request
-	params = {
-		'key': WEATHER_API_KEY,
-		'q': query,
-		'days': days,
-		'aqi': 'no',
-		'alerts': 'yes'
-	}
+	params = (*BASE_PARAMS, ('q', query), ('days', days))
 	
 	try:
-		resp = requests.get(WEATHER_API_FORECAST_URL, params=params, timeout=10)
-		resp.raise_for_status()
+		# Trả kết quả từ cache nếu truy vấn này vừa được gọi
+		weather_data, cache_status = get_weather(
+			('forecast', query, days), WEATHER_API_FORECAST_URL, params, 10, CACHE_TTL
+		)
 		
-		weather_data = resp.json()
-		
-		# Return formatted response
-		return jsonify({
-			'success': True,
-			'location': weather_data.get('location'),
-			'current': weather_data.get('current'),
-			'forecast': weather_data.get('forecast'),
-			'alerts': weather_data.get('alerts')
-		}), 200
+		return forecast_response(weather_data, cache_status)
 		
 	except requests.exceptions.HTTPError as e:
-		if resp.status_code == 400:
-			return jsonify({'error': 'Địa điểm hoặc tọa độ không hợp lệ'}), 400
-		elif resp.status_code == 401:
-			return jsonify({'error': 'API key không hợp lệ'}), 500
-		elif resp.status_code == 403:
-			return jsonify({'error': 'API key đã vượt quá giới hạn'}), 500
-		return jsonify({'error': f'Lỗi API: {str(e)}'}), 500
+		if e.response.status_code == 400:
+			return error_response('Địa điểm hoặc tọa độ không hợp lệ', 400)
+		elif e.response.status_code == 401:
+			return error_response('API key không hợp lệ', 500)
+		elif e.response.status_code == 403:
+			return error_response('API key đã vượt quá giới hạn', 500)
+		return jsonify({'error': f'Lỗi API: {mask_api_key(str(e))}'}), 500
 		
 	except requests.exceptions.Timeout:
-		return jsonify({'error': 'Request timeout. Vui lòng thử lại'}), 504
+		return error_response('Request timeout. Vui lòng thử lại', 504)
 		
 	except requests.exceptions.RequestException as e:
-		return jsonify({'error': f'Lỗi kết nối: {str(e)}'}), 503
+		return jsonify({'error': f'Lỗi kết nối: {mask_api_key(str(e))}'}), 503
+		
+	except UpstreamResponseTooLarge:
+		return error_response('Phản hồi từ WeatherAPI quá lớn', 502)
 		
 	except Exception as e:
-		return jsonify({'error': f'Lỗi server: {str(e)}'}), 500
+		return jsonify({'error': f'Lỗi server: {mask_api_key(str(e))}'}), 500
+
+def register(app):
+	"""Gắn POST /api/forecast_weather vào app (xem search_app.py)"""
+	app.add_url_rule('/api/forecast_weather', view_func=get_forecast_weather, methods=['POST'])
 
 if __name__ == '__main__':
-	app.run(host='0.0.0.0', port=5001, debug=True)
+	# Chạy chung với API thời tiết hiện tại trong một process
+	from search_app import main
+	main()
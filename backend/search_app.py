@@ -0,0 +1,43 @@
+# Entrypoint chung cho các API tìm kiếm thời tiết:
+# - POST /api/current_weather  (search_weather.py)
+# - POST /api/forecast_weather (search_7days_weather.py)
+# Một process duy nhất thay vì 2 app Flask ở cổng 5000 và 5001:
+# dùng chung Session, cache và bộ nhớ của Python/Flask (xem search_common.py)
+#
+# Production: chạy bằng gunicorn (xem gunicorn.conf.py), không dùng server dev của Flask
+#     gunicorn -c gunicorn.conf.py search_app:app
+# Server dev chỉ xử lý lần lượt từng request nên mỗi lần chờ WeatherAPI (tới 10s)
+# là chặn cả process; gunicorn chạy nhiều worker x nhiều thread
+
+import os
+from flask import Flask
+
+# JSON nhanh (orjson nếu đã cài, không thì dùng json chuẩn)
+from json_provider import OrjsonProvider
+
+import search_weather
+import search_7days_weather
+
+def create_app():
+	"""Tạo app Flask và gắn route của cả hai API tìm kiếm"""
+	app = Flask(__name__)
+	# jsonify() encode bằng orjson; tiếng Việt giữ dạng UTF-8 thay vì escape \uXXXX
+	app.json = OrjsonProvider(app)
+	search_weather.register(app)
+	search_7days_weather.register(app)
+	return app
+
+app = create_app()
+
+def main():
+	"""Chạy server dev của Flask (chỉ khi FLASK_DEBUG bật)"""
+	if os.getenv('FLASK_DEBUG', 'True').lower() != 'true':
+		raise SystemExit(
+			'FLASK_DEBUG đang tắt - chạy server production bằng:\n'
+			'    gunicorn -c gunicorn.conf.py search_app:app\n'
+			'(đặt FLASK_DEBUG=True để dùng server dev)'
+		)
+	app.run(host='0.0.0.0', port=5001, debug=True)
+
+if __name__ == '__main__':
+	main()
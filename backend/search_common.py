@@ -0,0 +1,207 @@
+# Phần dùng chung của các API tìm kiếm (search_weather.py, search_7days_weather.py):
+# API key, Session tới WeatherAPI và cache kết quả trong bộ nhớ.
+# Cả hai API chạy chung một process (search_app.py) nên dùng chung
+# pool kết nối keep-alive và cache thay vì mỗi app một bản.
+
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Response
+
+# JSON nhanh (orjson nếu đã cài, không thì dùng json chuẩn)
+from json_provider import UpstreamResponseTooLarge, dumps as json_dumps, loads as json_loads, read_body
+
+# Định nghĩa API keys
+WEATHER_API_KEY = os.getenv('WEATHERAPI_KEY', 'YOUR_WEATHERAPI_KEY')
+WEATHER_API_BASE_URL = 'https://api.weatherapi.com/v1'
+
+# Body lớn nhất (sau giải nén) chấp nhận từ WeatherAPI, cùng giới hạn với app.py
+MAX_UPSTREAM_BYTES = int(os.getenv('WEATHERAPI_MAX_BODY_BYTES', 8 * 1024 * 1024))
+
+# Dùng chung 1 Session cho mọi request: giữ kết nối TCP/TLS tới WeatherAPI
+# (keep-alive) thay vì bắt tay lại mỗi lần gọi.
+# Chỉ thử lại GET khi WeatherAPI quá tải/gateway lỗi, có backoff để không dồn request
+def _build_session():
+	"""Tạo Session với pool kết nối và retry cho WeatherAPI"""
+	session = requests.Session()
+	adapter = HTTPAdapter(
+		pool_connections=50,
+		pool_maxsize=50,
+		max_retries=Retry(
+			total=3,
+			backoff_factor=0.3,
+			status_forcelist=[502, 503, 504],
+			allowed_methods=frozenset(['GET']),
+			raise_on_status=False  # Trả response cuối về để raise_for_status() xử lý như cũ
+		)
+	)
+	session.mount('http://', adapter)
+	session.mount('https://', adapter)
+	# Ghi rõ nén gzip (requests tự giải nén) và keep-alive để proxy trung gian không bỏ qua
+	session.headers.update({
+		'Accept-Encoding': 'gzip, deflate',
+		'Connection': 'keep-alive',
+		'User-Agent': 'weather-forecast/1.0'
+	})
+	return session
+
+session = _build_session()
+
+# Cache kết quả WeatherAPI trong bộ nhớ: khóa -> (thời điểm hết hạn, dữ liệu, nguồn).
+# Truy vấn phổ biến (vd. "Hanoi") lặp lại trong vài phút không gọi lại WeatherAPI.
+# Khóa có tiền tố theo API ('current', 'forecast') nên hai API không đụng nhau;
+# nguồn = (url, params, timeout, ttl) để làm mới mục đó ở nền
+CACHE_MAX_ENTRIES = 4096
+_cache = {}
+_cache_lock = threading.Lock()
+
+# Mục hết hạn chưa quá STALE_GRACE giây vẫn được trả ngay (X-Cache: STALE-REVALIDATE)
+# trong khi một thread nền gọi lại WeatherAPI (stale-while-revalidate)
+STALE_GRACE = 300
+
+# Mỗi PREFETCH_INTERVAL giây, PREFETCH_TOP truy vấn được hỏi nhiều nhất mà sắp
+# hết hạn được làm mới trước, để người dùng luôn trúng cache
+PREFETCH_INTERVAL = 60
+PREFETCH_TOP = 20
+
+_refresh_pool = None  # tạo ở lần làm mới đầu tiên (sau khi gunicorn fork worker)
+_refreshing = set()  # khóa đang được làm mới (tránh gọi WeatherAPI trùng)
+_hot = Counter()  # số lần hỏi mỗi khóa kể từ lượt prefetch trước
+_state_lock = threading.Lock()
+_prefetch_thread = None
+
+def cache_set(key, value, ttl, source=None):
+	"""Lưu dữ liệu vào cache trong ttl giây, bỏ mục cũ nhất khi vượt quá CACHE_MAX_ENTRIES"""
+	with _cache_lock:
+		_cache.pop(key, None)
+		_cache[key] = (time.monotonic() + ttl, value, source)
+		while len(_cache) > CACHE_MAX_ENTRIES:
+			_cache.pop(next(iter(_cache)))
+
+# Body JSON của các lỗi cố định, encode một lần rồi dùng lại: thông báo -> bytes
+_error_bodies = {}
+
+def error_response(message, status):
+	"""
+	Response {'error': message} với body đã encode sẵn
+
+	Chỉ dùng cho thông báo cố định; lỗi có str(e) vẫn dùng jsonify + mask_api_key
+	(mỗi thông báo được giữ lại trong _error_bodies)
+	"""
+	body = _error_bodies.get(message)
+	if body is None:
+		body = _error_bodies[message] = json_dumps({'error': message})
+	return Response(body, status=status, mimetype='application/json')
+
+def mask_api_key(text):
+	"""Che API key trong text (URL request nằm trong thông báo lỗi của requests)"""
+	return text.replace(WEATHER_API_KEY, '***') if WEATHER_API_KEY else text
+
+def fetch_json(url, params, timeout):
+	"""
+	Gọi WeatherAPI và parse JSON
+
+	Raises:
+		requests.exceptions.HTTPError nếu WeatherAPI trả về mã lỗi
+		(status nằm ở e.response.status_code)
+		UpstreamResponseTooLarge nếu body vượt quá MAX_UPSTREAM_BYTES
+	"""
+	# stream=True: đọc body theo từng đoạn, dừng ngay khi vượt MAX_UPSTREAM_BYTES,
+	# rồi đóng response (kể cả khi lỗi) để kết nối trả về pool
+	resp = session.get(url, params=params, timeout=timeout, stream=True)
+	try:
+		resp.raise_for_status()
+		body = read_body(resp, MAX_UPSTREAM_BYTES)
+	finally:
+		resp.close()
+	return json_loads(body)
+
+def reset_session():
+	"""Bỏ Session và thread nền kế thừa từ process cha (gunicorn gọi sau khi fork)"""
+	global session, _refresh_pool, _refreshing, _prefetch_thread
+	session = _build_session()
+	_refresh_pool = None
+	_refreshing = set()
+	_prefetch_thread = None
+
+def _refresh(key):
+	"""Gọi lại WeatherAPI cho một mục cache (chạy trong _refresh_pool)"""
+	try:
+		entry = _cache.get(key)
+		if entry is None or entry[2] is None:
+			return  # Đã bị đẩy khỏi cache
+		url, params, timeout, ttl = entry[2]
+		cache_set(key, fetch_json(url, params, timeout), ttl, entry[2])
+	except Exception:
+		pass  # Giữ bản cũ; request sau khi hết hạn hẳn sẽ tự gọi lại
+	finally:
+		with _state_lock:
+			_refreshing.discard(key)
+
+def _schedule_refresh(key):
+	"""Làm mới mục cache ở nền (bỏ qua nếu mục đó đang được làm mới)"""
+	global _refresh_pool
+	with _state_lock:
+		if key in _refreshing:
+			return
+		_refreshing.add(key)
+		if _refresh_pool is None:
+			_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='weather-refresh')
+		pool = _refresh_pool
+	pool.submit(_refresh, key)
+
+def _prefetch_loop():
+	"""Định kỳ làm mới trước các truy vấn phổ biến sắp hết hạn"""
+	while True:
+		time.sleep(PREFETCH_INTERVAL)
+		with _state_lock:
+			hot_keys = [key for key, _ in _hot.most_common(PREFETCH_TOP)]
+			_hot.clear()
+		deadline = time.monotonic() + PREFETCH_INTERVAL
+		for key in hot_keys:
+			entry = _cache.get(key)
+			if entry is not None and entry[0] < deadline:
+				_schedule_refresh(key)
+
+def _ensure_prefetch_thread():
+	"""Khởi động thread prefetch lần đầu có request (sau khi gunicorn fork worker)"""
+	global _prefetch_thread
+	if _prefetch_thread is not None:
+		return
+	with _state_lock:
+		if _prefetch_thread is None:
+			_prefetch_thread = threading.Thread(target=_prefetch_loop, name='weather-prefetch', daemon=True)
+			_prefetch_thread.start()
+
+def get_weather(key, url, params, timeout, ttl):
+	"""
+	Lấy dữ liệu WeatherAPI qua cache
+
+	Returns:
+		(dữ liệu, trạng thái cache): 'HIT', 'STALE-REVALIDATE' (bản cũ, đang
+		làm mới ở nền) hoặc 'MISS' (vừa gọi WeatherAPI)
+
+	Raises:
+		Như fetch_json khi phải gọi WeatherAPI trực tiếp
+	"""
+	_ensure_prefetch_thread()
+	with _state_lock:
+		_hot[key] += 1
+
+	entry = _cache.get(key)
+	if entry is not None:
+		now = time.monotonic()
+		if now < entry[0]:
+			return entry[1], 'HIT'
+		if now < entry[0] + STALE_GRACE:
+			_schedule_refresh(key)
+			return entry[1], 'STALE-REVALIDATE'
+
+	weather_data = fetch_json(url, params, timeout)
+	cache_set(key, weather_data, ttl, (url, params, timeout, ttl))
+	return weather_data, 'MISS'
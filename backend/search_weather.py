@@ -2,17 +2,21 @@
 # 1. Tìm kiếm thời tiết hiện tại theo tọa độ GPS (lat, lon), lấy từ browser của người dùng khi gửi request
 # 2. Tìm kiếm thời tiết hiện tại theo tên địa điểm (thành phố, quốc gia, v.v.)
 
-import os
 import requests
-from flask import Flask, request, jsonify
+from flask import request, jsonify
 
-app = Flask(__name__)
+# Session, cache và API key dùng chung với search_7days_weather.py
+from search_common import (
+	WEATHER_API_KEY, WEATHER_API_BASE_URL, UpstreamResponseTooLarge, error_response, get_weather, mask_api_key
+)
 
-# Định nghĩa API keys
-WEATHER_API_KEY = os.getenv('WEATHERAPI_KEY', 'YOUR_WEATHERAPI_KEY')
-WEATHER_API_URL = 'http://api.weatherapi.com/v1/current.json'
+WEATHER_API_URL = f'{WEATHER_API_BASE_URL}/current.json'
+
+# Tham số cố định dựng sẵn một lần; mỗi request chỉ nối thêm q
+BASE_PARAMS = (('key', WEATHER_API_KEY), ('aqi', 'no'))
+
+CACHE_TTL = 180  # thời tiết hiện tại cập nhật 5-15 phút/lần
 
-@app.route('/api/current_weather', methods=['POST'])
 def get_current_weather():
 	"""
 	Lấy thông tin thời tiết hiện tại dựa trên:
@@ -36,26 +40,30 @@ def get_current_weather():
 		# Search by GPS coordinates
 		query = f"{lat},{lon}"
 	else:
-		return jsonify({
-			'error': 'Kiểm tra lại dữ liệu gửi lên. Cần cung cấp location hoặc lat và lon.'
-		}), 400
+		return error_response('Kiểm tra lại dữ liệu gửi lên. Cần cung cấp location hoặc lat và lon.', 400)
 	
-	params = {
-		'key': WEATHER_API_KEY,
-		'q': query,
-		'aqi': 'no'
-	}
+	params = (*BASE_PARAMS, ('q', query))
 	
 	try:
-		resp = requests.get(WEATHER_API_URL, params=params, timeout=5)
-		resp.raise_for_status()
-		return jsonify(resp.json())
+		# Lấy qua cache chung (X-Cache: HIT, STALE-REVALIDATE hoặc MISS)
+		weather_data, cache_status = get_weather(('current', query), WEATHER_API_URL, params, 5, CACHE_TTL)
+		response = jsonify(weather_data)
+		response.headers['X-Cache'] = cache_status
+		return response
 	except requests.exceptions.HTTPError as e:
-		if resp.status_code == 400:
-			return jsonify({'error': 'Địa điểm hoặc tọa độ không hợp lệ'}), 400
-		return jsonify({'error': f'Lỗi API: {str(e)}'}), 500
+		if e.response.status_code == 400:
+			return error_response('Địa điểm hoặc tọa độ không hợp lệ', 400)
+		return jsonify({'error': f'Lỗi API: {mask_api_key(str(e))}'}), 500
+	except UpstreamResponseTooLarge:
+		return error_response('Phản hồi từ WeatherAPI quá lớn', 502)
 	except Exception as e:
-		return jsonify({'error': str(e)}), 500
+		return jsonify({'error': mask_api_key(str(e))}), 500
+
+def register(app):
+	"""Gắn POST /api/current_weather vào app (xem search_app.py)"""
+	app.add_url_rule('/api/current_weather', view_func=get_current_weather, methods=['POST'])
 
 if __name__ == '__main__':
-	app.run(host='0.0.0.0', port=5000, debug=True)
+	# Chạy chung với API dự báo 7 ngày trong một process
+	from search_app import main
+	main()
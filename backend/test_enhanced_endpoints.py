@@ -5,40 +5,19 @@ Test script for enhanced weather endpoints
 import requests
 import json
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-def test_enhanced_endpoints():
-    """Test the new enhanced endpoints"""
-    
-    # Start the server in background first
-    print("Testing Enhanced Weather Endpoints")
-    print("=" * 50)
-    
-    base_url = "http://localhost:5000"
-    
-    # Test data
-    test_location = {
-        "location": "Hanoi"
-    }
-    
-    try:
-        # Test health endpoint first
-        print("1. Testing health endpoint...")
-        response = requests.get(f"{base_url}/api/health", timeout=5)
-        if response.status_code == 200:
-            print("✓ Health endpoint working")
-        else:
-            print("✗ Health endpoint failed")
-            return False
-            
-    except requests.exceptions.ConnectionError:
-        print("✗ Server not running. Please start the server first with:")
-        print("python app.py")
-        return False
-    
+def _check_enhanced_current(session, base_url):
+    """Probe the enhanced current weather endpoint; returns the report lines"""
+    out = []
     try:
         # Test enhanced current weather
-        print("\n2. Testing enhanced current weather endpoint...")
-        response = requests.post(
+        out.append("\n2. Testing enhanced current weather endpoint...")
+        test_location = {
+            "location": "Hanoi"
+        }
+        
+        response = session.post(
             f"{base_url}/api/weather/enhanced-current",
             json=test_location,
             headers={"Content-Type": "application/json"},
@@ -47,7 +26,7 @@ def test_enhanced_endpoints():
         
         if response.status_code == 200:
             data = response.json()
-            print("✓ Enhanced current weather endpoint working")
+            out.append("✓ Enhanced current weather endpoint working")
             
             # Check for enhanced features
             if 'data' in data:
@@ -69,26 +48,31 @@ def test_enhanced_endpoints():
                 if 'insights' in enhanced_data:
                     features_found.append("Weather insights & trends")
                 
-                print(f"  Enhanced features found: {len(features_found)}")
+                out.append(f"  Enhanced features found: {len(features_found)}")
                 for feature in features_found:
-                    print(f"    • {feature}")
+                    out.append(f"    • {feature}")
             
         else:
-            print(f"✗ Enhanced current weather failed: {response.status_code}")
-            print(f"Response: {response.text}")
+            out.append(f"✗ Enhanced current weather failed: {response.status_code}")
+            out.append(f"Response: {response.text}")
     
     except Exception as e:
-        print(f"✗ Error testing enhanced current weather: {e}")
+        out.append(f"✗ Error testing enhanced current weather: {e}")
     
+    return out
+
+def _check_enhanced_forecast(session, base_url):
+    """Probe the enhanced forecast endpoint; returns the report lines"""
+    out = []
     try:
         # Test enhanced forecast
-        print("\n3. Testing enhanced forecast endpoint...")
+        out.append("\n3. Testing enhanced forecast endpoint...")
         forecast_data = {
             "location": "Ho Chi Minh City",
             "days": 3
         }
         
-        response = requests.post(
+        response = session.post(
             f"{base_url}/api/weather/enhanced-forecast",
             json=forecast_data,
             headers={"Content-Type": "application/json"},
@@ -97,7 +81,7 @@ def test_enhanced_endpoints():
         
         if response.status_code == 200:
             data = response.json()
-            print("✓ Enhanced forecast endpoint working")
+            out.append("✓ Enhanced forecast endpoint working")
             
             # Check for enhanced features
             if 'data' in data:
@@ -111,16 +95,56 @@ def test_enhanced_endpoints():
                 if 'current_enhanced' in enhanced_data:
                     features_found.append("Enhanced current weather data")
                 
-                print(f"  Enhanced forecast features: {len(features_found)}")
+                out.append(f"  Enhanced forecast features: {len(features_found)}")
                 for feature in features_found:
-                    print(f"    • {feature}")
+                    out.append(f"    • {feature}")
         
         else:
-            print(f"✗ Enhanced forecast failed: {response.status_code}")
-            print(f"Response: {response.text}")
+            out.append(f"✗ Enhanced forecast failed: {response.status_code}")
+            out.append(f"Response: {response.text}")
     
     except Exception as e:
-        print(f"✗ Error testing enhanced forecast: {e}")
+        out.append(f"✗ Error testing enhanced forecast: {e}")
+    
+    return out
+
+def run_enhanced_endpoint_checks():
+    """
+    Test the new enhanced endpoints against a running server
+
+    Not named test_* so pytest does not collect it: it needs `python app.py`
+    running on localhost:5000. Returns False if the server is unreachable.
+    """
+    
+    # Start the server in background first
+    print("Testing Enhanced Weather Endpoints")
+    print("=" * 50)
+    
+    base_url = "http://localhost:5000"
+    
+    try:
+        # Test health endpoint first
+        print("1. Testing health endpoint...")
+        response = requests.get(f"{base_url}/api/health", timeout=5)
+        if response.status_code == 200:
+            print("✓ Health endpoint working")
+        else:
+            print("✗ Health endpoint failed")
+            return False
+            
+    except requests.exceptions.ConnectionError:
+        print("✗ Server not running. Please start the server first with:")
+        print("python app.py")
+        return False
+    
+    # The remaining probes are independent - run them concurrently on one
+    # pooled session so the wall time is the slowest call, not the sum
+    checks = (_check_enhanced_current, _check_enhanced_forecast)
+    with requests.Session() as session, ThreadPoolExecutor(len(checks)) as pool:
+        reports = list(pool.map(lambda check: check(session, base_url), checks))
+    for report in reports:
+        for line in report:
+            print(line)
     
     print("\n" + "=" * 50)
     print("Test completed!")
@@ -130,6 +154,7 @@ def test_enhanced_endpoints():
     print('curl -X POST http://localhost:5000/api/weather/enhanced-current \\')
     print('  -H "Content-Type: application/json" \\')
     print('  -d \'{"location": "Hanoi"}\'')
+    return True
 
 if __name__ == "__main__":
-    test_enhanced_endpoints()
\ No newline at end of file
+    sys.exit(0 if run_enhanced_endpoint_checks() else 1)
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Tests for the combined search app (search_app.py)
+"""
+
+import sys
+import os
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from search_app import app
+
+
+def test_search_routes_registered_once():
+	"""Each search API is registered exactly once (plus Flask's static route)"""
+	rules = list(app.url_map.iter_rules())
+	assert len(rules) == 3
+
+	paths = sorted(rule.rule for rule in rules if rule.endpoint != 'static')
+	assert paths == ['/api/current_weather', '/api/forecast_weather']
+
+
+if __name__ == '__main__':
+	test_search_routes_registered_once()
+	print("✓ Search app routes registered once")
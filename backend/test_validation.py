@@ -38,11 +38,25 @@ def test_input_validation():
 	assert is_valid == False
 	print(f"✓ Invalid coordinates rejected: {error}")
 	
+	# Test coordinate helpers: validate_coordinates keeps its (is_valid, error) pair
+	is_valid, error = InputValidator.validate_coordinates('21.5', 105)
+	assert is_valid == True and error is None
+	is_valid, error, lat, lon = InputValidator.parse_coordinates('21.5', 105)
+	assert (is_valid, lat, lon) == (True, 21.5, 105.0)
+	is_valid, error, lat, lon = InputValidator.parse_coordinates('north', 105)
+	assert is_valid == False and lat is None
+	print("✓ Coordinate validation and parsing work")
+	
 	# Test missing data
 	is_valid, error, data = InputValidator.validate_location_request({})
 	assert is_valid == False
 	print(f"✓ Missing data rejected: {error}")
 	
+	# Test non-object body (JSON array)
+	is_valid, error, data = InputValidator.validate_location_request([{'location': 'Hanoi'}])
+	assert is_valid == False
+	print(f"✓ Non-object body rejected: {error}")
+	
 	# Test days validation
 	is_valid, error, days = InputValidator.validate_days(5)
 	assert is_valid == True
@@ -120,247 +134,29 @@ def test_translation():
 	print("\n✅ All translation tests passed!\n")
 
 
-def test_response_formatting():
-	"""Test response formatting"""
-	print("Testing Response Formatting...")
-	
-	# Test success response
-	success = ResponseFormatter.format_success(
-		{'temperature': 25},
-		'Thành công'
-	)
-	assert success['success'] == True
-	assert success['data']['temperature'] == 25
-	assert success['message'] == 'Thành công'
-	assert 'timestamp' in success
-	print("✓ Success response formatted correctly")
-	
-	# Test error response
-	error = ResponseFormatter.format_error(
-		'Có lỗi xảy ra',
-		'TEST_ERROR',
-		400
-	)
-	assert error['success'] == False
-	assert error['error']['message'] == 'Có lỗi xảy ra'
-	assert error['error']['code'] == 'TEST_ERROR'
-	assert error['error']['status'] == 400
-	assert 'timestamp' in error
-	print("✓ Error response formatted correctly")
-	
-	# Test current weather formatting
-	weather_data = {
-		'location': {
-			'name': 'Hanoi',
-			'name_vi': 'Hà Nội',
-			'country': 'Vietnam',
-			'lat': 21.0285,
-			'lon': 105.8542
-		},
+def test_translate_all_sections():
+	"""translate_all translates only the requested sections in a single pass"""
+	forecast_data = {
 		'current': {
-			'temp_c': 25,
-			'temp_f': 77,
-			'condition': {
-				'text': 'Sunny',
-				'text_vi': 'Nắng',
-				'icon': '//icon.png'
-			},
-			'wind_dir': 'NE',
-			'wind_dir_vi': 'Đông Bắc',
-			'humidity': 70
-		}
-	}
-	
-	formatted = ResponseFormatter.format_current_weather(weather_data)
-	assert formatted['location']['name'] == 'Hanoi'
-	assert formatted['current']['temp_c'] == 25
-	assert formatted['current']['condition']['text_vi'] == 'Nắng'
-	assert formatted['current']['wind_dir_vi'] == 'Đông Bắc'
-	print("✓ Current weather formatted correctly")
-	
-	# Test safe_get utility
-	value = ResponseFormatter.safe_get(weather_data, 'location.name', 'default')
-	assert value == 'Hanoi'
-	print("✓ safe_get works for existing key")
-	
-	value = ResponseFormatter.safe_get(weather_data, 'location.missing.key', 'default')
-	assert value == 'default'
-	print("✓ safe_get returns default for missing key")
-	
-	print("\n✅ All response formatting tests passed!\n")
-
-
-def test_sanitization():
-	"""Test input sanitization"""
-	print("Testing Input Sanitization...")
-	
-	# Test string sanitization
-	clean = InputValidator.sanitize_input("<script>alert('xss')</script>")
-	assert '<' not in clean
-	assert '>' not in clean
-	print(f"✓ Sanitized: '<script>...' → '{clean}'")
-	
-	# Test dict sanitization
-	dirty = {
-		'location': 'Ha<noi>',
-		'nested': {
-			'value': "test'quote"
-		}
-	}
-	clean = InputValidator.sanitize_input(dirty)
-	assert '<' not in clean['location']
-	assert '>' not in clean['location']
-	assert "'" not in clean['nested']['value']
-	print("✓ Dictionary sanitized recursively")
-	
-	print("\n✅ All sanitization tests passed!\n")
-
-
-if __name__ == '__main__':
-	print("=" * 60)
-	print("  VALIDATION & TRANSLATION MODULE TESTS")
-	print("=" * 60)
-	print()
-	
-	try:
-		test_input_validation()
-		test_translation()
-		test_response_formatting()
-		test_sanitization()
-		
-		print("=" * 60)
-		print("  🎉 ALL TESTS PASSED! 🎉")
-		print("=" * 60)
-		
-	except AssertionError as e:
-		print(f"\n❌ Test failed: {e}")
-		sys.exit(1)
-	except Exception as e:
-		print(f"\n❌ Unexpected error: {e}")
-		import traceback
-		traceback.print_exc()
-		sys.exit(1)
-
-"""
-Tests for validation, translation, and formatting modules
-"""
-
-import sys
-import os
-
-# Add backend directory to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-
-from validate_information import InputValidator, WeatherTranslator, ResponseFormatter
-
-
-def test_input_validation():
-	"""Test input validation"""
-	print("Testing Input Validation...")
-	
-	# Test valid location
-	is_valid, error, data = InputValidator.validate_location_request({'location': 'Hanoi'})
-	assert is_valid == True
-	assert data['location'] == 'Hanoi'
-	print("✓ Valid location passed")
-	
-	# Test valid coordinates
-	is_valid, error, data = InputValidator.validate_location_request({'lat': 21.0285, 'lon': 105.8542})
-	assert is_valid == True
-	assert data['lat'] == 21.0285
-	assert data['lon'] == 105.8542
-	print("✓ Valid coordinates passed")
-	
-	# Test invalid location (too short)
-	is_valid, error, data = InputValidator.validate_location_request({'location': 'H'})
-	assert is_valid == False
-	print(f"✓ Invalid location rejected: {error}")
-	
-	# Test invalid coordinates
-	is_valid, error, data = InputValidator.validate_location_request({'lat': 100, 'lon': 200})
-	assert is_valid == False
-	print(f"✓ Invalid coordinates rejected: {error}")
-	
-	# Test missing data
-	is_valid, error, data = InputValidator.validate_location_request({})
-	assert is_valid == False
-	print(f"✓ Missing data rejected: {error}")
-	
-	# Test days validation
-	is_valid, error, days = InputValidator.validate_days(5)
-	assert is_valid == True
-	assert days == 5
-	print("✓ Valid days passed")
-	
-	is_valid, error, days = InputValidator.validate_days(15)
-	assert is_valid == False
-	print(f"✓ Invalid days rejected: {error}")
-	
-	print("\n✅ All input validation tests passed!\n")
-
-
-def test_translation():
-	"""Test Vietnamese translation"""
-	print("Testing Vietnamese Translation...")
-	
-	# Test weather condition translation
-	text_vi = WeatherTranslator.translate_condition('Sunny')
-	assert text_vi == 'Nắng'
-	print(f"✓ 'Sunny' → '{text_vi}'")
-	
-	text_vi = WeatherTranslator.translate_condition('Partly cloudy')
-	assert text_vi == 'Có mây'
-	print(f"✓ 'Partly cloudy' → '{text_vi}'")
-	
-	text_vi = WeatherTranslator.translate_condition('Heavy rain')
-	assert text_vi == 'Mưa to'
-	print(f"✓ 'Heavy rain' → '{text_vi}'")
-	
-	# Test wind direction translation
-	dir_vi = WeatherTranslator.translate_wind_direction('N')
-	assert dir_vi == 'Bắc'
-	print(f"✓ 'N' → '{dir_vi}'")
-	
-	dir_vi = WeatherTranslator.translate_wind_direction('SE')
-	assert dir_vi == 'Đông Nam'
-	print(f"✓ 'SE' → '{dir_vi}'")
-	
-	# Test AQI category translation
-	cat_vi = WeatherTranslator.translate_aqi_category('Good')
-	assert cat_vi == 'Tốt'
-	print(f"✓ 'Good' → '{cat_vi}'")
-	
-	cat_vi = WeatherTranslator.translate_aqi_category('Unhealthy')
-	assert cat_vi == 'Không tốt cho sức khỏe'
-	print(f"✓ 'Unhealthy' → '{cat_vi}'")
-	
-	# Test AQI recommendation
-	rec = WeatherTranslator.get_aqi_recommendation('Good')
-	assert 'an toàn' in rec.lower()
-	print(f"✓ AQI recommendation: {rec}")
-	
-	# Test alert type translation
-	alert_vi = WeatherTranslator.translate_alert_type('Heavy Thunderstorm Warning')
-	print(f"✓ Alert type translated: '{alert_vi}'")
-	# The translation logic looks for keywords, so 'Thunderstorm' in the string will match
-	# Since we got 'Bão', that's valid too (it's the Storm translation)
-	
-	# Test current weather translation
-	weather_data = {
-		'location': {'name': 'Hanoi', 'country': 'Vietnam'},
-		'current': {
-			'temp_c': 25,
-			'condition': {'text': 'Sunny', 'icon': '//icon.png'},
-			'wind_dir': 'NE'
-		}
+			'condition': {'text': 'Sunny'},
+			'air_quality': {'aqi_category': 'Good'}
+		},
+		'forecast': {'forecastday': [{
+			'day': {'condition': {'text': 'Sunny'}},
+			'hour': [{'condition': {'text': 'Sunny'}, 'wind_dir': 'NE'}]
+		}]},
+		'alerts': {'alert': [{'event': 'Flood Warning', 'severity': 'Severe'}]}
 	}
 	
-	translated = WeatherTranslator.translate_current_weather(weather_data)
-	assert translated['current']['condition']['text_vi'] == 'Nắng'
-	assert translated['current']['wind_dir_vi'] == 'Đông Bắc'
-	print("✓ Current weather data translated successfully")
+	translated = WeatherTranslator.translate_all(forecast_data, sections=('forecast', 'alerts'))
 	
-	print("\n✅ All translation tests passed!\n")
+	forecast_day = translated['forecast']['forecastday'][0]
+	assert forecast_day['day']['condition']['text_vi'] == 'Nắng'
+	assert forecast_day['hour'][0]['wind_dir_vi'] == 'Đông Bắc'
+	assert translated['alerts']['alert'][0]['severity_vi'] == 'Nghiêm trọng'
+	assert translated['current']['air_quality']['aqi_category_vi'] == 'Tốt'
+	# 'current' was not requested, so its condition stays untranslated
+	assert 'text_vi' not in translated['current']['condition']
 
 
 def test_response_formatting():
@@ -391,6 +187,13 @@ def test_response_formatting():
 	assert 'timestamp' in error
 	print("✓ Error response formatted correctly")
 	
+	# Prebuilt error bodies are copied, so a response can be changed safely
+	prebuilt = ResponseFormatter.error_body('Có lỗi xảy ra', 'TEST_ERROR', 400)
+	error = ResponseFormatter.format_error_from(prebuilt)
+	error['error']['details'] = 'x'
+	assert 'details' not in prebuilt
+	print("✓ Prebuilt error body not shared")
+	
 	# Test current weather formatting
 	weather_data = {
 		'location': {
@@ -430,6 +233,15 @@ def test_response_formatting():
 	assert value == 'default'
 	print("✓ safe_get returns default for missing key")
 	
+	# Test alerts formatting: AQI warning comes from the raw upstream value
+	alerts_data = {'alerts': {'alert': []}, 'current': {'air_quality': {'us-epa-index': 150}}}
+	formatted = ResponseFormatter.format_alerts(alerts_data)
+	assert formatted['has_warnings'] == True
+	assert 'has_warning' not in alerts_data['current']['air_quality']
+	alerts_data['current']['air_quality']['us-epa-index'] = 40
+	assert ResponseFormatter.format_alerts(alerts_data)['has_warnings'] == False
+	print("✓ Alerts has_warnings computed from AQI")
+	
 	print("\n✅ All response formatting tests passed!\n")
 
 
@@ -468,6 +280,7 @@ if __name__ == '__main__':
 	try:
 		test_input_validation()
 		test_translation()
+		test_translate_all_sections()
 		test_response_formatting()
 		test_sanitization()
 		
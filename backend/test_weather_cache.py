@@ -0,0 +1,267 @@
+"""
+Tests for response caching, conditional requests and the weather bundle (app.py + weather_cache.py)
+
+WeatherAPI is replaced by a fake session, so no API key or network is needed.
+"""
+
+import sys
+import os
+import copy
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import app as weather_app
+import weather_cache
+from json_provider import UpstreamResponseTooLarge
+
+
+FORECAST = {
+	'location': {'name': 'Hanoi', 'country': 'Vietnam', 'lat': 21.03, 'lon': 105.85,
+	             'tz_id': 'Asia/Bangkok', 'localtime': '2026-10-16 10:00'},
+	'current': {'temp_c': 30, 'humidity': 70, 'wind_kph': 10, 'uv': 5, 'wind_dir': 'N',
+	            'condition': {'text': 'Sunny', 'icon': 'i', 'code': 1000},
+	            'air_quality': {'us-epa-index': 2, 'pm2_5': 10}},
+	'forecast': {'forecastday': [{
+		'date': '2026-10-16',
+		'day': {'maxtemp_c': 32, 'mintemp_c': 25, 'condition': {'text': 'Sunny', 'icon': 'i', 'code': 1000}},
+		'astro': {'sunrise': '06:00 AM', 'sunset': '06:00 PM', 'moon_phase': 'Full Moon'},
+		'hour': [],
+	}]},
+	'alerts': {'alert': []},
+}
+
+
+class FakeResponse:
+	"""Minimal streamed requests.Response"""
+
+	def __init__(self, data, status_code=200, headers=None):
+		self.status_code = status_code
+		self.headers = dict(headers or {})
+		self.body = json.dumps(data).encode('utf-8')
+
+	def iter_content(self, chunk_size=1):
+		for start in range(0, len(self.body), chunk_size):
+			yield self.body[start:start + chunk_size]
+
+	def raise_for_status(self):
+		if self.status_code >= 400:
+			import requests
+			raise requests.exceptions.HTTPError(str(self.status_code), response=self)
+
+	def close(self):
+		pass
+
+
+class FakeSession:
+	"""Records WeatherAPI calls and answers them with handler(url, params, headers)"""
+
+	def __init__(self, handler=None):
+		self.handler = handler or (lambda url, params, headers: FakeResponse(copy.deepcopy(FORECAST)))
+		self.calls = []
+		self.lock = threading.Lock()
+
+	def get(self, url, params=None, headers=None, **kwargs):
+		with self.lock:
+			self.calls.append((url, dict(params or {}), dict(headers or {})))
+		return self.handler(url, params or {}, headers or {})
+
+
+def _use_session(session):
+	"""Route WeatherAPI calls to session and start from empty caches"""
+	weather_app.get_session = lambda: session
+	weather_cache.response_cache._store.clear()
+	weather_cache.upstream_validators._store.clear()
+	return weather_app.app.test_client()
+
+
+def _post_current(client, location='Hanoi', headers=None):
+	return client.post('/api/weather/current', json={'location': location}, headers=headers)
+
+
+def test_cache_hit_and_ttl_expiry():
+	"""A repeated request is served from cache until its TTL runs out"""
+	session = FakeSession()
+	client = _use_session(session)
+	now = [time.monotonic()]
+	real_time = weather_cache.time
+	weather_cache.time = SimpleNamespace(monotonic=lambda: now[0])
+	try:
+		first = _post_current(client)
+		second = _post_current(client, '  HANOI ')
+		assert first.status_code == second.status_code == 200
+		assert second.get_data() == first.get_data()
+		assert len(session.calls) == 1
+		print("✓ Second request served from cache")
+
+		now[0] += weather_app.CACHE_TTL_CURRENT + 1
+		assert _post_current(client).status_code == 200
+		assert len(session.calls) == 2
+		print("✓ Expired entry refetched")
+	finally:
+		weather_cache.time = real_time
+
+
+def test_stale_body_served_on_upstream_error():
+	"""Once the fresh entry expired, a WeatherAPI 5xx returns the last good body"""
+	session = FakeSession()
+	client = _use_session(session)
+	now = [time.monotonic()]
+	real_time = weather_cache.time
+	weather_cache.time = SimpleNamespace(monotonic=lambda: now[0])
+	try:
+		good = _post_current(client)
+		now[0] += weather_app.CACHE_TTL_CURRENT + 1
+		session.handler = lambda url, params, headers: FakeResponse({'error': 'down'}, 503)
+		stale = _post_current(client)
+		assert len(session.calls) == 2
+		assert stale.status_code == 200
+		assert stale.get_data() == good.get_data()
+		print("✓ Stale body served on 5xx")
+	finally:
+		weather_cache.time = real_time
+
+
+def test_concurrent_misses_share_one_upstream_call():
+	"""Identical requests arriving together make a single WeatherAPI call"""
+	entered = threading.Event()
+	release = threading.Event()
+
+	def slow_handler(url, params, headers):
+		entered.set()
+		release.wait(5)
+		return FakeResponse(copy.deepcopy(FORECAST))
+
+	session = FakeSession(slow_handler)
+	client = _use_session(session)
+	results = []
+
+	def request_current():
+		results.append(_post_current(weather_app.app.test_client()))
+
+	threads = [threading.Thread(target=request_current) for _ in range(4)]
+	threads[0].start()
+	assert entered.wait(5)
+	for thread in threads[1:]:
+		thread.start()
+	time.sleep(0.2)  # Let the followers reach the in-flight wait
+	release.set()
+	for thread in threads:
+		thread.join(10)
+
+	assert len(session.calls) == 1
+	assert [r.status_code for r in results] == [200] * 4
+	assert len({r.get_data() for r in results}) == 1
+	print("✓ Concurrent misses coalesced into one upstream call")
+
+
+def test_if_none_match_returns_304():
+	"""A matching If-None-Match gets an empty 304 with the same ETag"""
+	client = _use_session(FakeSession())
+	first = _post_current(client)
+	etag = first.headers['ETag']
+	assert etag
+
+	not_modified = _post_current(client, headers={'If-None-Match': etag})
+	assert not_modified.status_code == 304
+	assert not_modified.get_data() == b''
+	assert not_modified.headers['ETag'] == etag
+	print("✓ If-None-Match answered with 304")
+
+	assert _post_current(client, headers={'If-None-Match': '"other"'}).status_code == 200
+	print("✓ Non-matching ETag gets the full body")
+
+
+def test_upstream_304_replays_stored_body():
+	"""A refetch sends WeatherAPI's ETag back and reuses the stored body on 304"""
+	def handler(url, params, headers):
+		if headers.get('If-None-Match') == '"v1"':
+			return FakeResponse({}, 304, {'ETag': '"v1"'})
+		return FakeResponse(copy.deepcopy(FORECAST), 200, {'ETag': '"v1"'})
+
+	session = FakeSession(handler)
+	client = _use_session(session)
+	first = _post_current(client)
+	weather_cache.response_cache._store.clear()  # Force a refetch
+	second = _post_current(client)
+
+	assert len(session.calls) == 2
+	assert 'If-None-Match' not in session.calls[0][2]
+	assert session.calls[1][2]['If-None-Match'] == '"v1"'
+	assert second.status_code == 200
+	assert second.get_json()['data'] == first.get_json()['data']
+	print("✓ Upstream 304 replayed the stored body")
+
+
+def test_oversized_upstream_body():
+	"""Bodies over max_body_bytes are rejected with a 502"""
+	client = _use_session(FakeSession())
+	real_cfg = weather_app.cfg
+	weather_app.cfg = real_cfg._replace(max_body_bytes=256)
+	try:
+		response = _post_current(client)
+	finally:
+		weather_app.cfg = real_cfg
+	assert response.status_code == 502
+	assert response.get_json()['error']['code'] == 'UPSTREAM_RESPONSE_TOO_LARGE'
+	print("✓ Oversized streamed body rejected")
+
+	too_long = FakeResponse({}, 200, {'Content-Length': str(real_cfg.max_body_bytes + 1)})
+	try:
+		weather_app.load_json(too_long)
+		assert False, 'expected UpstreamResponseTooLarge'
+	except UpstreamResponseTooLarge:
+		pass
+	print("✓ Oversized Content-Length rejected before reading")
+
+
+def test_bundle_partial_failure():
+	"""A failing component is reported under 'errors' while the others succeed"""
+	def handler(url, params, headers):
+		if url == weather_app.cfg.timezone_url:
+			return FakeResponse({'error': 'boom'}, 500)
+		return FakeResponse(copy.deepcopy(FORECAST))
+
+	client = _use_session(FakeSession(handler))
+	response = client.post('/api/weather/bundle', json={
+		'location': 'Hanoi', 'include': ['forecast', 'timezone']
+	})
+	assert response.status_code == 200
+	data = response.get_json()['data']
+	assert 'forecast' in data
+	assert 'timezone' not in data
+	assert data['errors']['timezone']['status'] == 500
+	print("✓ Partial bundle failure reported under errors")
+
+
+if __name__ == '__main__':
+	print("=" * 60)
+	print("  RESPONSE CACHE & BUNDLE TESTS")
+	print("=" * 60)
+	print()
+
+	try:
+		test_cache_hit_and_ttl_expiry()
+		test_stale_body_served_on_upstream_error()
+		test_concurrent_misses_share_one_upstream_call()
+		test_if_none_match_returns_304()
+		test_upstream_304_replays_stored_body()
+		test_oversized_upstream_body()
+		test_bundle_partial_failure()
+
+		print("=" * 60)
+		print("  🎉 ALL TESTS PASSED! 🎉")
+		print("=" * 60)
+
+	except AssertionError as e:
+		print(f"\n❌ Test failed: {e}")
+		sys.exit(1)
+	except Exception as e:
+		print(f"\n❌ Unexpected error: {e}")
+		import traceback
+		traceback.print_exc()
+		sys.exit(1)
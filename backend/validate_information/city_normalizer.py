@@ -3,7 +3,8 @@ Vietnamese City Name Normalizer
 Converts Vietnamese city names with diacritics to normalized search queries
 """
 
-import re
+from bisect import bisect_right
+from functools import lru_cache
 from typing import Dict, List, Tuple
 import unicodedata
 
@@ -102,10 +103,41 @@ class VietnameseCityNormalizer:
     }
     
     # Diacritic removal mapping
+    VIETNAMESE_MAP = {
+        'à': 'a', 'á': 'a', 'ả': 'a', 'ã': 'a', 'ạ': 'a',
+        'ă': 'a', 'ằ': 'a', 'ắ': 'a', 'ẳ': 'a', 'ẵ': 'a', 'ặ': 'a',
+        'â': 'a', 'ầ': 'a', 'ấ': 'a', 'ẩ': 'a', 'ẫ': 'a', 'ậ': 'a',
+        'đ': 'd',
+        'è': 'e', 'é': 'e', 'ẻ': 'e', 'ẽ': 'e', 'ẹ': 'e',
+        'ê': 'e', 'ề': 'e', 'ế': 'e', 'ể': 'e', 'ễ': 'e', 'ệ': 'e',
+        'ì': 'i', 'í': 'i', 'ỉ': 'i', 'ĩ': 'i', 'ị': 'i',
+        'ò': 'o', 'ó': 'o', 'ỏ': 'o', 'õ': 'o', 'ọ': 'o',
+        'ô': 'o', 'ồ': 'o', 'ố': 'o', 'ổ': 'o', 'ỗ': 'o', 'ộ': 'o',
+        'ơ': 'o', 'ờ': 'o', 'ớ': 'o', 'ở': 'o', 'ỡ': 'o', 'ợ': 'o',
+        'ù': 'u', 'ú': 'u', 'ủ': 'u', 'ũ': 'u', 'ụ': 'u',
+        'ư': 'u', 'ừ': 'u', 'ứ': 'u', 'ử': 'u', 'ữ': 'u', 'ự': 'u',
+        'ỳ': 'y', 'ý': 'y', 'ỷ': 'y', 'ỹ': 'y', 'ỵ': 'y',
+    }
+    
+    # Translation table built once from the mapping above; it also deletes
+    # combining marks (U+0300-U+036F), so decomposed input strips in one pass
+    DIACRITIC_TABLE = str.maketrans({**dict.fromkeys(map(chr, range(0x300, 0x370))), **VIETNAMESE_MAP})
+    
+    # Lowercase Vietnamese letters with diacritics
+    VIETNAMESE_CHARS = frozenset(VIETNAMESE_MAP)
+    
+    # Administrative prefixes stripped by normalize_city_name, in stripping order
+    CITY_PREFIXES = ('thành phố', 'tp.', 'tp ', 'tỉnh', 'huyện', 'quận', 'thị xã', 'thị trấn')
+    
+    # Common Vietnamese prefixes without diacritics; the others ('thành phố',
+    # 'tỉnh', 'huyện', 'quận') are already caught by VIETNAMESE_CHARS
+    VIETNAMESE_ASCII_PREFIXES = ('tp.', 'tp ')
+    
     @staticmethod
+    @lru_cache(maxsize=1024)
     def remove_vietnamese_diacritics(text: str) -> str:
         """
-        Remove Vietnamese diacritics from text
+        Remove Vietnamese diacritics from text (cached: queries repeat)
         
         Args:
             text: Vietnamese text with diacritics
@@ -113,28 +145,15 @@ class VietnameseCityNormalizer:
         Returns:
             Text without diacritics
         """
-        # Vietnamese character mapping
-        vietnamese_map = {
-            'à': 'a', 'á': 'a', 'ả': 'a', 'ã': 'a', 'ạ': 'a',
-            'ă': 'a', 'ằ': 'a', 'ắ': 'a', 'ẳ': 'a', 'ẵ': 'a', 'ặ': 'a',
-            'â': 'a', 'ầ': 'a', 'ấ': 'a', 'ẩ': 'a', 'ẫ': 'a', 'ậ': 'a',
-            'đ': 'd',
-            'è': 'e', 'é': 'e', 'ẻ': 'e', 'ẽ': 'e', 'ẹ': 'e',
-            'ê': 'e', 'ề': 'e', 'ế': 'e', 'ể': 'e', 'ễ': 'e', 'ệ': 'e',
-            'ì': 'i', 'í': 'i', 'ỉ': 'i', 'ĩ': 'i', 'ị': 'i',
-            'ò': 'o', 'ó': 'o', 'ỏ': 'o', 'õ': 'o', 'ọ': 'o',
-            'ô': 'o', 'ồ': 'o', 'ố': 'o', 'ổ': 'o', 'ỗ': 'o', 'ộ': 'o',
-            'ơ': 'o', 'ờ': 'o', 'ớ': 'o', 'ở': 'o', 'ỡ': 'o', 'ợ': 'o',
-            'ù': 'u', 'ú': 'u', 'ủ': 'u', 'ũ': 'u', 'ụ': 'u',
-            'ư': 'u', 'ừ': 'u', 'ứ': 'u', 'ử': 'u', 'ữ': 'u', 'ự': 'u',
-            'ỳ': 'y', 'ý': 'y', 'ỷ': 'y', 'ỹ': 'y', 'ỵ': 'y',
-        }
-        
-        result = text.lower()
-        for viet_char, latin_char in vietnamese_map.items():
-            result = result.replace(viet_char, latin_char)
-        
-        return result
+        text = text.lower()
+        if text.isascii():
+            return text  # Nothing to strip
+        text = text.translate(VietnameseCityNormalizer.DIACRITIC_TABLE)
+        if not text.isascii():
+            # Accented letters outside the Vietnamese table (e.g. "ü", "ç"):
+            # decompose them and drop the combining marks with the same table
+            text = unicodedata.normalize('NFD', text).translate(VietnameseCityNormalizer.DIACRITIC_TABLE)
+        return text
     
     @staticmethod
     def normalize_city_name(city_name: str) -> List[str]:
@@ -150,7 +169,13 @@ class VietnameseCityNormalizer:
         if not city_name or not isinstance(city_name, str):
             return [city_name]
         
-        original = city_name.strip()
+        # Cached as a tuple; every caller gets its own list
+        return list(VietnameseCityNormalizer._normalize_terms(city_name.strip()))
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _normalize_terms(original: str) -> Tuple[str, ...]:
+        """Search terms for a stripped city name (see normalize_city_name)"""
         normalized_queries = []
         
         # Convert to lowercase for comparison
@@ -160,12 +185,12 @@ class VietnameseCityNormalizer:
         if city_lower in VietnameseCityNormalizer.CITY_MAPPINGS:
             normalized_queries.append(VietnameseCityNormalizer.CITY_MAPPINGS[city_lower])
         
-        # Remove common prefixes
+        # Remove common prefixes (one C-level check skips the loop for most names)
         city_no_prefix = city_lower
-        prefixes = ['thành phố', 'tp.', 'tp ', 'tỉnh', 'huyện', 'quận', 'thị xã', 'thị trấn']
-        for prefix in prefixes:
-            if city_no_prefix.startswith(prefix):
-                city_no_prefix = city_no_prefix[len(prefix):].strip()
+        if city_no_prefix.startswith(VietnameseCityNormalizer.CITY_PREFIXES):
+            for prefix in VietnameseCityNormalizer.CITY_PREFIXES:
+                if city_no_prefix.startswith(prefix):
+                    city_no_prefix = city_no_prefix[len(prefix):].strip()
         
         # Check without prefix
         if city_no_prefix in VietnameseCityNormalizer.CITY_MAPPINGS:
@@ -180,7 +205,7 @@ class VietnameseCityNormalizer:
         if original not in normalized_queries:
             normalized_queries.append(original)
         
-        return normalized_queries
+        return tuple(normalized_queries)
     
     @staticmethod
     def get_search_suggestions(query: str) -> List[Tuple[str, str]]:
@@ -196,28 +221,32 @@ class VietnameseCityNormalizer:
         if not query or len(query) < 2:
             return []
         
+        if _SUGGESTION_SEPARATOR in query:
+            return []  # Could match across two names in the joined index
+        
         query_lower = query.lower()
         query_no_diacritics = VietnameseCityNormalizer.remove_vietnamese_diacritics(query_lower)
         
-        suggestions = []
+        # Query matches the Vietnamese name, the name without diacritics or the English name
+        matched = set()
+        needles = (query_lower, query_no_diacritics, query_lower)
+        for needle, (haystack, starts) in zip(needles, _SUGGESTION_HAYSTACKS):
+            pos = haystack.find(needle)
+            while pos != -1:
+                index = bisect_right(starts, pos) - 1
+                matched.add(index)
+                if index + 1 == len(starts):
+                    break
+                pos = haystack.find(needle, starts[index + 1])  # Continue at the next name
         
-        for viet_name, eng_name in VietnameseCityNormalizer.CITY_MAPPINGS.items():
-            # Check if query matches Vietnamese name
-            if query_lower in viet_name:
-                suggestions.append((viet_name.title(), eng_name))
-            # Check if query matches Vietnamese name without diacritics
-            elif query_no_diacritics in VietnameseCityNormalizer.remove_vietnamese_diacritics(viet_name):
-                suggestions.append((viet_name.title(), eng_name))
-            # Check if query matches English name
-            elif query_lower in eng_name.lower():
-                suggestions.append((viet_name.title(), eng_name))
-        
-        return suggestions[:10]  # Return top 10 suggestions
+        # Keep CITY_MAPPINGS order, top 10 suggestions
+        return [_SUGGESTION_ENTRIES[index] for index in sorted(matched)[:10]]
     
     @staticmethod
+    @lru_cache(maxsize=2048)
     def is_vietnamese_city_query(query: str) -> bool:
         """
-        Check if query contains Vietnamese diacritics or known Vietnamese city patterns
+        Check if query contains Vietnamese diacritics or known Vietnamese city patterns (cached)
         
         Args:
             query: Search query
@@ -228,16 +257,54 @@ class VietnameseCityNormalizer:
         if not query:
             return False
         
-        # Check for Vietnamese diacritics
-        vietnamese_chars = 'àáảãạăằắẳẵặâầấẩẫậđèéẻẽẹêềếểễệìíỉĩịòóỏõọôồốổỗộơờớởỡợùúủũụưừứửữựỳýỷỹỵ'
-        has_diacritics = any(char in query.lower() for char in vietnamese_chars)
-        
-        # Check for common Vietnamese prefixes
         query_lower = query.lower()
-        vietnamese_prefixes = ['thành phố', 'tp.', 'tp ', 'tỉnh', 'huyện', 'quận']
-        has_prefix = any(query_lower.startswith(prefix) for prefix in vietnamese_prefixes)
         
-        # Check if in known mappings
-        in_mappings = query_lower in VietnameseCityNormalizer.CITY_MAPPINGS
+        if query_lower.startswith(VietnameseCityNormalizer.VIETNAMESE_ASCII_PREFIXES):
+            return True
         
-        return has_diacritics or has_prefix or in_mappings
+        # Vietnamese diacritics anywhere - one C-level set scan; ASCII queries
+        # (the common case) cannot contain any
+        if not query_lower.isascii() and not VietnameseCityNormalizer.VIETNAMESE_CHARS.isdisjoint(query_lower):
+            return True
+        
+        # Check if in known mappings
+        return query_lower in VietnameseCityNormalizer.CITY_MAPPINGS
+
+
+# Separator between names in the suggestion haystacks (cannot occur in a match)
+_SUGGESTION_SEPARATOR = '\x00'
+
+
+def _build_suggestion_index() -> Tuple[List[Tuple[str, str]], List[Tuple[str, List[int]]]]:
+    """
+    Index CITY_MAPPINGS for get_search_suggestions
+    
+    Each searchable form of the names (Vietnamese, without diacritics, English)
+    is joined into one string, so a query is a str.find scan in C over each
+    string instead of three substring tests per mapping entry. The start offset
+    of every name maps a hit back to its entry with bisect.
+    
+    Returns:
+        Tuple of (entries, haystacks): the (vietnamese_name, english_name)
+        suggestion per entry, and (joined_names, start_offsets) per form
+    """
+    entries = []
+    forms = ([], [], [])
+    for viet_name, eng_name in VietnameseCityNormalizer.CITY_MAPPINGS.items():
+        entries.append((viet_name.title(), eng_name))
+        forms[0].append(viet_name)
+        forms[1].append(VietnameseCityNormalizer.remove_vietnamese_diacritics(viet_name))
+        forms[2].append(eng_name.lower())
+    
+    haystacks = []
+    for names in forms:
+        starts = []
+        offset = 0
+        for name in names:
+            starts.append(offset)
+            offset += len(name) + len(_SUGGESTION_SEPARATOR)
+        haystacks.append((_SUGGESTION_SEPARATOR.join(names), starts))
+    return entries, haystacks
+
+
+_SUGGESTION_ENTRIES, _SUGGESTION_HAYSTACKS = _build_suggestion_index()
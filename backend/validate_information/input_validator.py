@@ -15,6 +15,12 @@ class ValidationError(Exception):
 class InputValidator:
     """Validates incoming requests from frontend"""
     
+    # Allowed location characters: letters (incl. Vietnamese), digits, spaces, commas, dots, hyphens
+    LOCATION_PATTERN = re.compile(r'[a-zA-ZÀ-ỹ0-9\s,.-]+')
+    
+    # Characters stripped by sanitize_input (deleted in one C-level pass)
+    SANITIZE_TABLE = str.maketrans('', '', '<>"\'`')
+    
     @staticmethod
     def validate_location_request(data: Dict[str, Any]) -> Tuple[bool, Optional[str], Dict[str, Any]]:
         """
@@ -29,6 +35,9 @@ class InputValidator:
         if not data:
             return False, "Dữ liệu request trống", {}
         
+        if not isinstance(data, dict):
+            return False, "Dữ liệu request phải là JSON object", {}
+        
         cleaned_data = {}
         
         # Check if location or coordinates provided
@@ -45,11 +54,11 @@ class InputValidator:
             
         elif lat is not None and lon is not None:
             # Validate coordinates
-            is_valid, error = InputValidator.validate_coordinates(lat, lon)
+            is_valid, error, lat_float, lon_float = InputValidator.parse_coordinates(lat, lon)
             if not is_valid:
                 return False, error, {}
-            cleaned_data['lat'] = float(lat)
-            cleaned_data['lon'] = float(lon)
+            cleaned_data['lat'] = lat_float
+            cleaned_data['lon'] = lon_float
             
         else:
             return False, "Cần cung cấp 'location' hoặc cả 'lat' và 'lon'", {}
@@ -86,7 +95,7 @@ class InputValidator:
             return False, "Địa điểm không được quá 100 ký tự"
         
         # Check for valid characters (letters, numbers, spaces, commas, hyphens)
-        if not re.match(r'^[a-zA-ZÀ-ỹ0-9\s,.-]+$', location):
+        if not InputValidator.LOCATION_PATTERN.fullmatch(location):
             return False, "Địa điểm chứa ký tự không hợp lệ"
         
         return True, None
@@ -103,19 +112,34 @@ class InputValidator:
         Returns:
             Tuple of (is_valid, error_message)
         """
+        is_valid, error, _, _ = InputValidator.parse_coordinates(lat, lon)
+        return is_valid, error
+    
+    @staticmethod
+    def parse_coordinates(lat: Any, lon: Any) -> Tuple[bool, Optional[str], Optional[float], Optional[float]]:
+        """
+        Validate latitude and longitude and return them as floats
+        
+        Args:
+            lat: Latitude value
+            lon: Longitude value
+            
+        Returns:
+            Tuple of (is_valid, error_message, cleaned_lat, cleaned_lon)
+        """
         try:
             lat_float = float(lat)
             lon_float = float(lon)
         except (ValueError, TypeError):
-            return False, "Tọa độ phải là số"
+            return False, "Tọa độ phải là số", None, None
         
         if not (-90 <= lat_float <= 90):
-            return False, f"Vĩ độ phải nằm trong khoảng -90 đến 90 (nhận: {lat_float})"
+            return False, f"Vĩ độ phải nằm trong khoảng -90 đến 90 (nhận: {lat_float})", None, None
         
         if not (-180 <= lon_float <= 180):
-            return False, f"Kinh độ phải nằm trong khoảng -180 đến 180 (nhận: {lon_float})"
+            return False, f"Kinh độ phải nằm trong khoảng -180 đến 180 (nhận: {lon_float})", None, None
         
-        return True, None
+        return True, None, lat_float, lon_float
     
     @staticmethod
     def validate_days(days: Any) -> Tuple[bool, Optional[str], int]:
@@ -131,6 +155,10 @@ class InputValidator:
         if days is None:
             return True, None, 7  # Default
         
+        # Common case: a valid int from JSON needs no conversion
+        if type(days) is int and 1 <= days <= 10:
+            return True, None, days
+        
         try:
             days_int = int(days)
         except (ValueError, TypeError):
@@ -194,15 +222,34 @@ class InputValidator:
         Returns:
             Sanitized data
         """
+        table = InputValidator.SANITIZE_TABLE
+        
         if isinstance(data, str):
             # Remove potentially dangerous characters
-            data = re.sub(r'[<>\"\'`]', '', data)
-            return data.strip()
-        
-        elif isinstance(data, dict):
-            return {k: InputValidator.sanitize_input(v) for k, v in data.items()}
+            return data.translate(table).strip()
         
+        if isinstance(data, dict):
+            result = dict(data)
         elif isinstance(data, list):
-            return [InputValidator.sanitize_input(item) for item in data]
-        
-        return data
+            result = list(data)
+        else:
+            return data
+        
+        # Walk nested dicts/lists with an explicit stack instead of recursion:
+        # no Python frame per value, and deep payloads cannot hit the recursion limit.
+        # Containers are copied before being cleaned, so the input is left untouched
+        stack = [result]
+        while stack:
+            container = stack.pop()
+            items = container.items() if isinstance(container, dict) else enumerate(container)
+            for key, value in items:
+                if isinstance(value, str):
+                    container[key] = value.translate(table).strip()
+                elif isinstance(value, dict):
+                    container[key] = copy = dict(value)
+                    stack.append(copy)
+                elif isinstance(value, list):
+                    container[key] = copy = list(value)
+                    stack.append(copy)
+        
+        return result
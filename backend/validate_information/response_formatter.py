@@ -3,10 +3,17 @@ Response Formatter Module
 Formats API responses to ensure frontend compatibility and error-free display
 """
 
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 
 
+@lru_cache(maxsize=256)
+def _split_key_path(key_path: str) -> Tuple[str, ...]:
+    """Split a dotted key path once; safe_get callers reuse a few fixed paths"""
+    return tuple(key_path.split('.'))
+
+
 class ResponseFormatter:
     """Formats backend responses for frontend consumption"""
     
@@ -47,17 +54,42 @@ class ResponseFormatter:
         Returns:
             Formatted error response
         """
-        response = {
+        return ResponseFormatter.format_error_from(
+            ResponseFormatter.error_body(error_message, error_code, status_code)
+        )
+    
+    @staticmethod
+    def error_body(error_message: str, error_code: Optional[str] = None,
+                   status_code: int = 400) -> Dict[str, Any]:
+        """
+        Build the 'error' member of an error response
+        
+        Static messages can build this once at import time and pass it to
+        format_error_from() on every request.
+        """
+        return {
+            'message': error_message,
+            'code': error_code or 'VALIDATION_ERROR',
+            'status': status_code
+        }
+    
+    @staticmethod
+    def format_error_from(error: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Wrap a prebuilt error body (see error_body) in an error response
+        
+        Args:
+            error: Dictionary from error_body()
+            
+        Returns:
+            Formatted error response with a fresh timestamp and its own
+            copy of error (prebuilt bodies are shared between requests)
+        """
+        return {
             'success': False,
-            'error': {
-                'message': error_message,
-                'code': error_code or 'VALIDATION_ERROR',
-                'status': status_code
-            },
+            'error': dict(error),
             'timestamp': datetime.utcnow().isoformat()
         }
-        
-        return response
     
     @staticmethod
     def format_current_weather(weather_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -115,15 +147,21 @@ class ResponseFormatter:
         if not alerts_data:
             return {}
         
+        air_quality = alerts_data.get('current', {}).get('air_quality') or {}
+        alerts = ResponseFormatter._format_alerts_list(alerts_data.get('alerts', {}))
         formatted = {
-            'alerts': ResponseFormatter._format_alerts_list(alerts_data.get('alerts', {})),
-            'air_quality': ResponseFormatter._format_air_quality(
-                alerts_data.get('current', {}).get('air_quality', {})
-            ),
+            'alerts': alerts,
+            'air_quality': ResponseFormatter._format_air_quality(air_quality),
+            'has_warnings': bool(alerts['alert']) or ResponseFormatter.has_aqi_warning(air_quality),
         }
         
         return formatted
     
+    @staticmethod
+    def has_aqi_warning(air_quality: Dict[str, Any]) -> bool:
+        """Whether upstream air quality data is bad enough to warn about (US AQI > 100)"""
+        return air_quality.get('us-epa-index', 0) > 100
+    
     @staticmethod
     def _format_location(location: Dict[str, Any]) -> Dict[str, Any]:
         """Format location data"""
@@ -285,10 +323,9 @@ class ResponseFormatter:
         Returns:
             Value at key path or default
         """
-        keys = key_path.split('.')
         value = data
         
-        for key in keys:
+        for key in _split_key_path(key_path):
             if isinstance(value, dict):
                 value = value.get(key)
                 if value is None:
@@ -3,7 +3,7 @@ Vietnamese Translation Module
 Translates weather data from English to Vietnamese
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 
 class WeatherTranslator:
@@ -124,6 +124,9 @@ class WeatherTranslator:
         'Typhoon': 'Bão',
     }
     
+    # (lowercase keyword, translation) in ALERT_TYPES order, lowercased once
+    ALERT_KEYWORDS = tuple(zip(map(str.lower, ALERT_TYPES), ALERT_TYPES.values()))
+    
     # Alert severity translations
     ALERT_SEVERITY = {
         'Extreme': 'Cực kỳ nghiêm trọng',
@@ -196,9 +199,10 @@ class WeatherTranslator:
         Returns:
             Vietnamese translation or original if not found
         """
-        # Try to find matching keywords
-        for eng, viet in WeatherTranslator.ALERT_TYPES.items():
-            if eng.lower() in alert_type.lower():
+        # First keyword (in table order) contained in the alert type wins
+        alert_lower = alert_type.lower()
+        for keyword, viet in WeatherTranslator.ALERT_KEYWORDS:
+            if keyword in alert_lower:
                 return viet
         return alert_type
     
@@ -215,6 +219,75 @@ class WeatherTranslator:
         """
         return WeatherTranslator.ALERT_SEVERITY.get(severity, severity)
     
+    @staticmethod
+    def _translate_current_section(translated: Dict[str, Any]) -> None:
+        """Add Vietnamese fields to the location and current conditions (in place)"""
+        # Translate location name (keep original)
+        location = translated.get('location')
+        if location:
+            if 'name' in location:
+                location['name_vi'] = location['name']  # Keep original for now
+            if 'country' in location:
+                location['country_vi'] = location['country']  # Keep original
+        
+        # Translate current conditions
+        current = translated.get('current')
+        if current:
+            condition = current.get('condition')
+            if condition and 'text' in condition:
+                condition['text_vi'] = WeatherTranslator.translate_condition(condition['text'])
+            
+            if 'wind_dir' in current:
+                current['wind_dir_vi'] = WeatherTranslator.translate_wind_direction(current['wind_dir'])
+    
+    @staticmethod
+    def _translate_forecast_section(translated: Dict[str, Any]) -> None:
+        """Add Vietnamese fields to every forecast day and hour (in place)"""
+        # Bind table lookups once - the hourly loop below runs 24x per day
+        conditions = WeatherTranslator.WEATHER_CONDITIONS
+        wind_directions = WeatherTranslator.WIND_DIRECTIONS
+        
+        for day in (translated.get('forecast') or {}).get('forecastday', ()):
+            # Translate day condition
+            day_condition = day.get('day', {}).get('condition')
+            if day_condition and 'text' in day_condition:
+                day_condition['text_vi'] = conditions.get(day_condition['text'], day_condition['text'])
+            
+            # Translate hourly conditions
+            for hour in day.get('hour', ()):
+                condition = hour.get('condition')
+                if condition and 'text' in condition:
+                    condition['text_vi'] = conditions.get(condition['text'], condition['text'])
+                
+                if 'wind_dir' in hour:
+                    hour['wind_dir_vi'] = wind_directions.get(hour['wind_dir'], hour['wind_dir'])
+    
+    @staticmethod
+    def _translate_alerts_section(translated: Dict[str, Any]) -> None:
+        """Add Vietnamese fields to alerts and the AQI category (in place)"""
+        # Translate alerts
+        alerts = translated.get('alerts')
+        if alerts and 'alert' in alerts:
+            for alert in alerts['alert']:
+                if 'event' in alert:
+                    alert['event_vi'] = WeatherTranslator.translate_alert_type(alert['event'])
+                
+                if 'severity' in alert:
+                    alert['severity_vi'] = WeatherTranslator.translate_alert_severity(alert['severity'])
+                
+                # Keep headline and description in original language
+                # (translating free text would require external API)
+        
+        # Translate AQI
+        current = translated.get('current')
+        if current and 'air_quality' in current:
+            aqi_data = current['air_quality']
+            
+            if 'aqi_category' in aqi_data:
+                category = aqi_data['aqi_category']
+                aqi_data['aqi_category_vi'] = WeatherTranslator.translate_aqi_category(category)
+                aqi_data['aqi_recommendation_vi'] = WeatherTranslator.get_aqi_recommendation(category)
+    
     @staticmethod
     def translate_current_weather(data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -230,26 +303,7 @@ class WeatherTranslator:
             return data
         
         translated = data.copy()
-        
-        # Translate location name (keep original)
-        if 'location' in translated:
-            location = translated['location']
-            if 'name' in location:
-                location['name_vi'] = location['name']  # Keep original for now
-            if 'country' in location:
-                location['country_vi'] = location['country']  # Keep original
-        
-        # Translate current conditions
-        if 'current' in translated:
-            current = translated['current']
-            
-            if 'condition' in current and 'text' in current['condition']:
-                condition_text = current['condition']['text']
-                current['condition']['text_vi'] = WeatherTranslator.translate_condition(condition_text)
-            
-            if 'wind_dir' in current:
-                current['wind_dir_vi'] = WeatherTranslator.translate_wind_direction(current['wind_dir'])
-        
+        WeatherTranslator._translate_current_section(translated)
         return translated
     
     @staticmethod
@@ -267,25 +321,7 @@ class WeatherTranslator:
             return data
         
         translated = data.copy()
-        
-        # Translate each forecast day
-        if 'forecastday' in translated['forecast']:
-            for day in translated['forecast']['forecastday']:
-                # Translate day condition
-                if 'day' in day and 'condition' in day['day']:
-                    condition_text = day['day']['condition']['text']
-                    day['day']['condition']['text_vi'] = WeatherTranslator.translate_condition(condition_text)
-                
-                # Translate hourly conditions
-                if 'hour' in day:
-                    for hour in day['hour']:
-                        if 'condition' in hour and 'text' in hour['condition']:
-                            condition_text = hour['condition']['text']
-                            hour['condition']['text_vi'] = WeatherTranslator.translate_condition(condition_text)
-                        
-                        if 'wind_dir' in hour:
-                            hour['wind_dir_vi'] = WeatherTranslator.translate_wind_direction(hour['wind_dir'])
-        
+        WeatherTranslator._translate_forecast_section(translated)
         return translated
     
     @staticmethod
@@ -303,26 +339,34 @@ class WeatherTranslator:
             return data
         
         translated = data.copy()
+        WeatherTranslator._translate_alerts_section(translated)
+        return translated
+    
+    @staticmethod
+    def translate_all(data: Dict[str, Any],
+                      sections: Tuple[str, ...] = ('current', 'forecast', 'alerts')) -> Dict[str, Any]:
+        """
+        Translate several sections of weather data in a single pass
         
-        # Translate alerts
-        if 'alerts' in translated and 'alert' in translated['alerts']:
-            for alert in translated['alerts']['alert']:
-                if 'event' in alert:
-                    alert['event_vi'] = WeatherTranslator.translate_alert_type(alert['event'])
-                
-                if 'severity' in alert:
-                    alert['severity_vi'] = WeatherTranslator.translate_alert_severity(alert['severity'])
-                
-                # Keep headline and description in original language
-                # (translating free text would require external API)
+        Equivalent to chaining translate_current_weather, translate_forecast
+        and translate_alerts, but the data is copied once and each section is
+        walked once, by the same helpers those methods use.
         
-        # Translate AQI
-        if 'current' in translated and 'air_quality' in translated['current']:
-            aqi_data = translated['current']['air_quality']
+        Args:
+            data: Weather data from API
+            sections: Sections to translate ('current', 'forecast', 'alerts')
             
-            if 'aqi_category' in aqi_data:
-                category = aqi_data['aqi_category']
-                aqi_data['aqi_category_vi'] = WeatherTranslator.translate_aqi_category(category)
-                aqi_data['aqi_recommendation_vi'] = WeatherTranslator.get_aqi_recommendation(category)
+        Returns:
+            Translated data
+        """
+        if not data:
+            return data
         
+        translated = data.copy()
+        if 'current' in sections:
+            WeatherTranslator._translate_current_section(translated)
+        if 'forecast' in sections:
+            WeatherTranslator._translate_forecast_section(translated)
+        if 'alerts' in sections:
+            WeatherTranslator._translate_alerts_section(translated)
         return translated
@@ -0,0 +1,357 @@
+"""
+Response Cache Module
+Caches formatted WeatherAPI responses so repeated queries skip the upstream call
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from functools import wraps
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple, Union
+
+from flask import current_app, request
+
+try:
+    import redis
+except ImportError:  # Redis is optional - fall back to the in-process store
+    redis = None
+
+
+REDIS_URL = os.getenv('REDIS_URL', '')
+
+# How long the last good body is kept for serving while WeatherAPI fails
+STALE_TTL = 3600
+
+# Coordinates are rounded to this many decimals (~1 km) in cache keys
+COORD_PRECISION = 2
+
+# How long a request waits for an identical in-flight request before
+# calling WeatherAPI itself
+INFLIGHT_WAIT = 15
+
+# Cache misses currently being computed, keyed like the cache. Concurrent
+# identical misses wait on the first one's Future instead of each calling
+# WeatherAPI (in front of Redis, which only helps once the body is stored).
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+
+class ResponseCache:
+    """
+    Two-tier response cache
+
+    Fresh entries expire after their TTL; a stale copy of the last good body
+    is kept for STALE_TTL seconds so it can be served when WeatherAPI is failing.
+    Uses Redis when REDIS_URL is configured, otherwise a bounded dict.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, max_entries: int = 2048):
+        self._client = None
+        if redis_url and redis is not None:
+            pool = redis.ConnectionPool.from_url(redis_url)
+            self._client = redis.Redis(connection_pool=pool)
+
+        self._store = {}
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Optional[Tuple[bytes, float]]:
+        """Return (body, seconds until it expires) if the cached body is still fresh"""
+        if self._client is not None:
+            try:
+                pipe = self._client.pipeline()
+                pipe.get(f'weather:{key}')
+                pipe.ttl(f'weather:{key}')
+                body, expires_in = pipe.execute()
+            except redis.RedisError:
+                return None
+            return (body, max(expires_in, 0)) if body is not None else None
+
+        entry = self._store.get(key)
+        now = time.monotonic()
+        if entry is None or entry[0] < now:
+            return None
+        return entry[2], entry[0] - now
+
+    def get_stale(self, key: str) -> Optional[bytes]:
+        """Return the last good body regardless of its TTL (up to STALE_TTL old)"""
+        if self._client is not None:
+            try:
+                return self._client.get(f'weather:stale:{key}')
+            except redis.RedisError:
+                return None
+
+        entry = self._store.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        return entry[2]
+
+    def set(self, key: str, body: bytes, ttl: int) -> None:
+        """Store a body for ttl seconds (and as the stale fallback)"""
+        stale_ttl = max(ttl, STALE_TTL)
+        if self._client is not None:
+            try:
+                pipe = self._client.pipeline()
+                pipe.setex(f'weather:{key}', ttl, body)
+                pipe.setex(f'weather:stale:{key}', stale_ttl, body)
+                pipe.execute()
+            except redis.RedisError:
+                pass
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            self._store.pop(key, None)
+            self._store[key] = (now + ttl, now + stale_ttl, body)
+            while len(self._store) > self.max_entries:
+                # Oldest insertion first - dicts keep insertion order
+                self._store.pop(next(iter(self._store)))
+
+
+class UpstreamValidatorStore:
+    """
+    WeatherAPI validators (ETag / Last-Modified) with the raw body they belong to
+
+    Lets a refetch after the response cache expires be a conditional GET: a
+    304 Not Modified reuses the stored body instead of downloading it again.
+    Stored in a Redis hash when REDIS_URL is configured, otherwise a bounded dict.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, max_entries: int = 256,
+                 max_body: int = 256 * 1024, ttl: int = STALE_TTL):
+        self._client = None
+        if redis_url and redis is not None:
+            pool = redis.ConnectionPool.from_url(redis_url)
+            self._client = redis.Redis(connection_pool=pool)
+
+        self._store = {}
+        self._lock = threading.Lock()
+        self.max_entries = max_entries
+        self.max_body = max_body
+        self.ttl = ttl
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """Return (conditional request headers, body) for a previous response"""
+        if self._client is not None:
+            try:
+                entry = self._client.hgetall(f'weather:upstream:{key}')
+            except redis.RedisError:
+                return None
+            if not entry:
+                return None
+            headers = {}
+            if entry.get(b'etag'):
+                headers['If-None-Match'] = entry[b'etag'].decode('latin-1')
+            if entry.get(b'last_modified'):
+                headers['If-Modified-Since'] = entry[b'last_modified'].decode('latin-1')
+            return headers, entry[b'body']
+
+        entry = self._store.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1], entry[2]
+
+    def set(self, key: str, response_headers: Mapping[str, str], body: bytes) -> None:
+        """Remember the validators of a response (no-op if it has none)"""
+        etag = response_headers.get('ETag', '')
+        last_modified = response_headers.get('Last-Modified', '')
+        if not (etag or last_modified) or len(body) > self.max_body:
+            return
+        body = bytes(body)
+
+        if self._client is not None:
+            try:
+                pipe = self._client.pipeline()
+                pipe.hset(f'weather:upstream:{key}', mapping={
+                    'body': body, 'etag': etag, 'last_modified': last_modified
+                })
+                pipe.expire(f'weather:upstream:{key}', self.ttl)
+                pipe.execute()
+            except redis.RedisError:
+                pass
+            return
+
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        with self._lock:
+            self._store.pop(key, None)
+            self._store[key] = (time.monotonic() + self.ttl, headers, body)
+            while len(self._store) > self.max_entries:
+                self._store.pop(next(iter(self._store)))
+
+
+response_cache = ResponseCache(REDIS_URL)
+upstream_validators = UpstreamValidatorStore(REDIS_URL)
+
+
+def normalize_payload(payload: Any) -> Any:
+    """
+    Canonicalize a request body for cache keying
+
+    Location names are case- and whitespace-insensitive upstream, and
+    coordinates closer than ~1 km give the same weather, so such requests
+    share one cache entry.
+    """
+    if not isinstance(payload, dict):
+        return payload
+
+    normalized = dict(payload)
+    location = normalized.get('location')
+    if isinstance(location, str):
+        normalized['location'] = ' '.join(location.lower().split())
+    for field in ('lat', 'lon'):
+        value = normalized.get(field)
+        if isinstance(value, (int, float, str)) and not isinstance(value, bool):
+            try:
+                normalized[field] = round(float(value), COORD_PRECISION)
+            except ValueError:
+                pass  # Invalid coordinates are rejected by the view; keep them distinct
+    return normalized
+
+
+def make_cache_key(endpoint: str, payload: Any) -> str:
+    """Hash endpoint + normalized request payload into a compact cache key"""
+    raw = json.dumps([endpoint, normalize_payload(payload)], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _seconds_until(expires: Optional[datetime]) -> Optional[float]:
+    """Seconds from now until an Expires datetime (None when there is none)"""
+    if expires is None:
+        return None
+    return max((expires - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+def _json_response(body: bytes, status: int = 200, expires_in: Optional[float] = None):
+    """Response for a stored body, expiring with the cache entry it came from"""
+    response = current_app.response_class(body, status=status, mimetype='application/json')
+    if expires_in is not None:
+        response.expires = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+    return response
+
+
+def cached_response(endpoint: str, ttl: Union[int, Callable[[Any], int]]):
+    """
+    Cache successful JSON responses of a Flask view
+
+    Args:
+        endpoint: Name used as the cache key prefix
+        ttl: Freshness in seconds, or a function of the request payload
+            returning it (for responses whose lifetime depends on the request)
+
+    A view can shorten the TTL of one response by setting its Expires header
+    (e.g. data for "today" expires at the location's midnight). Cached bodies
+    are served with an Expires header set to when their entry expires, so
+    etag_response never advertises a longer max-age than that.
+
+    On a 5xx from the view the last good body for the same key is returned.
+    Concurrent misses for the same key run the view once and share its body.
+    """
+    def decorator(view):
+        def render(key, payload, args, kwargs):
+            """Run the view and store its body (or swap in the stale copy on 5xx)"""
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.is_streamed:
+                return response  # Reading the body here would defeat streaming
+            if response.status_code == 200:
+                fresh_for = ttl(payload) if callable(ttl) else ttl
+                expires_in = _seconds_until(response.expires)
+                if expires_in is not None:
+                    fresh_for = min(fresh_for, int(expires_in))
+                if fresh_for > 0:
+                    response_cache.set(key, response.get_data(), fresh_for)
+            elif response.status_code >= 500:
+                stale = response_cache.get_stale(key)
+                if stale is not None:
+                    return _json_response(stale, expires_in=0)  # Not for HTTP caches to keep
+            return response
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            payload = request.get_json(silent=True)
+            if payload is None:
+                return view(*args, **kwargs)
+
+            # Query flags (e.g. ?summary=1) change the body, so they are part of the key
+            query_string = request.query_string.decode('latin-1')
+            key = make_cache_key(f'{endpoint}?{query_string}' if query_string else endpoint, payload)
+            cached = response_cache.get(key)
+            if cached is not None:
+                body, expires_in = cached
+                return _json_response(body, expires_in=expires_in)
+
+            with _INFLIGHT_LOCK:
+                future = _INFLIGHT.get(key)
+                is_leader = future is None
+                if is_leader:
+                    future = _INFLIGHT[key] = Future()
+
+            if not is_leader:
+                try:
+                    shared = future.result(timeout=INFLIGHT_WAIT)
+                except Exception:
+                    shared = None  # Leader failed or is too slow - fetch ourselves
+                if shared is not None:
+                    body, status, expires = shared
+                    return _json_response(body, status, _seconds_until(expires))
+                return render(key, payload, args, kwargs)
+
+            try:
+                response = render(key, payload, args, kwargs)
+                # Streamed bodies can only be read once - waiters fetch their own
+                future.set_result(None if response.is_streamed else (
+                    response.get_data(), response.status_code, response.expires
+                ))
+                return response
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with _INFLIGHT_LOCK:
+                    _INFLIGHT.pop(key, None)
+
+        return wrapper
+    return decorator
+
+
+def etag_response(max_age: int = 60):
+    """
+    Add ETag / Cache-Control headers to successful JSON responses
+
+    The ETag is a blake2b hash of the body; a request whose If-None-Match
+    matches it gets an empty 304 instead of the full payload.
+
+    Args:
+        max_age: Cache-Control max-age in seconds (less if the response expires sooner)
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+
+            etag = hashlib.blake2b(response.get_data(), digest_size=8).hexdigest()
+            # Never let HTTP caches keep a body longer than its Expires allows
+            expires_in = _seconds_until(response.expires)
+            fresh_for = max_age if expires_in is None else min(max_age, int(expires_in))
+            cache_control = f'public, max-age={fresh_for}'
+
+            if request.if_none_match.contains(etag):
+                not_modified = current_app.response_class(status=304)
+                not_modified.set_etag(etag)
+                not_modified.headers['Cache-Control'] = cache_control
+                return not_modified
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return wrapper
+    return decorator
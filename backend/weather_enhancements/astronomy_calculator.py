@@ -10,6 +10,18 @@ from datetime import datetime, timedelta
 class AstronomyCalculator:
     """Calculate enhanced astronomical data"""
     
+    # Moon phase translations (English -> Vietnamese)
+    MOON_PHASES_VI = {
+        'New Moon': 'Trăng mới',
+        'Waxing Crescent': 'Lưỡi liềm tăng',
+        'First Quarter': 'Trăng bán nguyệt đầu',
+        'Waxing Gibbous': 'Trăng phình tăng',
+        'Full Moon': 'Trăng tròn',
+        'Waning Gibbous': 'Trăng phình giảm',
+        'Last Quarter': 'Trăng bán nguyệt cuối',
+        'Waning Crescent': 'Lưỡi liềm giảm'
+    }
+    
     @staticmethod
     def calculate_golden_blue_hours(sunrise: str, sunset: str) -> Dict[str, Any]:
         """
@@ -80,17 +92,7 @@ class AstronomyCalculator:
         Returns:
             Vietnamese translation of moon phase
         """
-        translations = {
-            'New Moon': 'Trăng mới',
-            'Waxing Crescent': 'Lưỡi liềm tăng',
-            'First Quarter': 'Trăng bán nguyệt đầu',
-            'Waxing Gibbous': 'Trăng phình tăng',
-            'Full Moon': 'Trăng tròn',
-            'Waning Gibbous': 'Trăng phình giảm',
-            'Last Quarter': 'Trăng bán nguyệt cuối',
-            'Waning Crescent': 'Lưỡi liềm giảm'
-        }
-        return translations.get(moon_phase, moon_phase)
+        return AstronomyCalculator.MOON_PHASES_VI.get(moon_phase, moon_phase)
     
     @staticmethod
     def calculate_comfort_index(temp_c: float, humidity: int, wind_kph: float) -> Dict[str, Any]:
@@ -177,11 +179,10 @@ class AstronomyCalculator:
         if temp_f < 80:
             return temp_c
         
-        # Simplified heat index formula
-        hi = -42.379 + 2.04901523 * temp_f + 10.14333127 * humidity
-        hi += -0.22475541 * temp_f * humidity - 6.83783e-3 * temp_f**2
-        hi += -5.481717e-2 * humidity**2 + 1.22874e-3 * temp_f**2 * humidity
-        hi += 8.5282e-4 * temp_f * humidity**2 - 1.99e-6 * temp_f**2 * humidity**2
+        # Simplified heat index formula (Rothfusz regression, Horner form)
+        hi = (-42.379 + temp_f * (2.04901523 - 6.83783e-3 * temp_f)
+              + humidity * (10.14333127 + temp_f * (-0.22475541 + 1.22874e-3 * temp_f)
+                            + humidity * (-5.481717e-2 + temp_f * (8.5282e-4 - 1.99e-6 * temp_f))))
         
         # Convert back to Celsius
         return round((hi - 32) * 5/9, 1)
@@ -207,7 +208,8 @@ class AstronomyCalculator:
         
         # Wind chill formula (in Fahrenheit)
         temp_f = temp_c * 9/5 + 32
-        wc_f = 35.74 + 0.6215 * temp_f - 35.75 * (wind_mph**0.16) + 0.4275 * temp_f * (wind_mph**0.16)
+        wind_factor = wind_mph ** 0.16
+        wc_f = 35.74 + 0.6215 * temp_f + wind_factor * (0.4275 * temp_f - 35.75)
         
         # Convert back to Celsius
         return round((wc_f - 32) * 5/9, 1)
@@ -3,13 +3,49 @@ Weather Insights Module
 Provides weather trends, comparisons, and intelligent insights
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 import math
 
 class WeatherInsights:
     """Generate intelligent weather insights and comparisons"""
     
+    # Estimated seasonal averages (°C per month) by climate zone (simplified)
+    # In a real implementation, you'd use historical climate data
+    SEASONAL_TEMPS = {
+        'tropical': {  # For latitudes < 25 (Vietnam, Thailand, etc.)
+            1: 20, 2: 22, 3: 25, 4: 28, 5: 30, 6: 30,
+            7: 29, 8: 29, 9: 28, 10: 26, 11: 23, 12: 21
+        },
+        'subtropical': {  # For latitudes 25-35
+            1: 15, 2: 18, 3: 22, 4: 26, 5: 30, 6: 33,
+            7: 35, 8: 34, 9: 30, 10: 25, 11: 20, 12: 16
+        },
+        'temperate': {  # For latitudes > 35
+            1: 5, 2: 8, 3: 13, 4: 18, 5: 23, 6: 28,
+            7: 30, 8: 29, 9: 24, 10: 18, 11: 12, 12: 7
+        }
+    }
+    
+    _WINTER = {'name': 'Winter', 'name_vi': 'Mùa đông'}
+    _SPRING = {'name': 'Spring', 'name_vi': 'Mùa xuân'}
+    _SUMMER = {'name': 'Summer', 'name_vi': 'Mùa hè'}
+    _AUTUMN = {'name': 'Autumn', 'name_vi': 'Mùa thu'}
+    
+    # Season by month; the southern hemisphere is six months out of phase
+    NORTHERN_SEASONS = {
+        12: _WINTER, 1: _WINTER, 2: _WINTER,
+        3: _SPRING, 4: _SPRING, 5: _SPRING,
+        6: _SUMMER, 7: _SUMMER, 8: _SUMMER,
+        9: _AUTUMN, 10: _AUTUMN, 11: _AUTUMN
+    }
+    SOUTHERN_SEASONS = {
+        6: _WINTER, 7: _WINTER, 8: _WINTER,
+        9: _SPRING, 10: _SPRING, 11: _SPRING,
+        12: _SUMMER, 1: _SUMMER, 2: _SUMMER,
+        3: _AUTUMN, 4: _AUTUMN, 5: _AUTUMN
+    }
+    
     @staticmethod
     def analyze_temperature_trend(current_temp: float, previous_temps: List[float] = None) -> Dict[str, Any]:
         """
@@ -68,38 +104,23 @@ class WeatherInsights:
             }
     
     @staticmethod
-    def get_seasonal_comparison(current_temp: float, location: Dict[str, Any]) -> Dict[str, Any]:
+    def get_seasonal_comparison(current_temp: float, location: Dict[str, Any],
+                                now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Compare current temperature with seasonal averages
         
         Args:
             current_temp: Current temperature in Celsius
             location: Location information
+            now: Reference time (defaults to the current time)
             
         Returns:
             Seasonal comparison data
         """
         # Get current month and latitude for seasonal calculations
-        current_month = datetime.now().month
+        current_month = (now or datetime.now()).month
         lat = location.get('lat', 21.0)  # Default to Hanoi latitude
         
-        # Estimate seasonal averages based on location (simplified)
-        # In a real implementation, you'd use historical climate data
-        seasonal_temps = {
-            'tropical': {  # For latitudes < 25 (Vietnam, Thailand, etc.)
-                1: 20, 2: 22, 3: 25, 4: 28, 5: 30, 6: 30,
-                7: 29, 8: 29, 9: 28, 10: 26, 11: 23, 12: 21
-            },
-            'subtropical': {  # For latitudes 25-35
-                1: 15, 2: 18, 3: 22, 4: 26, 5: 30, 6: 33,
-                7: 35, 8: 34, 9: 30, 10: 25, 11: 20, 12: 16
-            },
-            'temperate': {  # For latitudes > 35
-                1: 5, 2: 8, 3: 13, 4: 18, 5: 23, 6: 28,
-                7: 30, 8: 29, 9: 24, 10: 18, 11: 12, 12: 7
-            }
-        }
-        
         if abs(lat) < 25:
             climate_type = 'tropical'
         elif abs(lat) < 35:
@@ -107,7 +128,7 @@ class WeatherInsights:
         else:
             climate_type = 'temperate'
         
-        seasonal_avg = seasonal_temps[climate_type][current_month]
+        seasonal_avg = WeatherInsights.SEASONAL_TEMPS[climate_type][current_month]
         difference = round(current_temp - seasonal_avg, 1)
         
         # Calculate percentile (simplified)
@@ -126,24 +147,8 @@ class WeatherInsights:
     @staticmethod
     def _get_season(month: int, latitude: float) -> Dict[str, str]:
         """Get season information based on month and latitude"""
-        if latitude >= 0:  # Northern hemisphere
-            if month in [12, 1, 2]:
-                return {'name': 'Winter', 'name_vi': 'Mùa đông'}
-            elif month in [3, 4, 5]:
-                return {'name': 'Spring', 'name_vi': 'Mùa xuân'}
-            elif month in [6, 7, 8]:
-                return {'name': 'Summer', 'name_vi': 'Mùa hè'}
-            else:
-                return {'name': 'Autumn', 'name_vi': 'Mùa thu'}
-        else:  # Southern hemisphere
-            if month in [6, 7, 8]:
-                return {'name': 'Winter', 'name_vi': 'Mùa đông'}
-            elif month in [9, 10, 11]:
-                return {'name': 'Spring', 'name_vi': 'Mùa xuân'}
-            elif month in [12, 1, 2]:
-                return {'name': 'Summer', 'name_vi': 'Mùa hè'}
-            else:
-                return {'name': 'Autumn', 'name_vi': 'Mùa thu'}
+        seasons = WeatherInsights.NORTHERN_SEASONS if latitude >= 0 else WeatherInsights.SOUTHERN_SEASONS
+        return dict(seasons[month])
     
     @staticmethod
     def detect_notable_conditions(weather_data: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -269,17 +274,22 @@ class WeatherInsights:
         return notable_conditions
     
     @staticmethod
-    def generate_weather_insights(weather_data: Dict[str, Any], forecast_data: Dict[str, Any] = None) -> Dict[str, Any]:
+    def generate_weather_insights(weather_data: Dict[str, Any], forecast_data: Dict[str, Any] = None,
+                                  now: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Generate comprehensive weather insights
         
         Args:
             weather_data: Current weather data
             forecast_data: Optional forecast data for additional insights
+            now: Reference time shared by all insights (defaults to the current time)
             
         Returns:
             Comprehensive weather insights
         """
+        if now is None:
+            now = datetime.now()
+        
         current = weather_data.get('current', {})
         location = weather_data.get('location', {})
         
@@ -289,7 +299,7 @@ class WeatherInsights:
         temp_trend = WeatherInsights.analyze_temperature_trend(temp_c)
         
         # Seasonal comparison
-        seasonal_comparison = WeatherInsights.get_seasonal_comparison(temp_c, location)
+        seasonal_comparison = WeatherInsights.get_seasonal_comparison(temp_c, location, now)
         
         # Notable conditions
         notable_conditions = WeatherInsights.detect_notable_conditions(weather_data)
@@ -317,7 +327,7 @@ class WeatherInsights:
             'notable_conditions': notable_conditions,
             'forecast_insights': forecast_insights,
             'summary': WeatherInsights._generate_summary(temp_trend, seasonal_comparison, notable_conditions),
-            'generated_at': datetime.now().isoformat()
+            'generated_at': now.isoformat()
         }
     
     @staticmethod
@@ -5,13 +5,18 @@
 
 import os
 import requests
+from bisect import bisect_left
 from flask import Flask, request, jsonify
 
 app = Flask(__name__)
 
 # Định nghĩa API keys
 WEATHER_API_KEY = os.getenv('WEATHERAPI_KEY', 'YOUR_WEATHERAPI_KEY')
-WEATHER_API_FORECAST_URL = 'http://api.weatherapi.com/v1/forecast.json'
+WEATHER_API_FORECAST_URL = 'https://api.weatherapi.com/v1/forecast.json'
+
+def mask_api_key(text):
+	"""Che API key trong text (URL request nằm trong thông báo lỗi của requests)"""
+	return text.replace(WEATHER_API_KEY, '***') if WEATHER_API_KEY else text
 
 def validate_coordinates(lat, lon):
 	"""Validate latitude and longitude values"""
@@ -41,50 +46,50 @@ def validate_location(location):
 	
 	return True, None
 
+# Bảng phân loại AQI: ngưỡng trên (bao gồm) của từng mức
+AQI_BREAKPOINTS = (50, 100, 150, 200, 300)
+AQI_LEVELS = (
+	{
+		'category': 'Good',
+		'color': 'green',
+		'description': 'Chất lượng không khí tốt',
+		'health_advice': 'An toàn cho sức khỏe'
+	},
+	{
+		'category': 'Moderate',
+		'color': 'yellow',
+		'description': 'Chất lượng không khí trung bình',
+		'health_advice': 'Chấp nhận được cho hầu hết mọi người'
+	},
+	{
+		'category': 'Unhealthy for Sensitive Groups',
+		'color': 'orange',
+		'description': 'Không lành mạnh cho nhóm nhạy cảm',
+		'health_advice': 'Người nhạy cảm nên hạn chế hoạt động ngoài trời'
+	},
+	{
+		'category': 'Unhealthy',
+		'color': 'red',
+		'description': 'Không lành mạnh',
+		'health_advice': 'Mọi người nên hạn chế hoạt động ngoài trời'
+	},
+	{
+		'category': 'Very Unhealthy',
+		'color': 'purple',
+		'description': 'Rất không lành mạnh',
+		'health_advice': 'Tránh hoạt động ngoài trời'
+	},
+	{
+		'category': 'Hazardous',
+		'color': 'maroon',
+		'description': 'Nguy hiểm',
+		'health_advice': 'Ở trong nhà và đóng cửa sổ'
+	},
+)
+
 def get_aqi_category(aqi_us):
 	"""Get AQI category and health recommendation"""
-	if aqi_us <= 50:
-		return {
-			'category': 'Good',
-			'color': 'green',
-			'description': 'Chất lượng không khí tốt',
-			'health_advice': 'An toàn cho sức khỏe'
-		}
-	elif aqi_us <= 100:
-		return {
-			'category': 'Moderate',
-			'color': 'yellow',
-			'description': 'Chất lượng không khí trung bình',
-			'health_advice': 'Chấp nhận được cho hầu hết mọi người'
-		}
-	elif aqi_us <= 150:
-		return {
-			'category': 'Unhealthy for Sensitive Groups',
-			'color': 'orange',
-			'description': 'Không lành mạnh cho nhóm nhạy cảm',
-			'health_advice': 'Người nhạy cảm nên hạn chế hoạt động ngoài trời'
-		}
-	elif aqi_us <= 200:
-		return {
-			'category': 'Unhealthy',
-			'color': 'red',
-			'description': 'Không lành mạnh',
-			'health_advice': 'Mọi người nên hạn chế hoạt động ngoài trời'
-		}
-	elif aqi_us <= 300:
-		return {
-			'category': 'Very Unhealthy',
-			'color': 'purple',
-			'description': 'Rất không lành mạnh',
-			'health_advice': 'Tránh hoạt động ngoài trời'
-		}
-	else:
-		return {
-			'category': 'Hazardous',
-			'color': 'maroon',
-			'description': 'Nguy hiểm',
-			'health_advice': 'Ở trong nhà và đóng cửa sổ'
-		}
+	return dict(AQI_LEVELS[bisect_left(AQI_BREAKPOINTS, aqi_us)])
 
 @app.route('/api/weather_warnings', methods=['POST'])
 def get_weather_warnings():
@@ -236,16 +241,16 @@ def get_weather_warnings():
 			return jsonify({'error': 'API key không hợp lệ'}), 500
 		elif resp.status_code == 403:
 			return jsonify({'error': 'API key đã vượt quá giới hạn'}), 500
-		return jsonify({'error': f'Lỗi API: {str(e)}'}), 500
+		return jsonify({'error': f'Lỗi API: {mask_api_key(str(e))}'}), 500
 		
 	except requests.exceptions.Timeout:
 		return jsonify({'error': 'Request timeout. Vui lòng thử lại'}), 504
 		
 	except requests.exceptions.RequestException as e:
-		return jsonify({'error': f'Lỗi kết nối: {str(e)}'}), 503
+		return jsonify({'error': f'Lỗi kết nối: {mask_api_key(str(e))}'}), 503
 		
 	except Exception as e:
-		return jsonify({'error': f'Lỗi server: {str(e)}'}), 500
+		return jsonify({'error': f'Lỗi server: {mask_api_key(str(e))}'}), 500
 
 if __name__ == '__main__':
 	app.run(host='0.0.0.0', port=5002, debug=True)